@@ -0,0 +1,105 @@
+"""
+Per-page partial results and the reduce step that combines them.
+
+Everything here is pure and lives outside scanner.py so worker processes can
+import it without loading the config or touching the network.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+from decoder import decode_page
+from nbt import cached_key
+from normalizer import item_key
+
+
+def item_index(auction):
+    """Price key from the item's NBT, or from its display name when that can't be read."""
+    item_bytes = auction.get('item_bytes')
+    if item_bytes:
+        key = cached_key(auction['uuid'], item_bytes, auction['tier'], auction['item_name'])
+        if key is not None:
+            return key
+    return item_key(auction['item_name'], auction['tier'])
+
+
+def is_tracked(auction):
+    if auction['claimed'] or not auction['bin']:
+        return False
+    furniture = auction.get('furniture')        # set by decoder.decode_page
+    if furniture is None:
+        furniture = "Furniture" in auction.get("item_lore", "")
+    return not furniture
+
+
+def parse_page(data, now):
+    """
+    Reduce one page to its own partial result: the lowest/second-lowest table
+    per item, the tracked listings as ``(uuid, index, price, start, end)``
+    rows and the display names of freshly started ones.  Pure, so pages can
+    be parsed on any worker without sharing state.
+    """
+    table = {}
+    listed = []
+    fresh = {}
+    if not data.get('success'):
+        return table, listed, fresh
+    for auction in data['auctions']:
+        if not is_tracked(auction):
+            continue
+        index = item_index(auction)
+        price = auction['starting_bid']
+        listed.append((auction['uuid'], index, price, auction['start'], auction.get('end', 0)))
+        entry = table.get(index)
+        if entry is None:
+            table[index] = [price, float("inf")]
+        elif price < entry[0]:
+            entry[1] = entry[0]
+            entry[0] = price
+        elif price < entry[1]:
+            entry[1] = price
+        if auction['start'] + 60000 > now:
+            fresh[auction['uuid']] = auction['item_name']
+    return table, listed, fresh
+
+
+def parse_page_bytes(page, raw, now):
+    """
+    parse_page for an undecoded page body, for use in a process pool: only
+    the compact partial travels back to the parent, never the auction dicts.
+    """
+    try:
+        data = decode_page(raw) if raw else {}
+    except ValueError:
+        data = {}
+    return page, parse_page(data, now)
+
+
+def merge_tables(tables):
+    """
+    Merge lowest/second-lowest tables; the result doesn't depend on which
+    worker produced which table, only on the order they are passed in.
+    """
+    merged = {}
+    for table in tables:
+        for index, (lowest, second) in table.items():
+            entry = merged.get(index)
+            if entry is None:
+                merged[index] = [lowest, second]
+            elif lowest < entry[0]:
+                entry[1] = min(entry[0], second)
+                entry[0] = lowest
+            elif lowest < entry[1]:
+                entry[1] = lowest
+    return merged
+
+
+def reduce_tables(tables, workers=0):
+    """
+    merge_tables, optionally split over a process pool: each worker merges a
+    contiguous chunk and the chunk results are merged in order.
+    """
+    if workers < 2 or len(tables) < 2 * workers:
+        return merge_tables(tables)
+    size = -(-len(tables) // workers)
+    chunks = [tables[i:i + size] for i in range(0, len(tables), size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return merge_tables(list(executor.map(merge_tables, chunks)))
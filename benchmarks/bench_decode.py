@@ -0,0 +1,83 @@
+"""
+Parse time and peak memory per auction page for each decoding path.
+
+Uses recorded pages from ``--dir`` (``*.json`` or ``*.json.gz``) when given,
+otherwise synthetic fixture pages.
+
+    python -m benchmarks.bench_decode [--dir snapshots/<lastUpdated>] [--pages 10]
+"""
+import argparse
+import gzip
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import decoder
+from benchmarks.fixtures import synthetic_page_bytes
+
+
+def load_pages(directory, limit):
+    if directory is None:
+        return [synthetic_page_bytes(p, limit) for p in range(limit)]
+    pages = []
+    for path in sorted(Path(directory).iterdir())[:limit]:
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+def measure(fn, raw_pages):
+    """Peak memory while decoding a page, and what the decoded page keeps."""
+    kept, peaks = [], []
+    for raw in raw_pages:
+        tracemalloc.start()
+        result = fn(raw)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        kept.append(current)
+        peaks.append(peak)
+        del result
+    return max(kept), max(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode time and memory per page")
+    parser.add_argument("--dir", help="directory of recorded pages")
+    parser.add_argument("--pages", type=int, default=10)
+    args = parser.parse_args()
+
+    raw_pages = load_pages(args.dir, args.pages)
+    size = sum(map(len, raw_pages)) / len(raw_pages)
+    print(f"{len(raw_pages)} pages, {size / 1e6:.2f} MB each, fast backend: {decoder.BACKEND}")
+
+    paths = [("json.loads (full)", json.loads)]
+    if decoder.BACKEND != "json":
+        paths.append((f"{decoder.BACKEND}.loads (full)", decoder.loads))
+    paths.append(("decode_page", decoder.decode_page))
+
+    # Time and memory are measured separately: tracemalloc slows decoding down
+    for label, fn in paths:
+        start = time.perf_counter()
+        for raw in raw_pages:
+            fn(raw)
+        per_page = (time.perf_counter() - start) / len(raw_pages)
+        kept, peak = measure(fn, raw_pages)
+        print(f"  {label:<22} {per_page * 1000:7.2f} ms/page   "
+              f"peak {peak / 1e6:6.2f} MB   kept {kept / 1e6:6.2f} MB")
+
+    if decoder.BACKEND != "json":
+        backend, decoder.BACKEND = decoder.BACKEND, "json"
+        start = time.perf_counter()
+        for raw in raw_pages:
+            decoder.decode_page(raw)
+        per_page = (time.perf_counter() - start) / len(raw_pages)
+        kept, peak = measure(decoder.decode_page, raw_pages)
+        decoder.BACKEND = backend
+        print(f"  {'decode_page (stdlib)':<22} {per_page * 1000:7.2f} ms/page   "
+              f"peak {peak / 1e6:6.2f} MB   kept {kept / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Time-to-detect of fresh listings: scheduled incremental scans vs full scans.
+
+Against the mock server, each simulated refresh lists new auctions, most of
+them on a couple of "hot" pages that the scanner isn't told about and the
+rest anywhere.  Every refresh is then scanned by
+
+  full          a full scan; a listing is detected once every page is in
+  first pages   incremental, always the first pages (no learning)
+  scheduled     incremental, the pages the scheduler has learned are hot
+
+and the time from each listing's start to its detection is reported, with
+the share of new listings detected in the refresh that listed them.  After
+the last refresh the scanner runs enough quiet cycles for the round-robin
+to reach every page, and "listed" is the share of all new listings that
+made it into its listings by then, wherever they landed.
+
+    python -m benchmarks.bench_detect [--pages 40] [--latency 0.05] [--cycles 30]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.fixtures import synthetic_auction
+from benchmarks.mock_server import start_server
+
+MODES = ["full", "first pages", "scheduled"]
+
+
+def new_listings(rng, server, count, hot_pages, hot_share):
+    """
+    ``{page: auctions}`` for the next refresh, started at its lastUpdated on
+    the server's clock, like real listings the scanner hasn't seen yet.
+    """
+    by_page = {}
+    started = server.last_updated + 60_000      # publish() advances by a minute
+    for _ in range(count):
+        auction = synthetic_auction(rng, server.last_updated)
+        auction.update(start=started, end=started + 3600_000, bin=True, claimed=False,
+                       item_lore=auction["item_lore"].replace("Furniture", ""))
+        page = rng.choice(hot_pages) if rng.random() < hot_share else rng.randrange(server.total_pages)
+        by_page.setdefault(page, []).append(auction)
+    return by_page
+
+
+def run(mode, args):
+    import scanner
+    from scheduler import PageScheduler
+
+    server = start_server(pages=args.pages, per_page=args.per_page, latency=args.latency, seed=args.seed)
+    with open("config.json", "w") as f:
+        json.dump({"api_url": server.url, "budget": 10**12, "price_history": False, "metrics": False,
+                   "concurrency": args.concurrency, "full_rescan_every": 10**9}, f)
+    scanner.listings.clear()
+    scanner.books.clear()
+    scanner.validators.clear()
+    scanner.last_scan = scanner.cycles_since_full = 0
+    scanner.scheduler = PageScheduler()
+    scanner.time.sleep = lambda seconds: None
+    rng = random.Random(args.seed)
+    hot_pages = rng.sample(range(1, args.pages), 2)
+
+    delays, uuids = [], set()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scanner.start_sniper(incremental=True)              # the initial full scan
+        for _ in range(args.cycles):
+            by_page = new_listings(rng, server, args.new, hot_pages, args.hot_share)
+            starts = {a["uuid"]: a["start"] for auctions in by_page.values() for a in auctions}
+            uuids |= starts.keys()
+            server.publish(by_page)
+            # rebuilding the pages takes the mock a while; count from when they're served
+            lag = int(time.time() * 1000) - min(starts.values())
+            if mode == "full":
+                scanner.start_sniper(incremental=False)
+                done = int(time.time() * 1000)
+                listed = {uuid.decode() for uuid in scanner.snapshot.uuid.tolist()}
+                delays += [done - start - lag for uuid, start in starts.items() if uuid in listed]
+                continue
+            if mode == "first pages":
+                scanner.scheduler.scores.clear()
+            before = len(scanner.scheduler.detect_ms)
+            scanner.start_sniper(incremental=True)
+            delays += [delay - lag for delay in list(scanner.scheduler.detect_ms)[before:]]
+        if mode == "full":
+            listed = {uuid.decode() for uuid in scanner.snapshot.uuid.tolist()}
+        else:
+            for _ in range(-(-args.pages // scanner.scheduler.stale_pages)):
+                server.publish(advance_ms=1000)
+                scanner.start_sniper(incremental=True)
+            listed = scanner.listings.keys()
+    server.shutdown()
+    return delays, len(uuids), len(uuids & listed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--per-page", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency per request (s)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--cycles", type=int, default=30)
+    parser.add_argument("--new", type=int, default=20, help="new listings per refresh")
+    parser.add_argument("--hot-share", type=float, default=0.8, help="share listed on the hot pages")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="sniper-detect-"))
+    print(f"{args.pages} pages, {args.latency * 1000:.0f} ms latency, {args.cycles} refreshes of "
+          f"{args.new} new listings ({args.hot_share:.0%} on two hot pages)")
+    print(f"  {'mode':12} {'median':>9} {'p90':>9} {'detected':>9} {'listed':>9}")
+    for mode in MODES:
+        delays, published, listed = run(mode, args)
+        if not delays:
+            print(f"  {mode:12} {'-':>9} {'-':>9} {0:>9.0%} {listed / published:>9.0%}")
+            continue
+        delays.sort()
+        p90 = delays[min(len(delays) - 1, int(len(delays) * 0.9))]
+        print(f"  {mode:12} {statistics.median(delays):7.0f}ms {p90:7.0f}ms "
+              f"{len(delays) / published:>9.0%} {listed / published:>9.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""
+Page fetch throughput against the local mock server.
+
+Compares the threaded requests path (shared Session on a thread pool) with
+fetcher.AsyncFetcher at a few concurrency limits, reporting pages/s and when
+pages arrive relative to the start of the scan.
+
+    python -m benchmarks.bench_fetch [--pages 60] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from benchmarks.mock_server import start_server
+from fetcher import AsyncFetcher, httpx
+
+
+def threaded(url, pages, workers):
+    arrivals = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor, requests.Session() as session:
+        futures = [executor.submit(lambda p: session.get(f"{url}?page={p}", timeout=10).json(), p)
+                   for p in range(pages)]
+        for future in as_completed(futures):
+            future.result()
+            arrivals.append(time.perf_counter() - start)
+    return arrivals
+
+
+async def pooled(url, pages, concurrency):
+    arrivals = []
+    start = time.perf_counter()
+    async with AsyncFetcher(url, concurrency=concurrency) as fetcher:
+        async for _page, _data in fetcher.pages(range(pages)):
+            arrivals.append(time.perf_counter() - start)
+    return arrivals
+
+
+def report(label, arrivals):
+    total = max(arrivals)
+    print(f"  {label:<22} {len(arrivals) / total:7.1f} pages/s   total {total:6.2f} s   "
+          f"first {min(arrivals) * 1000:6.0f} ms   median {statistics.median(arrivals):5.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch throughput against the mock server")
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--per-page", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.05, help="server latency per request (s)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 20, 40])
+    args = parser.parse_args()
+
+    server = start_server(pages=args.pages, per_page=args.per_page, latency=args.latency)
+    url = server.url + "/auctions"
+    print(f"{args.pages} pages x {args.per_page} auctions, {args.latency * 1000:.0f} ms latency")
+    try:
+        report("threads (10)", threaded(url, args.pages, 10))
+        if httpx is None:
+            print("  (httpx not installed, skipping AsyncFetcher)")
+            return
+        for concurrency in args.concurrency:
+            report(f"async ({concurrency})", asyncio.run(pooled(url, args.pages, concurrency)))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
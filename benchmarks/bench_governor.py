@@ -0,0 +1,86 @@
+"""
+Full scans against a rate-limited mock API, with and without the governor.
+
+The mock server allows ``--throttle`` requests per ``--window`` seconds and
+answers 429 beyond that.  Each configuration runs a warm-up scan, so the
+governor starts from what a long-running scanner would have learned, then
+``--scans`` timed full scans, and reports the time per scan, the 429s the
+server sent and the pages that were lost after every retry.
+
+    python -m benchmarks.bench_governor [--pages 100] [--throttle 60] [--window 1]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.mock_server import start_server
+
+CONFIGS = {
+    "no governor": {"governor": False},
+    "governor": {"governor": True},
+    "governor, httpx": {"governor": True, "fetch_backend": "httpx"},
+}
+
+
+def run(settings, args):
+    import scanner
+    from governor import Governor
+
+    server = start_server(pages=args.pages, per_page=args.per_page, latency=args.latency,
+                          throttle=args.throttle, window=args.window)
+    with open("config.json", "w") as f:
+        json.dump({"api_url": server.url, "budget": 10**12, "price_history": False,
+                   "metrics": True, "metrics_file": "", "concurrency": args.concurrency,
+                   "governor": settings["governor"],
+                   "fetch_backend": settings.get("fetch_backend", "threads")}, f)
+    scanner.governor = Governor()
+    seconds, throttled, lost = [], 0, 0
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for scan in range(args.scans + 1):
+                scanner.validators.clear()
+                scanner.last_scan = 0
+                time.sleep(args.window)         # every scan starts on a fresh window
+                before = server.throttled
+                start = time.perf_counter()
+                scanner.start_sniper()
+                if scan:                        # the first one is the warm-up
+                    seconds.append(time.perf_counter() - start)
+                    throttled += server.throttled - before
+                    lost += scanner.metrics.last["errors"]
+    finally:
+        server.shutdown()
+    return seconds, throttled, lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--per-page", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency per request (s)")
+    parser.add_argument("--throttle", type=int, default=60, help="requests allowed per window")
+    parser.add_argument("--window", type=float, default=1.0, help="rate-limit window (s)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--scans", type=int, default=3)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="sniper-governor-"))
+    print(f"{args.pages} pages, {args.latency * 1000:.0f} ms latency, "
+          f"{args.throttle} requests per {args.window:g}s allowed")
+    print(f"  {'':18} {'per scan':>9} {'pages/s':>8} {'429s':>6} {'lost':>6}")
+    failed = 0
+    for name, settings in CONFIGS.items():
+        seconds, throttled, lost = run(settings, args)
+        per_scan = sum(seconds) / len(seconds)
+        print(f"  {name:18} {per_scan:8.2f}s {args.pages / per_scan:8.1f} "
+              f"{throttled / len(seconds):6.1f} {lost / len(seconds):6.1f}")
+        failed += settings["governor"] and lost
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
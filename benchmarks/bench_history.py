@@ -0,0 +1,85 @@
+"""
+Price history store: append cost per cycle, file size and query times.
+
+Simulates a scanner recording one cycle a minute for a number of days,
+with a fraction of items repricing each cycle, then times range queries,
+one item's series and the rolling median the snipe filter uses, and checks
+the median against one taken over every minute of the window.
+
+    python -m benchmarks.bench_history [--days 2] [--items 1000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from pricehistory import PriceHistory
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=2)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--moving", type=float, default=0.1, help="fraction of items repricing per cycle")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="sniper-history-"))
+    rng = random.Random(args.seed)
+    history = PriceHistory()
+    prices = {f"ITEM_{i}LEGENDARY": [rng.randint(10_000, 10_000_000)] * 2 for i in range(args.items)}
+    for pair in prices.values():
+        pair[1] = int(pair[0] * 1.1)
+    names = list(prices)
+
+    cycles = args.days * 1440
+    start_ms = 1_700_000_000_000
+    window = 6 * 3600 * 1000
+    held = {name: [] for name in names}     # each item's lowest, minute by minute, over the last window
+    written = 0
+    started = time.perf_counter()
+    for cycle in range(cycles):
+        for name in rng.sample(names, int(args.items * args.moving)):
+            low = max(1, int(prices[name][0] * rng.uniform(0.9, 1.1)))
+            prices[name] = [low, int(low * rng.uniform(1.0, 1.3))]
+        written += history.append(start_ms + cycle * 60_000, prices, {name: 20 for name in names})
+        if (cycles - cycle) * 60_000 <= window:
+            for name in names:
+                held[name].append(prices[name][0])
+    append_time = time.perf_counter() - started
+    size = os.path.getsize("price_history.bin")
+
+    end_ms = start_ms + cycles * 60_000
+    target = names[0]
+    reopen, history = timed(PriceHistory)
+    range_time, recent = timed(history.range, end_ms - window)
+    series_time, series = timed(history.series, target, end_ms - window)
+    candidates = rng.sample(names, 50)
+    median_time, medians = timed(history.rolling_median, candidates, end_ms - window, 1, end_ms)
+
+    # the median over every minute of the window, whether or not it was recorded
+    ok = True
+    for name in candidates:
+        minutes = sorted(held[name])
+        ok &= medians.get(name) == float(minutes[(len(minutes) - 1) // 2])
+
+    print(f"{cycles:,} cycles x {args.items:,} items, {args.moving:.0%} repricing per cycle")
+    print(f"  append             {append_time / cycles * 1000:8.2f} ms/cycle, {written:,} records, "
+          f"{size / 2**20:.1f} MB ({size / args.days / 2**20:.1f} MB/day)")
+    print(f"  reopen             {reopen * 1000:8.2f} ms")
+    print(f"  last 6h range      {range_time * 1000:8.2f} ms  ({len(recent):,} records)")
+    print(f"  one item, 6h       {series_time * 1000:8.2f} ms  ({len(series):,} records)")
+    print(f"  rolling median x50 {median_time * 1000:8.2f} ms")
+    print(f"Medians match brute force: {'yes' if ok else 'NO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+"""
+Snipe logging cost on the reporting path.
+
+Times a burst of log_snipe calls against the original open/append/close per
+line, then checks that every row (including names with commas and quotes)
+reads back intact from the store once the background writer has flushed.
+
+    python -m benchmarks.bench_logger [--snipes 500]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+import logger
+import store
+from benchmarks.fixtures import realistic_name
+
+
+def legacy_log_snipe(item_name, snipe_price, suggested_price, second_bin, uuid):
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    line = f"{item_name},{snipe_price},{suggested_price},{second_bin},{timestamp},{uuid}\n"
+    with open(store.SNIPES_LOG, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def snipes(rng, n):
+    rows = []
+    for i in range(n):
+        name = realistic_name(rng)
+        if i % 10 == 0:
+            name += ', "Signed"'
+        price = rng.randint(10_000, 50_000_000)
+        rows.append((name, price, int(price * 1.3), int(price * 1.4), f"{i:032x}"))
+    return rows
+
+
+def timed(fn, rows):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for row in rows:
+            fn(*row)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--snipes", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rows = snipes(random.Random(args.seed), args.snipes)
+    work = tempfile.mkdtemp(prefix="sniper-logger-")
+    os.chdir(work)
+
+    legacy = timed(legacy_log_snipe, rows)
+    os.remove(store.SNIPES_LOG)
+
+    queued = timed(logger.log_snipe, rows)
+    start = time.perf_counter()
+    logger.flush()
+    drained = time.perf_counter() - start
+
+    read = store.get_store().snipes()
+    ok = [(r["Item Name"], r["UUID"]) for r in read] == [(r[0], r[4]) for r in rows]
+
+    print(f"{args.snipes} snipes, {type(store.get_store()).__name__}")
+    print(f"  open/append per snipe  {legacy * 1000:8.1f} ms")
+    print(f"  queued log_snipe       {queued * 1000:8.1f} ms  ({legacy / queued:.1f}x)")
+    print(f"  background flush       {drained * 1000:8.1f} ms")
+    print(f"Rows read back intact: {'yes' if ok else 'NO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,82 @@
+"""
+Micro-benchmark for normalizer.item_key.
+
+Checks that the compiled normaliser produces exactly the same keys as the
+original per-auction loop (re.sub + one str.replace per reforge) and times
+both over a corpus that repeats names the way a real snapshot does.
+
+    python -m benchmarks.bench_normalizer [--names 2000] [--auctions 200000]
+"""
+import argparse
+import random
+import re
+import time
+
+import normalizer
+from benchmarks.fixtures import TIERS, realistic_name
+from normalizer import REFORGES, item_key
+
+
+def legacy_key(item_name, tier):
+    index = re.sub(r"\[[^\]]*\]", "", item_name) + tier
+    for reforge in REFORGES:
+        index = index.replace(reforge, "")
+    return index
+
+
+def realistic_names(rng, n):
+    return [(realistic_name(rng), rng.choice(TIERS)) for _ in range(n)]
+
+
+def fuzz_names(rng, n):
+    """Random token soup to shake out ordering differences between the two."""
+    tokens = REFORGES + ["[Lvl 1]", "[", "]", " ", "✦", "⚚", "Sharp", "Hyperion", "Fine"]
+    return [("".join(rng.choice(tokens) for _ in range(rng.randint(1, 8))), rng.choice(TIERS))
+            for _ in range(n)]
+
+
+def verify(pairs):
+    mismatches = [(n, t) for n, t in pairs if item_key(n, t) != legacy_key(n, t)]
+    for name, tier in mismatches[:10]:
+        print(f"  MISMATCH {name!r} {tier}: {legacy_key(name, tier)!r} != {item_key(name, tier)!r}")
+    return not mismatches
+
+
+def timed(fn, pairs):
+    start = time.perf_counter()
+    for name, tier in pairs:
+        fn(name, tier)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--names", type=int, default=2000, help="distinct item names")
+    parser.add_argument("--auctions", type=int, default=200000, help="auctions per snapshot")
+    parser.add_argument("--fuzz", type=int, default=100000, help="random strings to verify")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    distinct = realistic_names(rng, args.names)
+    snapshot = [rng.choice(distinct) for _ in range(args.auctions)]
+
+    ok = verify(distinct) and verify(fuzz_names(rng, args.fuzz))
+    print(f"Output matches legacy: {'yes' if ok else 'NO'}")
+
+    legacy = timed(legacy_key, snapshot)
+    item_key.cache_clear()
+    uncached = timed(normalizer.item_key.__wrapped__, snapshot)
+    cached = timed(item_key, snapshot)
+    info = item_key.cache_info()
+
+    print(f"{args.auctions:,} auctions, {args.names:,} distinct names")
+    print(f"  legacy loop       {legacy * 1000:8.1f} ms")
+    print(f"  compiled, no LRU  {uncached * 1000:8.1f} ms  ({legacy / uncached:.1f}x)")
+    print(f"  compiled + LRU    {cached * 1000:8.1f} ms  ({legacy / cached:.1f}x, "
+          f"hit rate {info.hits / max(info.hits + info.misses, 1):.1%})")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
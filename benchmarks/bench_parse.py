@@ -0,0 +1,56 @@
+"""
+Page parsing throughput: thread pool vs process pool.
+
+Decodes and parses pre-rendered fixture pages (no network) the way the
+scanner does in each mode, and reports pages/s and the speedup of each
+process count over the threaded path.
+
+    python -m benchmarks.bench_parse [--pages 40] [--workers 1 2 4 8]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from aggregate import parse_page, parse_page_bytes
+from benchmarks.fixtures import LAST_UPDATED, synthetic_page_bytes
+
+
+def parse_threaded(raw_pages, workers):
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda raw: parse_page(json.loads(raw), LAST_UPDATED), raw_pages))
+
+
+def parse_processes(raw_pages, workers):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        executor.submit(int).result()           # don't time worker start-up
+        start = time.perf_counter()
+        list(executor.map(parse_page_bytes, range(len(raw_pages)), raw_pages,
+                          [LAST_UPDATED] * len(raw_pages)))
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse throughput, threads vs processes")
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    raw_pages = [synthetic_page_bytes(p, args.pages) for p in range(args.pages)]
+    print(f"{args.pages} pages, {sum(map(len, raw_pages)) / 1e6:.1f} MB, {os.cpu_count()} cores")
+
+    start = time.perf_counter()
+    parse_threaded(raw_pages, 10)
+    threaded = time.perf_counter() - start
+    print(f"  threads (10)    {args.pages / threaded:7.1f} pages/s")
+
+    for workers in args.workers:
+        elapsed = parse_processes(raw_pages, workers)
+        print(f"  processes ({workers:>2})  {args.pages / elapsed:7.1f} pages/s   "
+              f"x{threaded / elapsed:.2f} vs threads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Portfolio join: the old item-name merge vs portfolio.build_lots.
+
+Generates a flip history where a handful of items are flipped many times,
+checks that build_lots gives exactly one row per listing linked to the
+right snipe and sale, and times both joins.  The old merge is skipped when
+its output would exceed --legacy-rows (it is auctions x snipes x sales per
+item and runs out of memory quickly).
+
+    python -m benchmarks.bench_portfolio [--flips 1000] [--items 20]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.fixtures import realistic_name
+from portfolio import build_lots
+
+
+def history(rng, flips, items):
+    names = [realistic_name(rng) for _ in range(items)]
+    start = datetime(2026, 1, 1)
+    snipes, auctions, sales = [], [], []
+    for i in range(flips):
+        name = rng.choice(names)
+        stamp = start + timedelta(minutes=10 * i)
+        price = rng.randint(100_000, 10_000_000)
+        uuid = f"{i:032x}"
+        snipes.append({"Item Name": name, "Snipe Price": price, "Suggested BIN": int(price * 1.3),
+                       "Second Lowest BIN": int(price * 1.4), "UUID": uuid,
+                       "Timestamp": stamp.strftime("%Y-%m-%d %H:%M:%S")})
+        listed = stamp + timedelta(minutes=1)
+        auctions.append({"id": i + 1, "Timestamp": listed.strftime("%Y-%m-%d %H:%M:%S"), "Item Name": name,
+                         "Listed Price": int(price * 1.25), "Sold": "Yes" if i % 3 else "No",
+                         # every other listing predates UUID tracking
+                         "UUID": uuid if i % 2 else None})
+        if i % 3:
+            sold = listed + timedelta(minutes=5)
+            sales.append({"Timestamp": sold.strftime("%Y-%m-%d %H:%M:%S"), "Item Name": name,
+                          "Buy Price": price, "Sell Price": int(price * 1.2), "Profit": int(price * 0.2),
+                          "Auction ID": i + 1 if i % 4 else None})
+    return auctions, snipes, sales
+
+
+def legacy_join(auctions, snipes, sales):
+    import pandas as pd
+    return (pd.DataFrame(auctions)
+            .merge(pd.DataFrame(snipes), how="left", on="Item Name")
+            .merge(pd.DataFrame(sales), how="left", on="Item Name", suffixes=("", "_Sold")))
+
+
+def legacy_rows(auctions, snipes, sales):
+    counts = {}
+    for table, rows in enumerate((auctions, snipes, sales)):
+        for row in rows:
+            counts.setdefault(row["Item Name"], [0, 0, 0])[table] += 1
+    return sum(a * max(s, 1) * max(b, 1) for a, s, b in counts.values())
+
+
+def verify(lots):
+    for lot in lots:
+        i = lot["id"] - 1
+        if lot["snipe"] is None or lot["snipe"]["UUID"] != f"{i:032x}":
+            return False
+        if (lot["sale"] is not None) != (lot["Sold"] == "Yes"):
+            return False
+        if lot["sale"] and lot["sale"]["Buy Price"] != lot["snipe"]["Snipe Price"]:
+            return False
+    return True
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--flips", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=20, help="distinct items flipped")
+    parser.add_argument("--legacy-rows", type=int, default=5_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    auctions, snipes, sales = history(random.Random(args.seed), args.flips, args.items)
+    lots_time, lots = timed(build_lots, auctions, snipes, sales)
+    ok = len(lots) == len(auctions) and verify(lots)
+
+    print(f"{args.flips:,} flips of {args.items} items")
+    expected = legacy_rows(auctions, snipes, sales)
+    if expected <= args.legacy_rows:
+        legacy_time, merged = timed(legacy_join, auctions, snipes, sales)
+        print(f"  item-name merge  {legacy_time * 1000:9.1f} ms  {len(merged):>12,} rows")
+    else:
+        print(f"  item-name merge  {'skipped':>12}  {expected:>12,} rows")
+    print(f"  build_lots       {lots_time * 1000:9.1f} ms  {len(lots):>12,} rows")
+    print(f"Lots linked correctly: {'yes' if ok else 'NO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
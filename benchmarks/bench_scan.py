@@ -0,0 +1,193 @@
+"""
+End-to-end scanner benchmark against a synthetic or recorded snapshot.
+
+The mock server serves the snapshot and every stage runs in a fresh
+interpreter, in a scratch directory with the scanner pointed at the server,
+so timings are cold and peak RSS is per stage:
+
+  fetch:threads, fetch:async, fetch:processes
+                get_data_asynchronous over every page in each fetch/parse mode
+  normalise     item_index for every tracked auction, NBT and name caches cleared first
+  aggregate     reduce_tables + Snapshot.from_rows over the parsed pages
+  start_sniper  one full cycle from page 0 to the printed snipes
+
+Results can be saved and later compared against, to catch regressions.
+
+    python -m benchmarks.bench_scan [--pages 40] [--latency 0.02] [--recording DIR]
+    python -m benchmarks.bench_scan --save base.json
+    python -m benchmarks.bench_scan --baseline base.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STAGES = ["fetch:threads", "fetch:async", "fetch:processes", "normalise", "aggregate", "start_sniper"]
+REGRESSION = 1.10       # slower than baseline by more than this is flagged
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:             # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  Child side: one stage per interpreter
+# ────────────────────────────────────────────────────────────────────────────────
+def run_stage(stage: str, url: str) -> dict:
+    with open("config.json", "w") as f:
+        json.dump({"api_url": url, "budget": 10**12, "min_profit_percent": 20.0,
+                   "price_history": False}, f)
+    import nbt
+    import scanner
+    from aggregate import is_tracked, item_index, parse_page, reduce_tables
+    from decoder import decode_page
+    from normalizer import item_key
+    from snapshot import Snapshot
+
+    scanner.load_config()
+    if stage == "start_sniper":
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            scanner.time.sleep = lambda seconds: None       # "no flips" pause
+            scanner.start_sniper()
+        return {"seconds": time.perf_counter() - start, "pages": scanner.toppage,
+                "snipes": len(scanner.results)}
+
+    first = scanner.poll_first_page(changed_only=False)
+    scanner.now, scanner.toppage = first["lastUpdated"], first["totalPages"]
+    pages = range(1, scanner.toppage)
+
+    if stage.startswith("fetch:"):
+        mode = stage.split(":")[1]
+        scanner.FETCH_BACKEND = "httpx" if mode == "async" else "threads"
+        if mode == "processes":
+            scanner.PARSE_PROCESSES = "auto"
+        start = time.perf_counter()
+        partials = asyncio.run(scanner.get_data_asynchronous(pages))
+        return {"seconds": time.perf_counter() - start, "pages": len(partials)}
+
+    bodies = [scanner.poll_session.get(f"{scanner.AUCTIONS_URL}?page={page}").content for page in pages]
+    decoded = [first] + [decode_page(body) for body in bodies]
+
+    if stage == "normalise":
+        tracked = [a for data in decoded for a in data["auctions"] if a.get("bin") and is_tracked(a)]
+        item_key.cache_clear()
+        nbt.cache_clear()
+        start = time.perf_counter()
+        for auction in tracked:
+            item_index(auction)
+        return {"seconds": time.perf_counter() - start, "auctions": len(tracked),
+                "distinct": len(set(map(item_index, tracked)))}
+
+    if stage == "aggregate":
+        partials = [parse_page(data, scanner.now) for data in decoded]
+        start = time.perf_counter()
+        prices = reduce_tables([table for table, _, _ in partials])
+        Snapshot.from_rows([listed for _, listed, _ in partials])
+        return {"seconds": time.perf_counter() - start, "items": len(prices)}
+
+    raise ValueError(f"unknown stage {stage}")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  Parent side
+# ────────────────────────────────────────────────────────────────────────────────
+def spawn(stage: str, url: str) -> dict:
+    work = tempfile.mkdtemp(prefix="sniper-scan-")
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    done = subprocess.run([sys.executable, "-m", "benchmarks.bench_scan", "--stage", stage, "--url", url],
+                          cwd=work, env=env, capture_output=True, text=True)
+    if done.returncode:
+        return {"error": (done.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def describe(stage: str, result: dict, auctions: int, total_pages: int) -> str:
+    seconds = result["seconds"]
+    if stage.startswith("fetch:") or stage == "start_sniper":
+        pages = result["pages"]
+        rate = auctions * pages / total_pages / seconds
+        extra = f"{pages / seconds:7.1f} pages/s  {rate:10,.0f} auctions/s"
+        if "snipes" in result:
+            extra += f"  {result['snipes']} candidates"
+        return extra
+    if stage == "normalise":
+        return (f"{result['auctions'] / seconds:10,.0f} auctions/s "
+                f"({result['distinct']:,} distinct keys)")
+    return f"{result['items']:,} items"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--per-page", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency per request (s)")
+    parser.add_argument("--recording", help="replay a snapshot saved by benchmarks.recording")
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --save")
+    parser.add_argument("--stage", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage:
+        result = run_stage(args.stage, args.url)
+        result["peak_rss_mb"] = peak_rss_mb()
+        print(json.dumps(result))
+        return 0
+
+    from benchmarks.mock_server import start_server
+    server = start_server(pages=args.pages, per_page=args.per_page, latency=args.latency,
+                          recording=args.recording)
+    auctions = sum(len(json.loads(body)["auctions"]) for body in server._pages)
+    source = args.recording or "synthetic pages"
+    print(f"{source}: {server.total_pages} pages, {auctions:,} auctions, "
+          f"{args.latency * 1000:.0f} ms latency")
+
+    results = {}
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = 0
+    try:
+        for stage in args.stages:
+            result = results[stage] = spawn(stage, server.url)
+            if "error" in result:
+                print(f"  {stage:<16} FAILED: {result['error']}")
+                regressions += 1
+                continue
+            rss = result.get("peak_rss_mb")
+            line = (f"  {stage:<16} {result['seconds'] * 1000:9.1f} ms  "
+                    f"{describe(stage, result, auctions, server.total_pages)}"
+                    + (f"  peak RSS {rss:.0f} MB" if rss else ""))
+            before = baseline.get(stage, {}).get("seconds")
+            if before:
+                ratio = result["seconds"] / before
+                line += f"  ({ratio:.2f}x baseline{' REGRESSION' if ratio > REGRESSION else ''})"
+                regressions += ratio > REGRESSION
+            print(line)
+    finally:
+        server.shutdown()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=4)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,99 @@
+"""
+Startup cost: module import times and time until the main menu is shown.
+
+Each measurement runs in a fresh interpreter in a scratch copy of the data
+files, and the run fails if importing the app pulls in pandas/matplotlib or
+modifies any file.
+
+    python -m benchmarks.bench_startup [--runs 5]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("pandas", "matplotlib", "numpy", "httpx")
+CHECK = ("import sys, {module}; "
+         "print(','.join(m for m in {heavy!r} if m in sys.modules))")
+
+
+def scratch_copy() -> Path:
+    work = Path(tempfile.mkdtemp(prefix="sniper-startup-"))
+    for path in ROOT.iterdir():
+        if path.suffix in (".py", ".json", ".txt"):
+            shutil.copy2(path, work / path.name)
+    return work
+
+
+def snapshot_files(work: Path) -> dict:
+    return {p.name: p.stat().st_mtime_ns for p in work.iterdir() if p.is_file()}
+
+
+def time_import(work: Path, module: str, runs: int):
+    times, loaded = [], ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", CHECK.format(module=module, heavy=HEAVY)],
+                             cwd=work, capture_output=True, text=True, check=True)
+        times.append(time.perf_counter() - start)
+        loaded = out.stdout.strip()
+    return statistics.median(times), loaded
+
+
+def time_to_menu(work: Path, runs: int) -> float:
+    """Seconds from launching `python utils.py` until the menu prompt appears."""
+    times = []
+    env = dict(os.environ, TERM="dumb")
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-u", "utils.py"], cwd=work, env=env,
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL)
+        seen = b""
+        while b"Select an option" not in seen:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                break
+            seen += chunk
+        times.append(time.perf_counter() - start)
+        proc.communicate(b"8\n", timeout=10)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import and menu startup times")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    work = scratch_copy()
+    try:
+        before = snapshot_files(work)
+        baseline, _ = time_import(work, "sys", args.runs)
+        print(f"  {'python -c pass':<19} {baseline * 1000:7.0f} ms")
+        ok = True
+        for module in ("utils", "sell_tracker", "logger", "scanner"):
+            elapsed, loaded = time_import(work, module, args.runs)
+            note = f"(loads {loaded})" if loaded else ""
+            print(f"  import {module:<12} {elapsed * 1000:7.0f} ms  {note}")
+            if module != "scanner" and loaded:
+                ok = False
+        print(f"  {'menu shown':<19} {time_to_menu(work, args.runs) * 1000:7.0f} ms")
+
+        changed = [name for name, mtime in snapshot_files(work).items()
+                   if before.get(name) != mtime and not name.startswith("__")]
+        if changed:
+            print(f"  files written during startup: {', '.join(changed)}")
+            ok = False
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
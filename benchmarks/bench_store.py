@@ -0,0 +1,154 @@
+"""
+Log storage: CSV files vs the SQLite store on a large history.
+
+Writes synthetic snipe/auction/sale logs as CSV, imports them into SQLite
+(the one-time migration), then times the queries the menu screens make on
+both backends and checks they return the same rows.  The CSV store keeps
+what it parsed, so a query after an append only parses the new row.  Finally ``--writers``
+processes share the CSV logs, listing auctions, marking them sold and
+logging snipes while the compactor runs, and every row is checked to be
+there afterwards.
+
+    python -m benchmarks.bench_store [--rows 200000] [--writers 4]
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import store
+from benchmarks.fixtures import realistic_name
+
+
+def write_logs(rng, n):
+    names = [realistic_name(rng) for _ in range(2000)]
+    start = datetime(2026, 1, 1)
+    stamps = [(start + timedelta(seconds=30 * i)).strftime("%Y-%m-%d %H:%M:%S") for i in range(n)]
+    with open(store.SNIPES_LOG, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(store.HEADERS[store.SNIPES_LOG])
+        for i, stamp in enumerate(stamps):
+            price = rng.randint(10_000, 50_000_000)
+            writer.writerow([rng.choice(names), price, int(price * 1.3), int(price * 1.4), stamp, f"{i:032x}"])
+    with open(store.AUCTIONS_LOG, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(store.HEADERS[store.AUCTIONS_LOG])
+        for i, stamp in enumerate(stamps[::4]):
+            writer.writerow([stamp, rng.choice(names), rng.randint(10_000, 60_000_000),
+                             "No" if i % 50 == 0 else "Yes"])
+    with open(store.SALES_LOG, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(store.HEADERS[store.SALES_LOG])
+        for stamp in stamps[::5]:
+            buy, sell = rng.randint(10_000, 50_000_000), rng.randint(10_000, 60_000_000)
+            writer.writerow([stamp, rng.choice(names), buy, sell, sell - buy])
+    return names
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def strip_ids(rows):
+    return [{k: v for k, v in row.items() if k != "id"} for row in rows]
+
+
+def writer(directory, n):
+    os.chdir(directory)
+    csv_store = store.CsvStore()
+    pid = os.getpid()
+    for i in range(n):
+        auction_id = csv_store.add_auction(f"Writer {pid}", i, store.now_stamp(), f"{pid:x}-{i}")
+        if i % 2:
+            csv_store.mark_sold(auction_id)
+        csv_store.add_snipes([(f"Writer {pid}", i, i, i, store.now_stamp(), f"{pid:x}-{i}")])
+
+
+def shared_writes(writers, n):
+    """Whether ``writers`` processes sharing the logs lost or misfiled anything."""
+    processes = [multiprocessing.Process(target=writer, args=(os.getcwd(), n)) for _ in range(writers)]
+    for process in processes:
+        process.start()
+    compactions = 0
+    while any(process.is_alive() for process in processes):
+        compactions += store.compact()
+        time.sleep(0.01)
+    for process in processes:
+        process.join()
+    store.compact()
+    csv_store = store.CsvStore()
+    auctions = [row for row in csv_store.auctions() if row["Item Name"].startswith("Writer ")]
+    snipes = [row for row in csv_store.snipes() if row["Item Name"].startswith("Writer ")]
+    sold_right = all((row["Sold"] == "Yes") == (row["Listed Price"] % 2 == 1) for row in auctions)
+    print(f"{writers} processes x {n} listings and snipes with {compactions} compactions: "
+          f"{len(auctions):,} auctions, {len(snipes):,} snipes, sold flags {'right' if sold_right else 'WRONG'}")
+    return len(auctions) == len(snipes) == writers * n and sold_right
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000, help="snipes in the log")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--writers", type=int, default=4, help="processes sharing the CSV logs")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="sniper-store-"))
+    rng = random.Random(args.seed)
+    item = rng.choice(write_logs(rng, args.rows))
+    last_day = (datetime(2026, 1, 1) + timedelta(seconds=30 * args.rows, days=-1)).strftime("%Y-%m-%d %H:%M:%S")
+
+    csv_store = store.CsvStore()
+    migrate, sqlite_store = timed(store.SqliteStore)
+    print(f"{args.rows:,} snipes; CSV import into SQLite {migrate * 1000:.0f} ms (once)")
+
+    ok = True
+    queries = [
+        ("recent 15 snipes", "recent_snipes", 15),
+        ("last snipe of item", "last_snipe", item),
+        ("snipes of the last day", "snipes_since", last_day),
+        ("unsold auctions", "unsold_auctions"),
+    ]
+    print(f"  {'':24} {'csv':>10} {'sqlite':>10}")
+    for label, method, *query in queries:
+        csv_time, csv_rows = timed(getattr(csv_store, method), *query)
+        sql_time, sql_rows = timed(getattr(sqlite_store, method), *query)
+        if isinstance(csv_rows, list):
+            csv_rows, sql_rows = strip_ids(csv_rows), strip_ids(sql_rows)
+        elif csv_rows and sql_rows:
+            csv_rows, sql_rows = strip_ids([csv_rows]), strip_ids([sql_rows])
+        ok &= csv_rows == sql_rows
+        print(f"  {label:24} {csv_time * 1000:8.1f}ms {sql_time * 1000:8.1f}ms")
+
+    target = sqlite_store.unsold_auctions()[-1]["id"]
+    csv_target = csv_store.unsold_auctions()[-1]["id"]
+    csv_time, _ = timed(csv_store.mark_sold, csv_target)
+    sql_time, _ = timed(sqlite_store.mark_sold, target)
+    ok &= strip_ids(csv_store.unsold_auctions()) == strip_ids(sqlite_store.unsold_auctions())
+    print(f"  {'mark one auction sold':24} {csv_time * 1000:8.1f}ms {sql_time * 1000:8.1f}ms")
+    csv_time, _ = timed(csv_store.add_auction, item, 1_000_000, store.now_stamp())
+    sql_time, _ = timed(sqlite_store.add_auction, item, 1_000_000, store.now_stamp())
+    print(f"  {'list one auction':24} {csv_time * 1000:8.1f}ms {sql_time * 1000:8.1f}ms")
+    compaction, _ = timed(store.compact)
+    print(f"  {'compact auction events':24} {compaction * 1000:8.1f}ms")
+    snipe = [(item, 1, 2, 3, store.now_stamp(), "f" * 32)]
+    csv_store.add_snipes(snipe)
+    sqlite_store.add_snipes(snipe)
+    csv_time, csv_rows = timed(csv_store.last_snipe, item)
+    sql_time, sql_rows = timed(sqlite_store.last_snipe, item)
+    ok &= csv_rows == sql_rows
+    print(f"  {'last snipe, after append':24} {csv_time * 1000:8.1f}ms {sql_time * 1000:8.1f}ms")
+
+    print(f"Backends agree: {'yes' if ok else 'NO'}")
+    if args.writers:
+        ok &= shared_writes(args.writers, 200)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+"""
+Trends screen cost on a long snipe history.
+
+Logs months of synthetic snipes through the SQLite store (which keeps the
+trend buckets up to date as it goes), then times store.trends for each
+window against the old full-log pandas groupby, and checks the top items
+and their flip counts agree with the CSV backend.
+
+    python -m benchmarks.bench_trends [--days 90] [--per-hour 60]
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import store
+from benchmarks.fixtures import realistic_name
+
+
+def history(rng, days, per_hour):
+    names = [realistic_name(rng) for _ in range(500)]
+    now = datetime.now()
+    rows = []
+    for i in range(days * 24 * per_hour):
+        stamp = now - timedelta(seconds=(i + 1) * 3600 / per_hour)
+        price = rng.randint(10_000, 50_000_000)
+        rows.append((rng.choice(names), price, int(price * rng.uniform(1.1, 1.6)), int(price * 1.7),
+                     stamp.strftime("%Y-%m-%d %H:%M:%S"), f"{i:032x}"))
+    rows.reverse()
+    return rows
+
+
+def legacy_trends(window):
+    import pandas as pd
+    df = pd.read_csv(store.SNIPES_LOG, parse_dates=["Timestamp"])
+    recent = df[df["Timestamp"] > pd.Timestamp.now() - pd.Timedelta(seconds=window)]
+    return (recent
+            .groupby("Item Name")
+            .agg(Flips=("UUID", "count"),
+                 AvgProfit=("Suggested BIN",
+                            lambda x: (x - recent.loc[x.index, "Snipe Price"]).mean()))
+            .sort_values(by="Flips", ascending=False)
+            .head(10))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--per-hour", type=int, default=60, help="snipes logged per hour")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix="sniper-trends-"))
+    rows = history(random.Random(args.seed), args.days, args.per_hour)
+    sqlite_store = store.SqliteStore()
+    start = time.perf_counter()
+    for chunk in range(0, len(rows), 256):          # batches as the snipe logger writes them
+        sqlite_store.add_snipes(rows[chunk:chunk + 256])
+    logged = time.perf_counter() - start
+    with open(store.SNIPES_LOG, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(store.HEADERS[store.SNIPES_LOG])
+        writer.writerows(rows)
+    csv_store = store.CsvStore()
+
+    print(f"{len(rows):,} snipes over {args.days} days; logging with buckets "
+          f"{logged / len(rows) * 1e6:.1f} µs/snipe")
+    print(f"  {'window':8} {'pandas':>10} {'csv':>10} {'sqlite':>10}")
+    ok = True
+    for name, window in store.TREND_WINDOWS.items():
+        legacy_time, _ = timed(legacy_trends, window)
+        csv_time, from_csv = timed(csv_store.trends, window)
+        sql_time, from_sql = timed(sqlite_store.trends, window)
+        ok &= ([(r["Item Name"], r["Flips"], r["MinProfit"], r["MaxProfit"]) for r in from_csv]
+               == [(r["Item Name"], r["Flips"], r["MinProfit"], r["MaxProfit"]) for r in from_sql])
+        print(f"  {name:8} {legacy_time * 1000:8.1f}ms {csv_time * 1000:8.1f}ms {sql_time * 1000:8.1f}ms")
+    print(f"Backends agree: {'yes' if ok else 'NO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
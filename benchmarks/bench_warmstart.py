@@ -0,0 +1,116 @@
+"""
+Time from a scanner restart to its first snipe alert, cold vs warm-started.
+
+A first scanner process runs one cycle against the mock server and exits,
+leaving its warm-start cache behind.  The server then publishes a refresh
+with underpriced copies of existing listings, and a fresh process is
+started twice: once ignoring the cache (a full scan) and once loading it
+(an incremental scan).  Both are timed from interpreter start to the first
+snipe emitted and to the end of the cycle.
+
+    python -m benchmarks.bench_warmstart [--pages 40] [--latency 0.02]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import uuid as uuidlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  Child side: one scanner process
+# ────────────────────────────────────────────────────────────────────────────────
+def run_child(url: str, warm: bool) -> dict:
+    started = time.perf_counter()
+    with open("config.json", "w") as f:
+        json.dump({"api_url": url, "budget": 10**12, "price_history": False, "metrics": True,
+                   "metrics_file": "", "warm_cache": warm, "warm_cache_max_age": 3600}, f)
+    import contextlib
+    import io
+    import scanner
+
+    first = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        scanner.start_sniper(incremental=True,
+                             emit=lambda event: first or first.append(time.perf_counter() - started))
+    return {"first_snipe": first[0] if first else None, "cycle": time.perf_counter() - started,
+            "mode": scanner.metrics.last["mode"], "pages": scanner.metrics.last["pages"]}
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  Parent side
+# ────────────────────────────────────────────────────────────────────────────────
+def spawn(work: str, url: str, warm: bool) -> dict:
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    command = [sys.executable, "-m", "benchmarks.bench_warmstart", "--child", url] + (["--warm"] if warm else [])
+    done = subprocess.run(command, cwd=work, env=env, capture_output=True, text=True)
+    if done.returncode:
+        return {"error": (done.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def bargains(server, count: int) -> list[dict]:
+    """Copies of the cheapest listings of ``count`` items at a third of their price."""
+    from aggregate import is_tracked, item_index
+
+    cheapest = {}
+    for body in [json.dumps(server._first).encode()] + server._pages[1:]:
+        for auction in json.loads(body)["auctions"]:
+            if auction["bin"] and is_tracked(auction):
+                key = item_index(auction)
+                if key not in cheapest or auction["starting_bid"] < cheapest[key]["starting_bid"]:
+                    cheapest[key] = auction
+    start = server.last_updated + 30_000            # inside the refresh about to be published
+    copies = []
+    for auction in list(cheapest.values())[:count]:
+        copies.append(dict(auction, uuid=uuidlib.uuid4().hex, start=start, end=start + 3600_000,
+                           starting_bid=max(auction["starting_bid"] // 3, 10)))
+    return copies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--per-page", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency per request (s)")
+    parser.add_argument("--bargains", type=int, default=5, help="underpriced listings in the refresh")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.warm)))
+        return 0
+
+    from benchmarks.mock_server import start_server
+    server = start_server(pages=args.pages, per_page=args.per_page, latency=args.latency)
+    work = tempfile.mkdtemp(prefix="sniper-warm-")
+    print(f"{args.pages} pages, {args.latency * 1000:.0f} ms latency, "
+          f"{args.bargains} underpriced listings in the refresh after the restart")
+    try:
+        seed = spawn(work, server.url, warm=True)       # the run before the restart
+        if "error" in seed:
+            print(f"  first run FAILED: {seed['error']}")
+            return 1
+        server.publish(bargains(server, args.bargains))
+        print(f"  {'':6} {'mode':12} {'pages':>6} {'first snipe':>12} {'cycle':>9}")
+        for label, warm in (("cold", False), ("warm", True)):
+            result = spawn(work, server.url, warm)
+            if "error" in result:
+                print(f"  {label:6} FAILED: {result['error']}")
+                return 1
+            first = f"{result['first_snipe']:10.2f}s" if result["first_snipe"] is not None else f"{'none':>11}"
+            print(f"  {label:6} {result['mode']:12} {result['pages']:6} {first} {result['cycle']:8.2f}s")
+    finally:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
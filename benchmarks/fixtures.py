@@ -0,0 +1,132 @@
+"""
+Synthetic auction-house pages shaped like the /skyblock/auctions API, for
+offline benchmarks and the mock server.  Pages are deterministic for a given
+seed and page number.
+"""
+import base64
+import gzip
+import json
+import random
+import re
+import struct
+import uuid as uuidlib
+
+from normalizer import REFORGES
+
+TIERS = ["COMMON", "UNCOMMON", "RARE", "EPIC", "LEGENDARY", "MYTHIC", "DIVINE", "SPECIAL"]
+BASES = [
+    "Hyperion", "Necron's Blade", "Aspect of the End", "Livid Dagger", "Juju Shortbow",
+    "Terminator", "Shadow Fury", "Giant's Sword", "Wither Goggles", "Necron's Chestplate",
+    "Storm's Leggings", "Enchanted Book", "Ender Dragon", "Golden Dragon", "Ostrich Plume",
+    "Divan's Drill", "Titanium Drill DR-X655", "Bonzo's Staff", "Spirit Sceptre", "Midas' Sword",
+]
+PER_PAGE = 1000
+LAST_UPDATED = 1_700_000_000_000
+
+
+def realistic_name(rng: random.Random) -> str:
+    words = [r for r in REFORGES if r[0].isalpha()]
+    name = rng.choice(BASES)
+    if rng.random() < 0.6:
+        name = rng.choice(words) + name
+    if rng.random() < 0.2:
+        name = f"[Lvl {rng.randint(1, 200)}] " + name
+    if rng.random() < 0.1:
+        name = "⚚ " + name
+    if rng.random() < 0.3:
+        name += " " + "✪" * rng.randint(1, 5)
+    if rng.random() < 0.1:
+        name += " ✦"
+    return name
+
+
+def _nbt_string(text: str) -> bytes:
+    data = text.encode()
+    return struct.pack(">H", len(data)) + data
+
+
+def _nbt(value) -> tuple[int, bytes]:
+    """``(tag, payload)`` of a dict/list/str/int as NBT."""
+    if isinstance(value, dict):
+        body = b""
+        for name, child in value.items():
+            tag, payload = _nbt(child)
+            body += bytes([tag]) + _nbt_string(name) + payload
+        return 10, body + b"\0"
+    if isinstance(value, list):
+        children = [_nbt(child) for child in value]
+        tag = children[0][0] if children else 0
+        return 9, bytes([tag]) + struct.pack(">i", len(children)) + b"".join(p for _, p in children)
+    if isinstance(value, str):
+        return 8, _nbt_string(value)
+    return 3, struct.pack(">i", value)
+
+
+def item_bytes(name: str, lore: str) -> str:
+    """``item_bytes`` for a display name made by realistic_name()."""
+    base = next(base for base in BASES if base in name)
+    item_id = re.sub(r"[^A-Z0-9]+", "_", base.upper().replace("'S", "")).strip("_")
+    extra = {"id": item_id}
+    if "[Lvl " in name:
+        extra["id"] = "PET"
+        extra["petInfo"] = json.dumps({"type": item_id, "active": False, "exp": 0.0})
+    elif item_id == "ENCHANTED_BOOK":
+        extra["enchantments"] = {"ultimate_wise": 5}
+    if "✪" in name:
+        extra["upgrade_level"] = name.count("✪")
+    if name.endswith("✦"):
+        extra["rarity_upgrades"] = 1
+    stack = {"id": 276, "Count": 1,
+             "tag": {"ExtraAttributes": extra, "display": {"Name": name, "Lore": lore.split("\n")}}}
+    _, payload = _nbt({"i": [stack]})
+    return base64.b64encode(gzip.compress(b"\x0a" + _nbt_string("") + payload, mtime=0)).decode()
+
+
+def synthetic_auction(rng: random.Random, last_updated: int = LAST_UPDATED) -> dict:
+    if rng.random() < 0.02:     # listed within the last minute
+        start = last_updated - rng.randint(0, 59_000)
+    else:
+        start = last_updated - rng.randint(60_000, 6 * 24 * 3600 * 1000)
+    name = realistic_name(rng)
+    lore = "\n".join(f"§7Line {i}: §a+{rng.randint(1, 500)} stat" for i in range(rng.randint(8, 30)))
+    if rng.random() < 0.01:
+        lore += "\n§8Furniture"
+    return {
+        "uuid": uuidlib.UUID(int=rng.getrandbits(128)).hex,
+        "auctioneer": uuidlib.UUID(int=rng.getrandbits(128)).hex,
+        "profile_id": uuidlib.UUID(int=rng.getrandbits(128)).hex,
+        "coop": [],
+        "start": start,
+        "end": start + rng.choice([1, 6, 12, 24, 48]) * 3600 * 1000,
+        "item_name": name,
+        "item_lore": lore,
+        "extra": name + " " + lore[:80],
+        "category": "weapon",
+        "tier": rng.choice(TIERS),
+        "starting_bid": rng.randint(1, 2000) * 10_000,
+        "item_bytes": item_bytes(name, lore),
+        "claimed": rng.random() < 0.02,
+        "claimed_bidders": [],
+        "highest_bid_amount": 0,
+        "last_updated": start,
+        "bin": rng.random() < 0.85,
+        "bids": [],
+    }
+
+
+def synthetic_page(page: int, total_pages: int, per_page: int = PER_PAGE, seed: int = 0,
+                   last_updated: int = LAST_UPDATED) -> dict:
+    rng = random.Random(seed * 1_000_003 + page)
+    count = per_page if page < total_pages - 1 else per_page // 2
+    return {
+        "success": True,
+        "page": page,
+        "totalPages": total_pages,
+        "totalAuctions": (total_pages - 1) * per_page + per_page // 2,
+        "lastUpdated": last_updated,
+        "auctions": [synthetic_auction(rng, last_updated) for _ in range(count)],
+    }
+
+
+def synthetic_page_bytes(page: int, total_pages: int, **kwargs) -> bytes:
+    return json.dumps(synthetic_page(page, total_pages, **kwargs)).encode()
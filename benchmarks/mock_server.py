@@ -0,0 +1,194 @@
+"""
+Local stand-in for the Hypixel auction endpoints.
+
+Serves synthetic pages, or a snapshot saved by benchmarks.recording, over
+keep-alive HTTP/1.1 with a configurable per-request latency, so fetch
+strategies can be benchmarked offline.  Point the scanner at it with
+``"api_url": "http://127.0.0.1:8080/skyblock"`` in config.json.
+
+With ``throttle`` it also rate-limits like the real API: at most that many
+requests per ``window`` seconds, ``RateLimit-*`` headers on every response
+and a 429 with ``Retry-After`` once the window is used up.
+
+    python -m benchmarks.mock_server [--port 8080] [--pages 100] [--latency 0.05]
+    python -m benchmarks.mock_server --recording DIR
+    python -m benchmarks.mock_server --throttle 60 --window 1
+"""
+import argparse
+import json
+import math
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.recording import load as load_recording
+from benchmarks.fixtures import LAST_UPDATED, PER_PAGE, synthetic_page, synthetic_page_bytes
+
+
+class MockAuctionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, pages=50, per_page=PER_PAGE, latency=0.0, seed=0, recording=None,
+                 throttle=0, window=1.0):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.requests = 0
+        self.throttle = throttle
+        self.window = window
+        self.throttled = 0          # 429s sent
+        self._window_start = time.monotonic()
+        self._window_used = 0
+        if recording is not None:
+            meta, self._pages, ended = load_recording(recording) if isinstance(recording, str) else recording
+            self.total_pages = len(self._pages)
+            self.last_updated = meta["lastUpdated"]
+            self._first = json.loads(self._pages[0])
+        else:
+            self.total_pages = pages
+            self.last_updated = LAST_UPDATED
+            self._first = synthetic_page(0, pages, per_page=per_page, seed=seed)
+            self._pages = [json.dumps(self._first).encode()] + [
+                synthetic_page_bytes(p, pages, per_page=per_page, seed=seed) for p in range(1, pages)]
+            ended = None
+        self._ended = ended or json.dumps({"success": True, "lastUpdated": self.last_updated,
+                                           "auctions": []}).encode()
+        self._lock = threading.Lock()
+
+    def publish(self, new_auctions=(), ended=(), advance_ms=60_000):
+        """
+        Simulate an API refresh: bump lastUpdated, put ``new_auctions`` at the
+        front of page 0 (or of each page, given a ``{page: auctions}`` dict)
+        and report the ``ended`` auction UUIDs in the ended feed.
+        """
+        by_page = new_auctions if isinstance(new_auctions, dict) else {0: new_auctions}
+        with self._lock:
+            self.last_updated += advance_ms
+            gone = set(ended)
+            for page in set(by_page) | {0}:
+                data = self._first if page == 0 else json.loads(self._pages[page])
+                data["auctions"] = list(by_page.get(page, ())) + [
+                    a for a in data["auctions"] if a["uuid"] not in gone]
+                data["lastUpdated"] = self.last_updated
+                self._pages[page] = json.dumps(data).encode()
+            self._ended = json.dumps({
+                "success": True, "lastUpdated": self.last_updated,
+                "auctions": [{"auction_id": uuid, "price": 0, "bin": True,
+                              "timestamp": self.last_updated} for uuid in ended],
+            }).encode()
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.last_updated}"'
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/skyblock"
+
+    def page(self, page: int):
+        if 0 <= page < self.total_pages:
+            return 200, self._pages[page]
+        return 404, json.dumps({"success": False, "cause": "Page not found"}).encode()
+
+    def ended(self):
+        return 200, self._ended
+
+    def admit(self):
+        """
+        Count a request against the rate limit: ``(allowed, headers)``.
+        """
+        if not self.throttle:
+            return True, []
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._window_start, self._window_used = now, 0
+            reset = max(1, math.ceil(self._window_start + self.window - now))
+            allowed = self._window_used < self.throttle
+            if allowed:
+                self._window_used += 1
+            else:
+                self.throttled += 1
+            headers = [("RateLimit-Limit", str(self.throttle)),
+                       ("RateLimit-Remaining", str(self.throttle - self._window_used)),
+                       ("RateLimit-Reset", str(reset))]
+        return allowed, headers if allowed else headers + [("Retry-After", str(reset))]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        with server._lock:
+            server.requests += 1
+        if server.latency:
+            time.sleep(server.latency)
+
+        allowed, limits = server.admit()
+        if not allowed:
+            self._send(429, b'{"success": false, "cause": "Key throttle"}', limits)
+            return
+        url = urlparse(self.path)
+        if url.path.endswith("/auctions"):
+            page = int(parse_qs(url.query).get("page", ["0"])[0])
+            if page == 0 and self.headers.get("If-None-Match") == server.etag:
+                self._send(304, b"", limits)
+                return
+            status, body = server.page(page)
+            validators = [("ETag", server.etag),
+                          ("Last-Modified", formatdate(server.last_updated / 1000, usegmt=True))]
+            self._send(status, body, limits + (validators if page == 0 else []))
+        elif url.path.endswith("/auctions_ended"):
+            status, body = server.ended()
+            self._send(status, body, limits)
+        else:
+            self._send(404, b'{"success": false}')
+
+    def _send(self, status, body, headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(port=0, **kwargs) -> MockAuctionServer:
+    """
+    Start a mock server on a background thread; ``server.shutdown()`` stops it.
+    """
+    server = MockAuctionServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the auctions API")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--per-page", type=int, default=PER_PAGE)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--recording", help="replay a snapshot saved by benchmarks.recording")
+    parser.add_argument("--throttle", type=int, default=0, help="requests allowed per window, 0 = unlimited")
+    parser.add_argument("--window", type=float, default=1.0, help="rate-limit window (s)")
+    args = parser.parse_args()
+
+    server = MockAuctionServer(("127.0.0.1", args.port), pages=args.pages,
+                               per_page=args.per_page, latency=args.latency, recording=args.recording,
+                               throttle=args.throttle, window=args.window)
+    print(f"Serving {server.total_pages} pages on {server.url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Record a full auction-house snapshot to disk, for replay.
+
+Every page body of /skyblock/auctions (and the ended feed) is saved exactly
+as received, gzip-compressed, next to a small meta.json.  The mock server
+replays a recording with ``--recording DIR``, so the scanner and the
+benchmarks can run against real data offline and reproducibly.
+
+    python -m benchmarks.recording DIR [--api-url https://api.hypixel.net/skyblock]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import time
+
+from decoder import loads
+from fetcher import AsyncFetcher
+
+API_URL = "https://api.hypixel.net/skyblock"
+META = "meta.json"
+
+
+def page_path(directory: str, page: int) -> str:
+    return os.path.join(directory, f"page_{page:04d}.json.gz")
+
+
+def ended_path(directory: str) -> str:
+    return os.path.join(directory, "auctions_ended.json.gz")
+
+
+async def _download(api_url: str, concurrency: int):
+    async with AsyncFetcher(api_url + "/auctions", concurrency=concurrency) as fetcher:
+        _, first = await fetcher.fetch_page(0, raw=True)
+        if first is None:
+            raise RuntimeError("could not fetch page 0")
+        total = loads(first)["totalPages"]
+        pages = {0: first}
+        async for page, raw in fetcher.pages(range(1, total), raw=True):
+            if raw is None:
+                raise RuntimeError(f"could not fetch page {page}")
+            pages[page] = raw
+        ended = await fetcher.get_raw(api_url + "/auctions_ended")
+    return pages, ended
+
+
+def record(directory: str, api_url: str = API_URL, concurrency: int = 10, level: int = 6) -> dict:
+    """
+    Download every page and write the recording; returns its meta.
+    """
+    started = time.time()
+    pages, ended = asyncio.run(_download(api_url, concurrency))
+    os.makedirs(directory, exist_ok=True)
+    for page, raw in pages.items():
+        with gzip.open(page_path(directory, page), "wb", compresslevel=level) as f:
+            f.write(raw)
+    if ended is not None:
+        with gzip.open(ended_path(directory), "wb", compresslevel=level) as f:
+            f.write(ended)
+
+    first = loads(pages[0])
+    meta = {
+        "lastUpdated": first["lastUpdated"],
+        "totalPages": len(pages),
+        "auctions": sum(len(loads(raw)["auctions"]) for raw in pages.values()),
+        "recorded_at": int(started * 1000),
+        "source": api_url,
+        "raw_bytes": sum(len(raw) for raw in pages.values()),
+    }
+    with open(os.path.join(directory, META), "w") as f:
+        json.dump(meta, f, indent=4)
+    return meta
+
+
+def load(directory: str) -> tuple[dict, list[bytes], bytes | None]:
+    """
+    ``(meta, page bodies in page order, ended feed body or None)``.
+    """
+    with open(os.path.join(directory, META)) as f:
+        meta = json.load(f)
+    pages = []
+    for page in range(meta["totalPages"]):
+        with gzip.open(page_path(directory, page), "rb") as f:
+            pages.append(f.read())
+    ended = None
+    if os.path.exists(ended_path(directory)):
+        with gzip.open(ended_path(directory), "rb") as f:
+            ended = f.read()
+    return meta, pages, ended
+
+
+def disk_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--api-url", default=API_URL)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    meta = record(args.directory, args.api_url, args.concurrency)
+    print(f"Recorded {meta['totalPages']} pages, {meta['auctions']:,} auctions "
+          f"(lastUpdated {meta['lastUpdated']}) to {args.directory}: "
+          f"{meta['raw_bytes'] / 2**20:.1f} MB raw, {disk_size(args.directory) / 2**20:.1f} MB on disk")
+
+
+if __name__ == "__main__":
+    main()
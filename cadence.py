@@ -0,0 +1,57 @@
+"""
+Learns when the auction API refreshes so polls can be timed to land just
+after each refresh instead of on a fixed sleep.
+"""
+import statistics
+import time
+
+
+class UpdateCadence:
+    """
+    Tracks the API's ``lastUpdated`` stamps.  The refresh interval is the
+    median gap between successive stamps, and the offset between the server
+    clock and ours is the smallest ``local time - lastUpdated`` seen (the
+    poll that caught a refresh soonest).
+    """
+
+    def __init__(self, default: float = 60.0, margin: float = 1.0, retry: float = 2.0,
+                 history: int = 10):
+        self.default = default
+        self.margin = margin
+        self.retry = retry
+        self.history = history
+        self.last_updated = 0
+        self.gaps = []
+        self.offsets = []
+
+    def observe(self, last_updated: int, seen_at: float | None = None) -> bool:
+        """
+        Record a polled ``lastUpdated`` (ms); returns True if it is new.
+        """
+        if not last_updated or last_updated <= self.last_updated:
+            return False
+        seen_at = time.time() if seen_at is None else seen_at
+        if self.last_updated:
+            self.gaps = (self.gaps + [(last_updated - self.last_updated) / 1000])[-self.history:]
+        self.offsets = (self.offsets + [seen_at - last_updated / 1000])[-self.history:]
+        self.last_updated = last_updated
+        return True
+
+    @property
+    def interval(self) -> float:
+        return statistics.median(self.gaps) if self.gaps else self.default
+
+    def next_update(self) -> float:
+        """Local time the next refresh is expected to be visible."""
+        return self.last_updated / 1000 + self.interval + min(self.offsets)
+
+    def next_delay(self, now: float | None = None) -> float:
+        """
+        Seconds to sleep before the next poll: until just after the expected
+        refresh, or ``retry`` if it is already overdue.
+        """
+        if not self.last_updated:
+            return self.retry
+        now = time.time() if now is None else now
+        delay = self.next_update() + self.margin - now
+        return delay if delay > 0 else self.retry
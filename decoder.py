@@ -0,0 +1,69 @@
+"""
+JSON decoding for auction pages.
+
+``loads`` uses the fastest JSON library installed (orjson, then ujson, then
+the stdlib).  ``decode_page`` additionally keeps only the auction fields the
+scanner reads, so a page's auctions never exist as full dicts: the lore is
+reduced to a ``furniture`` flag and everything else is dropped while decoding.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:         # optional, falls back to ujson / the stdlib
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+FIELDS = frozenset(["uuid", "item_name", "tier", "starting_bid", "bin", "claimed", "start", "end",
+                    "item_bytes"])
+
+if orjson is not None:
+    BACKEND, loads = "orjson", orjson.loads
+elif ujson is not None:
+    BACKEND, loads = "ujson", ujson.loads
+else:
+    BACKEND, loads = "json", json.loads
+
+
+def slim_auction(auction: dict, fields=FIELDS) -> dict:
+    slim = {key: auction[key] for key in fields if key in auction}
+    slim["furniture"] = "Furniture" in auction.get("item_lore", "")
+    return slim
+
+
+def _slim_pairs(fields):
+    def hook(pairs):
+        slim = {}
+        lore = None
+        for key, value in pairs:
+            if key in fields:
+                slim[key] = value
+            elif key == "item_lore":
+                lore = value
+        if "uuid" not in slim:          # the page itself or a nested object
+            return dict(pairs)
+        slim["furniture"] = lore is not None and "Furniture" in lore
+        return slim
+    return hook
+
+
+_HOOKS = {FIELDS: _slim_pairs(FIELDS)}
+
+
+def decode_page(raw: bytes | str, fields=FIELDS) -> dict:
+    """
+    Decode an auctions page keeping only ``fields`` of each auction.  With a
+    fast backend the page is decoded in full and trimmed straight after; with
+    the stdlib the trimming happens inside the decoder.
+    """
+    if BACKEND != "json":
+        data = loads(raw)
+        data["auctions"] = [slim_auction(a, fields) for a in data.get("auctions", ())]
+        return data
+    hook = _HOOKS.get(fields)
+    if hook is None:
+        hook = _HOOKS[fields] = _slim_pairs(fields)
+    return json.loads(raw, object_pairs_hook=hook)
@@ -0,0 +1,119 @@
+import asyncio
+import importlib.util
+import random
+import time
+
+from decoder import loads
+
+try:
+    import httpx
+except ImportError:         # optional: scanner falls back to the threaded requests path
+    httpx = None
+
+HAS_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """
+    Exponential backoff with full jitter for the given (0-based) retry attempt.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class AsyncFetcher:
+    """
+    Pooled keep-alive HTTP client for auction pages.
+
+    At most ``concurrency`` requests are in flight at once, each failed page is
+    retried with backoff, and pages are handed back as soon as they arrive.
+    HTTP/2 is negotiated when the ``h2`` package is installed and the server
+    offers it.  With a ``governor`` (see governor.py) every request also
+    waits for it and reports back its status, so a 429 slows down everything
+    sharing that governor.
+
+        async with AsyncFetcher(AUCTIONS_URL, concurrency=20) as fetcher:
+            async for page, data in fetcher.pages(range(toppage)):
+                ...
+    """
+
+    def __init__(self, base_url: str, concurrency: int = 10, retries: int = 3,
+                 timeout: float = 10, http2: bool = True, decode=loads, governor=None):
+        if httpx is None:
+            raise RuntimeError("AsyncFetcher needs the 'httpx' package")
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self.http2 = http2 and HAS_HTTP2
+        self.decode = decode
+        self.governor = governor
+        self.client = None
+        self.errors = 0
+        self.retried = 0
+        self.latencies = []     # seconds per successful request, send to last byte
+
+    async def __aenter__(self):
+        limits = httpx.Limits(max_connections=self.concurrency,
+                              max_keepalive_connections=self.concurrency)
+        self.client = httpx.AsyncClient(http2=self.http2, limits=limits, timeout=self.timeout)
+        self._slots = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+        self.client = None
+
+    async def get_raw(self, url: str) -> bytes | None:
+        """
+        GET ``url`` and return the body, retrying with backoff.  Returns None
+        once every attempt has failed.
+        """
+        for attempt in range(self.retries):
+            try:
+                async with self._slots:
+                    if self.governor is not None:
+                        await self.governor.acquire_async()
+                    start = time.perf_counter()
+                    try:
+                        response = await self.client.get(url)
+                    except httpx.HTTPError:
+                        if self.governor is not None:
+                            self.governor.release()
+                        raise
+                    elapsed = time.perf_counter() - start
+                    if self.governor is not None:
+                        self.governor.release(response.status_code, response.headers)
+                response.raise_for_status()
+                self.latencies.append(elapsed)
+                return response.content
+            except httpx.HTTPError as e:
+                if attempt == self.retries - 1:
+                    self.errors += 1
+                    print(f"[ERROR] Failed after {self.retries} attempts: {url}: {e}")
+                    return None
+                self.retried += 1
+                await asyncio.sleep(backoff_delay(attempt))
+
+    async def get_json(self, url: str) -> dict:
+        raw = await self.get_raw(url)
+        try:
+            return self.decode(raw)
+        except (TypeError, ValueError):
+            return {"auctions": [], "success": False}
+
+    async def fetch_page(self, page: int, raw: bool = False) -> tuple[int, dict | bytes | None]:
+        url = f"{self.base_url}?page={page}"
+        return page, await (self.get_raw(url) if raw else self.get_json(url))
+
+    async def pages(self, pages, raw: bool = False):
+        """
+        Fetch every page in ``pages`` and yield ``(page, data)`` in arrival
+        order; with ``raw`` the undecoded body (or None) is yielded instead.
+        """
+        tasks = [asyncio.ensure_future(self.fetch_page(page, raw)) for page in pages]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
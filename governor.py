@@ -0,0 +1,130 @@
+"""
+One request governor shared by every call to the auctions API.
+
+A token bucket caps the request rate and an AIMD limit caps the requests in
+flight: the limit grows by about one per round trip while responses come
+back fine and halves on a 429, a 5xx or a failed connection.  Rate-limit
+headers tighten the bucket to what the server says is left in the current
+window (``RateLimit-Remaining`` over ``RateLimit-Reset`` seconds, with or
+without an ``X-`` prefix), and a 429 or an exhausted window blocks every
+caller until ``Retry-After`` or the reset has passed.
+
+Threads call acquire()/release() (or get() around a requests session) and
+coroutines ``await acquire_async()``; both share the same state.
+"""
+import asyncio
+import threading
+import time
+
+POLL = 0.01         # seconds between checks while every slot is taken
+
+
+def _header(headers, name):
+    for key in (name, "X-" + name):
+        value = headers.get(key)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+class Governor:
+    def __init__(self, rate: float = 0, burst: int = 20, concurrency: int = 10,
+                 max_concurrency: int = 20, enabled: bool = True):
+        self.enabled = enabled
+        self.rate = rate                    # requests/s, 0 = only what the server says
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.limit = float(concurrency)     # AIMD in-flight limit
+        self.in_flight = 0
+        self.tokens = float(burst)
+        self.server_rate = None             # from the rate-limit headers, if any
+        self.blocked_until = 0.0
+        self.throttled = 0                  # 429s seen
+        self._configured = (concurrency, max_concurrency)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def configure(self, rate: float, burst: int, concurrency: int, max_concurrency: int,
+                  enabled: bool = True) -> None:
+        """Apply new settings; the learned limit is kept unless the concurrency ones changed."""
+        with self._lock:
+            if (concurrency, max_concurrency) != self._configured:
+                self.limit = float(min(concurrency, max_concurrency))
+                self._configured = (concurrency, max_concurrency)
+            self.rate, self.burst, self.max_concurrency = rate, burst, max_concurrency
+            self.enabled = enabled
+
+    def _current_rate(self):
+        rates = [r for r in (self.rate, self.server_rate) if r]
+        return min(rates) if rates else None
+
+    def _reserve(self) -> float:
+        """Take a slot and a token and return 0, or return how long to wait."""
+        with self._lock:
+            now = time.monotonic()
+            rate = self._current_rate()
+            if rate:
+                self.tokens = min(self.burst, self.tokens + (now - self._updated) * rate)
+            self._updated = now
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.in_flight >= max(1, int(self.limit)):
+                return POLL
+            if rate and self.tokens < 1:
+                return (1 - self.tokens) / rate
+            if rate:
+                self.tokens -= 1
+            self.in_flight += 1
+            return 0
+
+    def acquire(self) -> None:
+        if not self.enabled:
+            return
+        while (wait := self._reserve()) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        if not self.enabled:
+            return
+        while (wait := self._reserve()) > 0:
+            await asyncio.sleep(wait)
+
+    def release(self, status: int | None = None, headers=None) -> None:
+        """
+        Give the slot back with the outcome: the HTTP status and headers,
+        or no status when the request failed to complete.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            now = time.monotonic()
+            if headers is not None:
+                remaining = _header(headers, "RateLimit-Remaining")
+                reset = _header(headers, "RateLimit-Reset")
+                if remaining is not None and reset is not None:
+                    self.tokens = min(self.tokens, remaining)
+                    self.server_rate = max(remaining, 1) / max(reset, 0.1)
+                    if remaining <= 0:
+                        self.blocked_until = max(self.blocked_until, now + reset)
+            if status == 429 or status is None or status >= 500:
+                self.limit = max(1.0, self.limit / 2)
+                if status == 429:
+                    self.throttled += 1
+                    retry_after = _header(headers or {}, "Retry-After")
+                    self.blocked_until = max(self.blocked_until, now + (retry_after or 1.0))
+            else:
+                self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+
+    def get(self, session, url: str, **kwargs):
+        """``session.get(url)`` once a slot is free, reporting the outcome."""
+        self.acquire()
+        response = None
+        try:
+            response = session.get(url, **kwargs)
+            return response
+        finally:
+            self.release(*((response.status_code, response.headers) if response is not None else ()))
@@ -1,15 +1,61 @@
-import os
-from datetime import datetime
+import atexit
+import queue
+import sqlite3
+import threading
+import time
 
-LOG_FILE = "snipes_log.txt"
+from store import get_store, now_stamp
 
-if not os.path.exists(LOG_FILE):
-    with open(LOG_FILE, "w") as f:
-        f.write("Item Name,Snipe Price,Suggested BIN,Second Lowest BIN,Timestamp,UUID\n")
+BATCH_SIZE = 256            # rows per write
+FLUSH_INTERVAL = 1.0        # seconds a row may wait before it is written
+
+_queue = queue.Queue()
+_writer = None
+_writer_lock = threading.Lock()
+
+def _writer_loop():
+    """
+    Drain the queue in batches: write once BATCH_SIZE rows are waiting or the
+    oldest has waited FLUSH_INTERVAL, whichever comes first.  A None marker
+    from flush() writes whatever is pending straight away.
+    """
+    while True:
+        batch = [_queue.get()]
+        deadline = time.monotonic() + FLUSH_INTERVAL
+        while len(batch) < BATCH_SIZE and batch[-1] is not None:
+            try:
+                batch.append(_queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        rows = [row for row in batch if row is not None]
+        try:
+            if rows:
+                get_store().add_snipes(rows)
+        except (OSError, sqlite3.Error) as e:
+            print(f"[ERROR] Could not log {len(rows)} snipes: {e}")
+        for _ in batch:
+            _queue.task_done()
+
+def _start_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_writer_loop, name="snipe-logger", daemon=True)
+            _writer.start()
+            atexit.register(flush)
+
+def flush():
+    """
+    Block until every queued snipe is on disk.  Runs at exit; screens that
+    read the log call it first.
+    """
+    if _writer is not None:
+        _queue.put(None)
+        _queue.join()
 
 def log_snipe(item_name, snipe_price, suggested_price, second_bin, uuid):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"{item_name},{snipe_price},{suggested_price},{second_bin},{timestamp},{uuid}\n"
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(line)
+    timestamp = now_stamp()
+    if _writer is None:
+        _start_writer()
+    _queue.put((item_name, snipe_price, suggested_price, second_bin, timestamp, uuid))
     print(f"[LOGGED] {item_name} → {suggested_price} at {timestamp}")
@@ -0,0 +1,182 @@
+"""
+Incremental reader for the CSV logs.
+
+A LogReader keeps the rows it has parsed and the byte offset they end at.
+Each read memory-maps the file and parses only what was appended since; if
+the file was replaced or shrank (compaction, a hand edit) it starts over.
+
+tail() walks back from the end of the file for the last rows, and since()
+starts at the byte offset a sidecar index (``<log>.idx``) gives for a
+timestamp, so neither has to parse the whole log when nothing is cached.
+The index holds one entry every INDEX_EVERY rows: the offset of a row and
+the latest timestamp of any row before it, so rows logged slightly out of
+order are still found.
+
+The caller holds the log's lock around every call (see store.py).
+"""
+import bisect
+import csv
+import io
+import mmap
+import os
+import struct
+
+INDEX_EVERY = 4096      # rows between index entries
+_HEADER = struct.Struct("<qqq19s")      # log inode, indexed up to (bytes), rows since the last entry, latest stamp
+_ENTRY = struct.Struct("<19sq")         # latest stamp before the row, the row's offset
+_NO_STAMP = b"\0" * 19
+
+
+def _rows(data: bytes) -> list[list[str]]:
+    return [values for values in csv.reader(io.StringIO(data.decode("utf-8", "replace"))) if values]
+
+
+class LogReader:
+    def __init__(self, path: str, convert, time_column: int):
+        """
+        ``convert(values, position)`` turns a CSV row into the dict handed
+        out; ``position`` is the row's number in the file, or None when the
+        row was read without the ones before it.
+        """
+        self.path = path
+        self.convert = convert
+        self.time_column = time_column
+        self.index_path = path + ".idx"
+        self._reset()
+        self._load_index()
+
+    def _reset(self) -> None:
+        self.cached = []
+        self.end = 0            # bytes parsed into ``cached``
+        self.identity = None
+
+    def _map(self):
+        """``(mmap, size)`` of the log, or ``(None, 0)`` when it is empty or missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._reset()
+            return None, 0
+        identity = (stat.st_dev, stat.st_ino)
+        if identity != self.identity or stat.st_size < self.end:
+            self._reset()
+            self.identity = identity
+        if not stat.st_size:
+            return None, 0
+        with open(self.path, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), stat.st_size
+
+    @staticmethod
+    def _body_start(mm) -> int:
+        """Offset of the first row after the header line."""
+        newline = mm.find(b"\n")
+        return len(mm) if newline < 0 else newline + 1
+
+    # ── whole file ────────────────────────────────────────────────────────────
+    def rows(self) -> list[dict]:
+        """Every row; only the bytes appended since the last call are parsed."""
+        mm, size = self._map()
+        if mm is None:
+            return []
+        with mm:
+            start = self.end or self._body_start(mm)
+            if start < size:
+                first = len(self.cached)
+                self.cached += [self.convert(values, first + i)
+                                for i, values in enumerate(_rows(mm[start:size]))]
+                self.end = size
+        return list(self.cached)
+
+    # ── the end of the file ───────────────────────────────────────────────────
+    def tail(self, n: int) -> list[dict]:
+        """The last ``n`` rows, reading backwards from the end of the file."""
+        if n <= 0:
+            return []
+        mm, size = self._map()
+        if mm is None:
+            return []
+        with mm:
+            if self.end == size:
+                return self.cached[-n:]
+            body = self._body_start(mm)
+            start, pos, found = size, size, 0
+            while found < n and pos > body:
+                newline = mm.rfind(b"\n", body, pos - 1)
+                line_start = max(newline + 1, body)
+                if mm[line_start:pos].strip():
+                    found += 1
+                    start = line_start
+                pos = line_start
+            return [self.convert(values, None) for values in _rows(mm[start:size])][-n:]
+
+    # ── a time window ─────────────────────────────────────────────────────────
+    def since(self, stamp: str) -> list[dict]:
+        """Rows with a timestamp after ``stamp``, read from the indexed offset on."""
+        mm, size = self._map()
+        if mm is None:
+            return []
+        column = self.time_column
+        with mm:
+            if self.end == size:
+                return [row for row in self.cached if row["Timestamp"] > stamp]
+            self._update_index(mm, size)
+            key = stamp.encode()[:19].ljust(19, b"\0")
+            # the last entry with nothing newer than ``stamp`` before it
+            at = bisect.bisect_right(self.stamps, key) - 1
+            start = self.offsets[at] if at >= 0 else self._body_start(mm)
+            rows = _rows(mm[start:size])
+        return [self.convert(values, None) for values in rows
+                if len(values) > column and values[column] > stamp]
+
+    def _clear_index(self) -> None:
+        self.inode, self.indexed, self.pending, self.latest = 0, 0, 0, _NO_STAMP
+        self.stamps, self.offsets = [], []
+
+    def _load_index(self) -> None:
+        self._clear_index()
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            self.inode, self.indexed, self.pending, self.latest = _HEADER.unpack_from(data)
+            for stamp, offset in _ENTRY.iter_unpack(data[_HEADER.size:]):
+                self.stamps.append(stamp)
+                self.offsets.append(offset)
+        except (OSError, struct.error):
+            self._clear_index()
+
+    def _update_index(self, mm, size: int) -> None:
+        """Extend the index over the rows appended since it was last written."""
+        self._load_index()      # another process may have got further
+        inode = self.identity[1]
+        if inode != self.inode or self.indexed > size or (
+                self.offsets and mm[self.offsets[-1] - 1:self.offsets[-1]] != b"\n"):
+            self._clear_index()
+            self.inode = inode
+        pos = self.indexed or self._body_start(mm)
+        if pos >= size:
+            return
+        lines = mm[pos:size].split(b"\n")
+        parsed = csv.reader(line.decode("utf-8", "replace") for line in lines)
+        column, latest, pending = self.time_column, self.latest, self.pending
+        for line, values in zip(lines, parsed):
+            if values:
+                if pending >= INDEX_EVERY:
+                    self.stamps.append(latest)
+                    self.offsets.append(pos)
+                    pending = 0
+                if len(values) > column:
+                    latest = max(latest, values[column].encode()[:19].ljust(19, b"\0"))
+                pending += 1
+            pos += len(line) + 1
+        self.indexed, self.latest, self.pending = size, latest, pending
+        self._save_index()
+
+    def _save_index(self) -> None:
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_HEADER.pack(self.inode, self.indexed, self.pending, self.latest))
+                f.write(b"".join(_ENTRY.pack(s, o) for s, o in zip(self.stamps, self.offsets)))
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            print(f"[ERROR] Could not write {self.index_path}: {e}")
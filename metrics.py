@@ -0,0 +1,276 @@
+"""
+Per-cycle scan metrics.
+
+start_sniper opens a cycle with begin(), times its stages with
+``stage(name)`` and reports page latencies and retry/error counts as they
+happen; end() appends the cycle as one JSON line to ``metrics.jsonl`` and
+folds it into running totals, which serve() exposes as Prometheus text.
+
+Every call is a no-op while no cycle is open, so the scanner can report
+unconditionally and the switches in config.json decide what is kept.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_FILE = "metrics.jsonl"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)     # seconds, upper bounds
+COUNTERS = ("pages", "auctions", "retries", "errors")
+
+current = None          # the open Cycle, if any
+_lock = threading.Lock()
+_hooks = {}             # (module, name) -> original, for the profiling wrappers
+_server = None
+
+# Running totals over every cycle since start, for the text endpoint
+totals = {
+    "cycles": 0,
+    "stages": {},
+    "counters": dict.fromkeys(COUNTERS, 0),
+    "latency_buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+    "latency_sum": 0.0,
+}
+last = {}               # summary of the last cycle
+
+
+def _bucket(seconds: float) -> int:
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            return i
+    return len(LATENCY_BUCKETS)
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Cycle:
+    def __init__(self, mode: str = "scan"):
+        self.mode = mode
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self.stages = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.latencies = []
+        self.samples = {}       # name -> values, e.g. time_to_detect_ms
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with _lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        with _lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self) -> dict:
+        """The cycle as a JSON-ready dict; stage times are in seconds."""
+        seconds = time.perf_counter() - self._start
+        ordered = sorted(self.latencies)
+        buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        for latency in ordered:
+            buckets[_bucket(latency)] += 1
+        latency = {"count": len(ordered)}
+        if ordered:
+            latency.update(p50=_percentile(ordered, 0.5), p90=_percentile(ordered, 0.9),
+                           p99=_percentile(ordered, 0.99), max=ordered[-1],
+                           buckets=dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], buckets)))
+        samples = {}
+        for name, values in self.samples.items():
+            values = sorted(values)
+            samples[name] = {"count": len(values), "p50": _percentile(values, 0.5),
+                             "p90": _percentile(values, 0.9), "max": values[-1]}
+        return {
+            "time": int(self.started * 1000),
+            "mode": self.mode,
+            "seconds": round(seconds, 6),
+            "stages": {name: round(value, 6) for name, value in self.stages.items()},
+            **self.counters,
+            "auctions_per_second": round(self.counters["auctions"] / seconds, 1) if seconds else 0,
+            "page_latency": latency,
+            **samples,
+        }
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  Reporting, from anywhere in the scanner
+# ────────────────────────────────────────────────────────────────────────────────
+def begin(mode: str = "scan") -> Cycle:
+    global current
+    current = Cycle(mode)
+    return current
+
+
+def end(path: str | None = METRICS_FILE) -> dict | None:
+    """
+    Close the open cycle, add it to the totals and append it to ``path``
+    (skipped when None).  Returns its summary.
+    """
+    global current, last
+    cycle, current = current, None
+    if cycle is None:
+        return None
+    summary = cycle.summary()
+    with _lock:
+        totals["cycles"] += 1
+        for name, seconds in cycle.stages.items():
+            totals["stages"][name] = totals["stages"].get(name, 0.0) + seconds
+        for name, value in cycle.counters.items():
+            totals["counters"][name] = totals["counters"].get(name, 0) + value
+        for latency in cycle.latencies:
+            totals["latency_buckets"][_bucket(latency)] += 1
+            totals["latency_sum"] += latency
+        last = summary
+    if path:
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(summary) + "\n")
+        except OSError as e:
+            print(f"[ERROR] Could not write metrics: {e}")
+    return summary
+
+
+def set_mode(mode: str) -> None:
+    if current is not None:
+        current.mode = mode
+
+
+def stage(name: str):
+    """Context manager adding its wall time to stage ``name``."""
+    if current is None:
+        return nullcontext()
+    return _timed_stage(current, name)
+
+
+@contextmanager
+def _timed_stage(cycle: Cycle, name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        cycle.add_time(name, time.perf_counter() - start)
+
+
+def add_time(name: str, seconds: float) -> None:
+    if current is not None:
+        current.add_time(name, seconds)
+
+
+def count(name: str, n: int = 1) -> None:
+    if current is not None and n:
+        current.count(name, n)
+
+
+def page(seconds: float) -> None:
+    """Record one page request's latency."""
+    if current is not None:
+        with _lock:
+            current.latencies.append(seconds)
+
+
+def pages(latencies) -> None:
+    if current is not None:
+        with _lock:
+            current.latencies.extend(latencies)
+
+
+def sample(name: str, value: float) -> None:
+    """Record one observation of ``name``; the cycle keeps its percentiles."""
+    if current is not None:
+        with _lock:
+            current.samples.setdefault(name, []).append(value)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  Profiling hooks
+# ────────────────────────────────────────────────────────────────────────────────
+def _timed_call(fn, name: str):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        cycle = current
+        if cycle is None:
+            return fn(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            cycle.add_time(name, time.perf_counter() - start)
+    return wrapper
+
+
+def profile(targets, enabled: bool) -> None:
+    """
+    Wrap ``module.attr`` for each ``(module, attr, stage)`` in ``targets`` so
+    the time spent in every call is added to ``stage``, or restore the
+    originals.  Calls made in worker processes aren't seen.
+    """
+    for module, attr, name in targets:
+        key = (module.__name__, attr)
+        if enabled and key not in _hooks:
+            _hooks[key] = getattr(module, attr)
+            setattr(module, attr, _timed_call(_hooks[key], name))
+        elif not enabled and key in _hooks:
+            setattr(module, attr, _hooks.pop(key))
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  Prometheus text endpoint
+# ────────────────────────────────────────────────────────────────────────────────
+def render() -> str:
+    """The totals and the last cycle in the Prometheus text format."""
+    with _lock:
+        lines = ["# TYPE sniper_cycles_total counter", f"sniper_cycles_total {totals['cycles']}",
+                 "# TYPE sniper_stage_seconds_total counter"]
+        lines += [f'sniper_stage_seconds_total{{stage="{name}"}} {seconds:.6f}'
+                  for name, seconds in sorted(totals["stages"].items())]
+        for name, value in totals["counters"].items():
+            lines += [f"# TYPE sniper_{name}_total counter", f"sniper_{name}_total {value}"]
+        lines.append("# TYPE sniper_page_latency_seconds histogram")
+        cumulative = 0
+        for bound, n in zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], totals["latency_buckets"]):
+            cumulative += n
+            lines.append(f'sniper_page_latency_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines += [f"sniper_page_latency_seconds_sum {totals['latency_sum']:.6f}",
+                  f"sniper_page_latency_seconds_count {cumulative}"]
+        if last:
+            lines += ["# TYPE sniper_last_cycle_seconds gauge", f"sniper_last_cycle_seconds {last['seconds']}",
+                      "# TYPE sniper_auctions_per_second gauge",
+                      f"sniper_auctions_per_second {last['auctions_per_second']}"]
+            for name, value in last.items():
+                if isinstance(value, dict) and "p50" in value and name != "page_latency":
+                    lines += [f"# TYPE sniper_{name}_p50 gauge", f"sniper_{name}_p50 {value['p50']}"]
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port: int, host: str = "127.0.0.1"):
+    """
+    Serve render() on ``http://host:port/metrics`` from a daemon thread.
+    Only the first call tries to start a server; returns it, or None if the
+    port couldn't be bound.
+    """
+    global _server
+    if _server is None:
+        try:
+            _server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError as e:
+            print(f"[ERROR] Metrics endpoint disabled: {e}")
+            _server = False
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server or None
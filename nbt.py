@@ -0,0 +1,218 @@
+"""
+Item identity from an auction's ``item_bytes``.
+
+The payload is base64 of a gzipped NBT compound whose list ``i`` holds the
+item stack; the SkyBlock attributes are in its ``tag.ExtraAttributes``.
+read_nbt() parses the binary format, item_attributes() picks out what
+decides an item's price bucket (item ID, stars, recombobulator, pet type
+and level) and item_key() turns those into the key the scanner prices by,
+so reforges, enchant names and pet levels in the display name no longer
+matter.
+
+Keys are cached by auction UUID, so each listing's blob is decoded once
+however many cycles it stays listed.
+"""
+import base64
+import json
+import re
+import struct
+import zlib
+
+CACHE_SIZE = 1 << 18            # UUIDs per cache generation
+PET_LEVEL_BUCKETS = (1, 50, 80, 90, 100, 150, 200)
+
+_PET_LEVEL = re.compile(r"\[Lvl (\d+)\]")
+_STRUCTS = {1: struct.Struct(">b"), 2: struct.Struct(">h"), 3: struct.Struct(">i"),
+            4: struct.Struct(">q"), 5: struct.Struct(">f"), 6: struct.Struct(">d")}
+_INT = _STRUCTS[3]
+_ARRAYS = {7: ">b", 11: ">i", 12: ">q"}
+_UNUSED = frozenset(["display", "ench", "HideFlags"])     # name, lore: by far the bulk of an item
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  NBT
+# ────────────────────────────────────────────────────────────────────────────────
+def _string(data, pos):
+    size = (data[pos] << 8) | data[pos + 1]
+    pos += 2
+    return data[pos:pos + size].decode("utf-8", "replace"), pos + size
+
+
+def _skip(data, pos, tag):
+    """Position after a payload, without building it."""
+    if tag == 8:
+        return pos + 2 + ((data[pos] << 8) | data[pos + 1])
+    if tag == 10:
+        while (child := data[pos]) != 0:
+            pos += 3 + ((data[pos + 1] << 8) | data[pos + 2])
+            pos = _skip(data, pos, child)
+        return pos + 1
+    if tag == 9:
+        child = data[pos]
+        size, = _INT.unpack_from(data, pos + 1)
+        pos += 5
+        if child in _STRUCTS:
+            return pos + size * _STRUCTS[child].size
+        for _ in range(size):
+            pos = _skip(data, pos, child)
+        return pos
+    if tag in _STRUCTS:
+        return pos + _STRUCTS[tag].size
+    if tag in _ARRAYS:
+        return pos + 4 + _INT.unpack_from(data, pos)[0] * struct.calcsize(_ARRAYS[tag])
+    raise ValueError(f"unknown NBT tag {tag}")
+
+
+def _payload(data, pos, tag, skip):
+    # strings and compounds make up most of an item, so they're checked first
+    if tag == 8:
+        size = (data[pos] << 8) | data[pos + 1]
+        pos += 2
+        return data[pos:pos + size].decode("utf-8", "replace"), pos + size
+    if tag == 10:
+        compound = {}
+        while True:
+            child = data[pos]
+            if child == 0:
+                return compound, pos + 1
+            size = (data[pos + 1] << 8) | data[pos + 2]
+            pos += 3
+            name = data[pos:pos + size].decode("utf-8", "replace")
+            if name in skip:
+                pos = _skip(data, pos + size, child)
+            else:
+                compound[name], pos = _payload(data, pos + size, child, skip)
+    if tag == 9:
+        child = data[pos]
+        size, = _INT.unpack_from(data, pos + 1)
+        pos += 5
+        items = []
+        for _ in range(size):
+            value, pos = _payload(data, pos, child, skip)
+            items.append(value)
+        return items, pos
+    fixed = _STRUCTS.get(tag)
+    if fixed is not None:
+        return fixed.unpack_from(data, pos)[0], pos + fixed.size
+    if tag in _ARRAYS:
+        size, = _INT.unpack_from(data, pos)
+        width = struct.calcsize(_ARRAYS[tag])
+        pos += 4
+        return list(struct.unpack_from(f">{size}{_ARRAYS[tag][1]}", data, pos)), pos + size * width
+    raise ValueError(f"unknown NBT tag {tag}")
+
+
+def read_nbt(data: bytes, skip=frozenset()) -> dict:
+    """
+    The root compound of an uncompressed NBT document, leaving out any
+    compound entries named in ``skip``.
+    """
+    if not data or data[0] != 10:
+        raise ValueError("NBT document doesn't start with a compound")
+    _, pos = _string(data, 1)
+    return _payload(data, pos, 10, skip)[0]
+
+
+def decode_item_bytes(item_bytes: str | bytes) -> dict:
+    """``ExtraAttributes`` of the first item in an auction's ``item_bytes``."""
+    root = read_nbt(zlib.decompress(base64.b64decode(item_bytes), 31), _UNUSED)   # 31: gzip framing
+    return root["i"][0]["tag"]["ExtraAttributes"]
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  Price keys
+# ────────────────────────────────────────────────────────────────────────────────
+def pet_level_bucket(level: int) -> int:
+    bucket = PET_LEVEL_BUCKETS[0]
+    for bound in PET_LEVEL_BUCKETS:
+        if level >= bound:
+            bucket = bound
+    return bucket
+
+
+def item_attributes(extra: dict, item_name: str = "") -> dict:
+    """
+    The attributes that split an item into its own price bucket.  Pets are
+    keyed by type and level bucket (the level is read from the display
+    name, the NBT only has raw XP), single-enchant books by the enchant.
+    """
+    item_id = extra.get("id", "")
+    attributes = {
+        "id": item_id,
+        "stars": int(extra.get("upgrade_level") or extra.get("dungeon_item_level") or 0),
+        "recomb": bool(extra.get("rarity_upgrades")),
+    }
+    if item_id == "PET" and "petInfo" in extra:
+        pet = json.loads(extra["petInfo"])
+        attributes["id"] = "PET_" + pet.get("type", "")
+        level = _PET_LEVEL.search(item_name)
+        attributes["pet_level"] = pet_level_bucket(int(level.group(1))) if level else None
+    elif item_id == "ENCHANTED_BOOK":
+        enchants = extra.get("enchantments") or {}
+        if len(enchants) == 1:
+            (name, level), = enchants.items()
+            attributes["id"] = f"ENCHANTMENT_{name.upper()}_{level}"
+    return attributes
+
+
+def item_key(item_bytes: str | bytes, tier: str, item_name: str = "") -> str:
+    """
+    Price key from the NBT, e.g. ``HYPERION LEGENDARY +5 recomb`` or
+    ``PET_ENDER_DRAGON LEGENDARY lvl100``.  Raises ValueError when the
+    payload can't be decoded or has no item ID.
+    """
+    try:
+        attributes = item_attributes(decode_item_bytes(item_bytes), item_name)
+    except (KeyError, IndexError, TypeError, struct.error, zlib.error) as e:
+        raise ValueError(f"undecodable item_bytes: {e}") from e
+    if not attributes["id"]:
+        raise ValueError("item_bytes without an item ID")
+    parts = [attributes["id"], tier]
+    if attributes["stars"]:
+        parts.append(f"+{attributes['stars']}")
+    if attributes["recomb"]:
+        parts.append("recomb")
+    if attributes.get("pet_level"):
+        parts.append(f"lvl{attributes['pet_level']}")
+    return " ".join(parts)
+
+
+# Two generations: once the current one is full it becomes the old one, and
+# keys still in use move back on their next lookup
+_cache = {}
+_old = {}
+_MISSING = object()
+stats = {"hits": 0, "misses": 0, "failures": 0}
+
+
+def cached_key(uuid: str, item_bytes: str | bytes, tier: str, item_name: str = "") -> str | None:
+    """
+    item_key() for an auction, decoded once per UUID; None when the payload
+    can't be decoded, so callers can fall back to the display name.
+    """
+    global _cache, _old
+    key = _cache.get(uuid, _MISSING)
+    if key is not _MISSING:
+        stats["hits"] += 1
+        return key
+    key = _old.pop(uuid, _MISSING)
+    if key is not _MISSING:
+        stats["hits"] += 1
+    else:
+        stats["misses"] += 1
+        try:
+            key = item_key(item_bytes, tier, item_name)
+        except ValueError:
+            stats["failures"] += 1
+            key = None
+    if len(_cache) >= CACHE_SIZE:
+        _old, _cache = _cache, {}
+    _cache[uuid] = key
+    return key
+
+
+def cache_clear() -> None:
+    _cache.clear()
+    _old.clear()
+    for name in stats:
+        stats[name] = 0
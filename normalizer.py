@@ -0,0 +1,76 @@
+import re
+from functools import lru_cache
+
+REFORGES = [
+    " ✦", "⚚ ", " ✪", "✪", "Stiff ", "Lucky ", "Jerry's ", "Dirty ", "Fabled ", "Suspicious ", "Gilded ",
+    "Warped ", "Withered ", "Bulky ", "Stellar ", "Heated ", "Ambered ", "Fruitful ", "Magnetic ",
+    "Fleet ", "Mithraic ", "Auspicious ", "Refined ", "Headstrong ", "Precise ", "Spiritual ", "Moil ",
+    "Blessed ", "Toil ", "Bountiful ", "Candied ", "Submerged ", "Reinforced ", "Cubic ", "Undead ",
+    "Ridiculous ", "Necrotic ", "Spiked ", "Jaded ", "Loving ", "Perfect ", "Renowned ", "Giant ",
+    "Empowered ", "Ancient ", "Sweet ", "Silky ", "Bloody ", "Shaded ", "Gentle ", "Odd ", "Fast ",
+    "Fair ", "Epic ", "Sharp ", "Heroic ", "Spicy ", "Legendary ", "Deadly ", "Fine ", "Grand ", "Hasty ",
+    "Neat ", "Rapid ", "Unreal ", "Awkward ", "Rich ", "Clean ", "Fierce ", "Heavy ", "Light ", "Mythic ",
+    "Pure ", "Smart ", "Titanic ", "Wise ", "Bizarre ", "Itchy ", "Ominous ", "Pleasant ", "Pretty ",
+    "Shiny ", "Simple ", "Strange ", "Vivid ", "Godly ", "Demonic ", "Forceful ", "Hurtful ", "Keen ",
+    "Strong ", "Superior ", "Unpleasant ", "Zealous "
+]
+
+CACHE_SIZE = 1 << 16
+
+_BRACKETS = re.compile(r"\[[^\]]*\]")
+
+
+# The star and fragment symbols overlap each other and the reforge words
+# (" ✪" also matches the space ending "Sharp "), so they keep their
+# sequential order.  The words never overlap one another and go in one pass.
+_SYMBOLS = [r for r in REFORGES if not r[0].isalpha()]
+_WORDS = [r for r in REFORGES if r[0].isalpha()]
+
+
+def _trie_pattern(words: list[str]) -> str:
+    """
+    Regex for a set of literals, factored on shared prefixes so the engine
+    branches once per character instead of trying every word in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            branches.append("")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+_REFORGES = re.compile(_trie_pattern(_WORDS))
+
+
+def _replace_each(text: str, reforges: list[str]) -> str:
+    for reforge in reforges:
+        text = text.replace(reforge, "")
+    return text
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def item_key(item_name: str, tier: str) -> str:
+    """
+    Canonical price key for an auction: the item name without pet levels,
+    stars and reforges, followed by its tier.
+
+    Gives the same key as replacing every entry of REFORGES in turn.  When
+    stripping a word joins the text around it into another word (which the
+    single pass can't see), the words are replaced one by one instead.
+    """
+    text = _replace_each(_BRACKETS.sub("", item_name) + tier, _SYMBOLS)
+    key = _REFORGES.sub("", text)
+    if _REFORGES.search(key):
+        return _replace_each(text, _WORDS)
+    return key
@@ -0,0 +1,113 @@
+"""
+Portfolio lots: every listed auction joined to the snipe it was bought from
+and the sale that closed it.
+
+A listing links to its snipe by UUID when it was logged from a suggested
+flip, otherwise to the latest earlier snipe of the same item that no other
+listing has claimed.  A sale links to its auction by id when it was marked
+sold from the menu, otherwise to the earliest sold listing of the item
+still without a sale.  Each snipe and sale is used at most once, so an item
+flipped many times gives one row per flip instead of every combination.
+
+All three inputs come from the store in time order, so the join is a single
+merge pass over them.
+"""
+from collections import deque
+
+PAGE_SIZE = 15
+
+
+def _by_time(rows):
+    return sorted(rows, key=lambda row: row["Timestamp"] or "")
+
+
+def build_lots(auctions: list[dict], snipes: list[dict], sales: list[dict]) -> list[dict]:
+    """
+    One dict per auction, oldest first, with the auction's columns plus
+    ``snipe`` and ``sale`` (the linked rows, or None).
+    """
+    auctions, snipes, sales = _by_time(auctions), _by_time(snipes), _by_time(sales)
+
+    by_uuid = {}
+    for pos, snipe in enumerate(snipes):
+        if snipe["UUID"]:
+            by_uuid[snipe["UUID"]] = pos
+    claimed = set()
+    open_snipes = {}        # item name -> unclaimed snipe positions, oldest first
+    next_snipe = 0
+
+    lots = []
+    by_id = {}
+    for auction in auctions:
+        while next_snipe < len(snipes) and snipes[next_snipe]["Timestamp"] <= auction["Timestamp"]:
+            open_snipes.setdefault(snipes[next_snipe]["Item Name"], []).append(next_snipe)
+            next_snipe += 1
+
+        pos = by_uuid.get(auction.get("UUID"))
+        if pos is None or pos in claimed:
+            pos = None
+            stack = open_snipes.get(auction["Item Name"], [])
+            while stack and stack[-1] in claimed:
+                stack.pop()
+            if stack:
+                pos = stack.pop()
+        if pos is not None:
+            claimed.add(pos)
+
+        lot = dict(auction, snipe=snipes[pos] if pos is not None else None, sale=None)
+        lots.append(lot)
+        by_id[auction["id"]] = lot
+
+    unlinked = []
+    for sale in sales:
+        lot = by_id.get(sale.get("Auction ID"))
+        if lot is not None and lot["sale"] is None:
+            lot["sale"] = sale
+        else:
+            unlinked.append(sale)
+
+    # The rest go to the oldest sold listing of the item, listed no later
+    # than the sale, that has no sale yet.
+    awaiting_sale = {}      # item name -> sold lots, oldest first
+    next_lot = 0
+    for sale in unlinked:
+        while next_lot < len(lots) and lots[next_lot]["Timestamp"] <= sale["Timestamp"]:
+            lot = lots[next_lot]
+            if lot["Sold"] == "Yes" and lot["sale"] is None:
+                awaiting_sale.setdefault(lot["Item Name"], deque()).append(lot)
+            next_lot += 1
+        queue = awaiting_sale.get(sale["Item Name"])
+        if queue:
+            queue.popleft()["sale"] = sale
+    return lots
+
+
+def lot_summary(lot: dict) -> dict:
+    """
+    Buy price, expected and actual profit for a lot, each None when the
+    prices it needs are missing.  The buy price is the one recorded with
+    the sale, else the snipe price, else the listed price.
+    """
+    snipe, sale = lot["snipe"], lot["sale"]
+    buy = lot["Listed Price"]
+    if snipe and snipe["Snipe Price"] is not None:
+        buy = snipe["Snipe Price"]
+    if sale and sale["Buy Price"] is not None:
+        buy = sale["Buy Price"]
+    expected = None         # blank or malformed cells read as None and leave it unknown
+    if snipe and snipe["Suggested BIN"] is not None and snipe["Snipe Price"] is not None:
+        expected = snipe["Suggested BIN"] - snipe["Snipe Price"]
+    actual = None
+    if sale and sale["Sell Price"] is not None and buy is not None:
+        actual = sale["Sell Price"] - buy
+    return {"buy": buy, "expected": expected, "actual": actual}
+
+
+def pages(lots: list[dict], page_size: int = PAGE_SIZE) -> int:
+    return max(1, -(-len(lots) // page_size))
+
+
+def page(lots: list[dict], number: int, page_size: int = PAGE_SIZE) -> list[dict]:
+    """Page ``number`` (0-based) of the lots, newest first."""
+    end = len(lots) - number * page_size
+    return lots[max(end - page_size, 0):max(end, 0)][::-1]
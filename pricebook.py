@@ -0,0 +1,107 @@
+"""
+Per-item price book: every live listing of one item, with its cheapest few
+kept sorted by price.
+
+Listings are added and removed by UUID as auctions appear and end, so when
+the lowest one sells the next price is already known without a rescan.
+Only the cheapest ``2 * depth`` listings are kept in a sorted list; the
+rest wait in a heap, so an update costs O(depth + log n) however many
+listings the item has.  Removing one of the rest only forgets its price
+and leaves its heap entry to be skipped when it comes up; when removals
+leave fewer than ``depth`` in the list it is topped up from the heap.
+"""
+import heapq
+import statistics
+from bisect import bisect_left, insort
+
+INF = float("inf")
+
+
+class PriceBook:
+    def __init__(self, depth: int = 8):
+        self.depth = depth          # cheapest entries always known in order
+        self._entries = []          # (price, uuid), ascending: the cheapest 2 * depth at most
+        self._rest = []             # heap of the other (price, uuid), with stale ones
+        self._prices = {}           # uuid -> price, every listing
+
+    def __len__(self):
+        return len(self._prices)
+
+    def __contains__(self, uuid):
+        return uuid in self._prices
+
+    def add(self, uuid: str, price: int) -> None:
+        if uuid in self._prices:
+            self.remove(uuid)
+        # everything in the heap is above the last entry in the list
+        complete = len(self._entries) == len(self._prices)
+        self._prices[uuid] = price
+        if complete or (price, uuid) < self._entries[-1]:
+            insort(self._entries, (price, uuid))
+            if len(self._entries) > 2 * self.depth:
+                heapq.heappush(self._rest, self._entries.pop())
+        else:
+            heapq.heappush(self._rest, (price, uuid))
+
+    def remove(self, uuid: str) -> bool:
+        price = self._prices.pop(uuid, None)
+        if price is None:
+            return False
+        if self._entries and (price, uuid) <= self._entries[-1]:
+            del self._entries[bisect_left(self._entries, (price, uuid))]
+            if len(self._entries) < self.depth:
+                self._refill()
+        elif len(self._rest) > 2 * len(self._prices) + 64:
+            self._compact()
+        return True
+
+    def _refill(self) -> None:
+        """Move the cheapest of the rest into the list, up to ``2 * depth``."""
+        while self._rest and len(self._entries) < 2 * self.depth:
+            price, uuid = heapq.heappop(self._rest)
+            # skip removed listings, and copies left by a re-add
+            if self._prices.get(uuid) == price and (not self._entries or (price, uuid) > self._entries[-1]):
+                self._entries.append((price, uuid))
+
+    def _compact(self) -> None:
+        """Drop the heap entries of removed listings."""
+        listed = set(self._entries)
+        self._rest = list({(price, uuid) for price, uuid in self._rest
+                           if self._prices.get(uuid) == price and (price, uuid) not in listed})
+        heapq.heapify(self._rest)
+
+    def cheapest(self, n: int) -> list:
+        """The ``n`` cheapest ``(price, uuid)`` entries, ascending."""
+        if n > len(self._entries):
+            self.depth = max(self.depth, n)
+            self._refill()
+        return self._entries[:n]
+
+    def bottom(self, n: int) -> list:
+        """The ``n`` cheapest prices, ascending."""
+        return [price for price, _ in self.cheapest(n)]
+
+    @property
+    def lowest(self):
+        return self._entries[0][0] if self._entries else INF
+
+    @property
+    def second(self):
+        return self._entries[1][0] if len(self._entries) > 1 else INF
+
+
+def depth_metrics(prices: list, depth: int) -> dict:
+    """
+    Depth-aware metrics from an item's cheapest prices (ascending), seen from
+    the lowest listing: the median of the ``depth`` listings above it, and the
+    gap between the second and third lowest (large when the second-lowest is
+    itself an outlier).
+    """
+    above = prices[1:depth + 1]
+    return {
+        "lowest": prices[0] if prices else INF,
+        "second": prices[1] if len(prices) > 1 else INF,
+        "third": prices[2] if len(prices) > 2 else INF,
+        "median": statistics.median(above) if above else INF,
+        "gap_to_third": prices[2] - prices[1] if len(prices) > 2 else INF,
+    }
@@ -0,0 +1,193 @@
+"""
+Append-only price history per canonical item.
+
+Every scan cycle appends one fixed-width record (time, item id, listing
+count, lowest and second-lowest BIN) per item whose prices moved, plus every
+item once per ``keyframe`` seconds and on the first cycle of a process.
+Records go to ``price_history.bin`` in time order and are read back through
+a memory map, so a time range is two binary searches and no parsing.  Item
+ids are interned once and kept in ``price_history_items.txt``, one key per
+line in id order; a process takes the file's lock and reads what others
+added before interning new keys, so every process agrees on the ids.
+
+Records are only appended in time order: a cycle older than the last
+record, from another process or a stepped clock, is refused.
+
+As a record is only written when a price moves, each one stands for the
+time until the item's next record, and the rolling median weighs it by
+that time rather than counting records.
+"""
+import os
+
+import numpy as np
+
+from snapshot import ItemIds
+from store import file_lock
+
+HISTORY_FILE = "price_history.bin"
+ITEMS_FILE = "price_history_items.txt"
+
+MAGIC = b"SNPH"
+VERSION = 1
+HEADER_SIZE = 16
+RECORD = np.dtype([("time", "<i8"), ("item", "<u4"), ("count", "<u4"),
+                   ("lowest", "<i8"), ("second", "<i8")])
+MISSING = -1        # stored for a lowest/second that doesn't exist
+
+
+def _price(value) -> int:
+    return int(value) if value != float("inf") else MISSING
+
+
+class PriceHistory:
+    def __init__(self, path: str = HISTORY_FILE, items_path: str = ITEMS_FILE, keyframe: int = 3600):
+        self.path = path
+        self.items_path = items_path
+        self.keyframe = keyframe
+        self.ids = ItemIds()
+        self._saved_ids = 0
+        self._last = {}         # item id -> (time, lowest, second) written by this process
+        self._map = None
+        self._mapped_size = 0
+        if os.path.exists(items_path):
+            with file_lock(items_path, shared=True):
+                self._read_ids()
+        self._check_header()
+
+    def _check_header(self) -> None:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "wb") as f:
+                f.write(MAGIC + np.array([VERSION, RECORD.itemsize, 0], "<u4").tobytes())
+            return
+        with open(self.path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        version, size, _ = np.frombuffer(header[4:], "<u4")
+        if header[:4] != MAGIC or version != VERSION or size != RECORD.itemsize:
+            raise ValueError(f"{self.path} is not a version {VERSION} price history file")
+
+    def _read_ids(self) -> None:
+        """Intern the keys added to the items file since it was last read."""
+        if os.path.exists(self.items_path):
+            with open(self.items_path, encoding="utf-8") as f:
+                names = f.read().split("\n")[:-1]
+            for name in names[self._saved_ids:]:
+                self.ids.intern(name)
+            self._saved_ids = len(self.ids)
+
+    def _intern(self, names) -> None:
+        """Give ``names`` ids, appending the new ones to the items file under its lock."""
+        new = [name for name in names if name not in self.ids.ids]
+        if not new:
+            return
+        with file_lock(self.items_path):
+            self._read_ids()        # ids another process took meanwhile come first
+            for name in new:
+                self.ids.intern(name)
+            with open(self.items_path, "a", encoding="utf-8") as f:
+                f.writelines(name + "\n" for name in self.ids.names[self._saved_ids:])
+            self._saved_ids = len(self.ids)
+
+    def append(self, timestamp: int, prices: dict, counts: dict) -> int:
+        """
+        Record a cycle: ``prices`` maps item key -> [lowest, second] and
+        ``counts`` item key -> live listings.  Only items that moved or are
+        due a keyframe are written; returns the number of records.  A cycle
+        older than the last record in the file is refused and nothing is
+        written, so the records stay in time order for range().
+        """
+        self._intern(prices)
+        rows, written = [], {}
+        for name, (lowest, second) in prices.items():
+            item = self.ids.ids[name]
+            lowest, second = _price(lowest), _price(second)
+            last = self._last.get(item)
+            if last and last[1:] == (lowest, second) and timestamp - last[0] < self.keyframe * 1000:
+                continue
+            written[item] = (timestamp, lowest, second)
+            rows.append((timestamp, item, counts.get(name, 0), lowest, second))
+        if not rows:
+            return 0
+        with file_lock(self.path), open(self.path, "r+b") as f:
+            end = f.seek(0, os.SEEK_END)
+            whole = end - (end - HEADER_SIZE) % RECORD.itemsize
+            if whole != end:            # drop a record cut short by a crash
+                f.truncate(whole)
+            if whole > HEADER_SIZE:
+                f.seek(whole - RECORD.itemsize)
+                latest = int(np.frombuffer(f.read(8), "<i8")[0])       # time is the first field
+                if timestamp < latest:
+                    print(f"[ERROR] Not recording prices at {timestamp}: {self.path} "
+                          f"already has records up to {latest}.")
+                    return 0
+            f.seek(whole)
+            f.write(np.array(rows, dtype=RECORD).tobytes())
+        self._last.update(written)
+        return len(rows)
+
+    def records(self) -> np.ndarray:
+        """Every record, as a read-only memory-mapped structured array."""
+        size = os.path.getsize(self.path) - HEADER_SIZE
+        size -= size % RECORD.itemsize
+        if size <= 0:
+            return np.empty(0, dtype=RECORD)
+        if size != self._mapped_size:
+            self._map = np.memmap(self.path, dtype=RECORD, mode="r", offset=HEADER_SIZE,
+                                  shape=(size // RECORD.itemsize,))
+            self._mapped_size = size
+        return self._map
+
+    def range(self, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """Records with ``start <= time < end`` (ms), by binary search."""
+        records = self.records()
+        times = records["time"]
+        lo = 0 if start is None else int(np.searchsorted(times, start, "left"))
+        hi = len(records) if end is None else int(np.searchsorted(times, end, "left"))
+        return records[lo:hi]
+
+    def series(self, name: str, start: int | None = None, end: int | None = None) -> np.ndarray:
+        """One item's records in a time range."""
+        item = self.ids.ids.get(name)
+        if item is None:
+            return np.empty(0, dtype=RECORD)
+        records = self.range(start, end)
+        return records[records["item"] == item]
+
+    def rolling_median(self, names, start: int, min_samples: int = 5, end: int | None = None) -> dict:
+        """
+        Time-weighted median lowest BIN of each item between ``start`` and
+        ``end`` (ms, default the latest record), for the items with at least
+        ``min_samples`` records since ``start``.  Each record counts for as
+        long as its price held; the last one before ``start`` (looked for
+        up to a keyframe back) covers the beginning of the window.
+        """
+        wanted = {self.ids.ids[name]: name for name in set(names) if name in self.ids.ids}
+        if not wanted:
+            return {}
+        records = self.range(start - self.keyframe * 1000, end)
+        if end is None:
+            end = int(records["time"][-1]) + 1 if len(records) else start
+        records = records[np.isin(records["item"], list(wanted))]
+        order = np.lexsort((records["time"], records["item"]))
+        items, times, lowest = records["item"][order], records["time"][order], records["lowest"][order]
+        bounds = np.flatnonzero(np.diff(items)) + 1
+        medians = {}
+        for group, group_times, group_lowest in zip(np.split(items, bounds), np.split(times, bounds),
+                                                    np.split(lowest, bounds)):
+            listed = group_lowest != MISSING
+            if np.count_nonzero(listed & (group_times >= start)) < min_samples:
+                continue
+            # each price holds until the item's next record, clipped to the window
+            held = np.minimum(np.append(group_times[1:], end), end) - np.maximum(group_times, start)
+            keep = listed & (held > 0)
+            values, weights = group_lowest[keep], held[keep]
+            if not len(values):
+                continue
+            by_price = np.argsort(values, kind="stable")
+            values, cumulative = values[by_price], np.cumsum(weights[by_price])
+            medians[wanted[int(group[0])]] = float(values[np.searchsorted(cumulative, cumulative[-1] / 2)])
+        return medians
+
+    def matching(self, text: str) -> list[str]:
+        """Item keys containing ``text``, case-insensitive."""
+        text = text.lower()
+        return [name for name in self.ids.names if text in name.lower()]
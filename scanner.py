@@ -1,155 +1,832 @@
 import asyncio
-import re
+import atexit
+import itertools
+import os
 import requests
 import json
+import sys
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from timeit import default_timer
 from utils import format_price
 from colorama import Fore, Style, init
 from logger import log_snipe
+import aggregate
+import metrics
+import warmcache
+from sinks import fan_out, from_config as outbound_sinks
+from aggregate import is_tracked, item_index, parse_page, parse_page_bytes, reduce_tables
+from fetcher import AsyncFetcher, backoff_delay, httpx
+from decoder import decode_page
+from snapshot import ItemIds, Snapshot, profit_filter
+from pricebook import PriceBook, depth_metrics
+from cadence import UpdateCadence
+from pricehistory import PriceHistory
+from scheduler import PageScheduler
+from governor import Governor
 
 init(autoreset=True)
 
-# Load config
-with open("config.json") as f:
-    config = json.load(f)
-MIN_PROFIT_PERCENT = config.get("min_profit_percent", 20.0) / 100
 LOWEST_PRICE = 5
-MAX_PRICE = config.get("budget", 1000000)
-
-REFORGES = [
-    " ✦", "⚚ ", " ✪", "✪", "Stiff ", "Lucky ", "Jerry's ", "Dirty ", "Fabled ", "Suspicious ", "Gilded ",
-    "Warped ", "Withered ", "Bulky ", "Stellar ", "Heated ", "Ambered ", "Fruitful ", "Magnetic ",
-    "Fleet ", "Mithraic ", "Auspicious ", "Refined ", "Headstrong ", "Precise ", "Spiritual ", "Moil ",
-    "Blessed ", "Toil ", "Bountiful ", "Candied ", "Submerged ", "Reinforced ", "Cubic ", "Undead ",
-    "Ridiculous ", "Necrotic ", "Spiked ", "Jaded ", "Loving ", "Perfect ", "Renowned ", "Giant ",
-    "Empowered ", "Ancient ", "Sweet ", "Silky ", "Bloody ", "Shaded ", "Gentle ", "Odd ", "Fast ",
-    "Fair ", "Epic ", "Sharp ", "Heroic ", "Spicy ", "Legendary ", "Deadly ", "Fine ", "Grand ", "Hasty ",
-    "Neat ", "Rapid ", "Unreal ", "Awkward ", "Rich ", "Clean ", "Fierce ", "Heavy ", "Light ", "Mythic ",
-    "Pure ", "Smart ", "Titanic ", "Wise ", "Bizarre ", "Itchy ", "Ominous ", "Pleasant ", "Pretty ",
-    "Shiny ", "Simple ", "Strange ", "Vivid ", "Godly ", "Demonic ", "Forceful ", "Hurtful ", "Keen ",
-    "Strong ", "Superior ", "Unpleasant ", "Zealous "
-]
+config = {}         # see load_config()
 
 results = []
-prices = []
+prices = {}
 now = 0
 toppage = 0
+snapshot = None     # columnar listings of the last full scan
+item_ids = ItemIds()
+
+# Incremental state, kept between cycles
+listings = {}       # uuid -> [index, starting_bid, end]
+books = {}          # index -> PriceBook
+last_scan = 0       # lastUpdated of the last snapshot we processed
+cycles_since_full = 0
+
+# Change detection for page 0 between cycles
+poll_session = requests.Session()
+validators = {}     # ETag / Last-Modified of the last page-0 response
+POLL_FAILED = object()      # poll_first_page couldn't get a usable page 0
+cadence = UpdateCadence()
+scheduler = PageScheduler()     # which pages an incremental scan fetches, and when
+governor = Governor()           # rate and concurrency limit shared by every API request
+
+# Per-item price history across cycles (see pricehistory.py), opened on first use
+history = None
+
+# UUIDs of the snipes already passed to an ``emit``, so a resync doesn't resend them
+emitted = set()
+
+# Warm-start cache (see warmcache.py): tried once per process, saved every so often
+warm_checked = False
+warm_saved = 0.0
+
+# Pages and seconds of the last full fetch+parse, per parse mode
+parse_stats = {}
+_parse_pool = None
+
+# Functions timed call by call when "profile_stages" is on, as (module, name, stage)
+PROFILE_TARGETS = [
+    (sys.modules[__name__], "decode_page", "decode"),
+    (sys.modules[__name__], "parse_page", "parse"),
+    (sys.modules[__name__], "item_index", "normalise"),
+    (aggregate, "item_index", "normalise"),
+]
+
+def scan_profiles(config):
+    """
+    The scan profiles in ``config``: one dict per entry of "profiles" with
+    its name, budget, min_profit (a fraction), whether its snipes go to the
+    snipe log and the outbound sinks of its own.  Budget and threshold
+    default to the top-level ones, which make up the single "default"
+    profile when there are no others.
+    """
+    profiles = []
+    for name, settings in (config.get("profiles") or {"default": {}}).items():
+        profiles.append({
+            "name": name,
+            "budget": settings.get("budget", config.get("budget", 1000000)),
+            "min_profit": settings.get("min_profit_percent", config.get("min_profit_percent", 20.0)) / 100,
+            "log": settings.get("log", True),
+            "sinks": outbound_sinks(settings, registered=False),
+        })
+    return profiles
+
+def load_config():
+    """
+    (Re)read config.json into the module settings.  Runs at the start of
+    every cycle instead of at import, so importing the scanner touches
+    neither the disk nor the network and Scanner Config edits apply to the
+    next scan.
+    """
+    global config, PROFILES, MIN_PROFIT_PERCENT, MAX_PRICE, POLL_INTERVAL, FULL_RESCAN_EVERY
+    global INCREMENTAL_MAX_PAGES, STALE_PAGES, STALE_CONCURRENCY
+    global CONCURRENCY, FETCH_BACKEND, HTTP2, REDUCE_WORKERS, PARSE_PROCESSES
+    global GOVERNOR, RATE_LIMIT, RATE_BURST, MAX_CONCURRENCY
+    global BOOK_DEPTH, REFERENCE_PRICE, API_URL, AUCTIONS_URL, ENDED_URL
+    global PRICE_HISTORY, HISTORY_WINDOW, HISTORY_MIN_SAMPLES, HISTORY_KEYFRAME
+    global METRICS, METRICS_FILE, METRICS_PORT, PROFILE_STAGES
+    global WARM_CACHE, WARM_CACHE_FILE, WARM_CACHE_INTERVAL, WARM_CACHE_MAX_AGE
+    with open("config.json") as f:
+        config = json.load(f)
+    # One scan serves every profile: candidates are taken up to the largest
+    # budget and the lowest threshold, then matched to each profile
+    PROFILES = scan_profiles(config)
+    MIN_PROFIT_PERCENT = min(profile["min_profit"] for profile in PROFILES)
+    MAX_PRICE = max(profile["budget"] for profile in PROFILES)
+    POLL_INTERVAL = config.get("poll_interval", 60)   # until the refresh cadence is learned
+    FULL_RESCAN_EVERY = config.get("full_rescan_every", 20)
+    INCREMENTAL_MAX_PAGES = config.get("incremental_max_pages", 5)    # hot pages per cycle
+    STALE_PAGES = config.get("stale_pages_per_cycle", 2)    # other pages refreshed per cycle
+    STALE_CONCURRENCY = config.get("stale_concurrency", 2)
+    CONCURRENCY = config.get("concurrency", 10)
+    GOVERNOR = config.get("governor", True)
+    RATE_LIMIT = config.get("rate_limit", 0)          # requests/s, 0 = whatever the API allows
+    RATE_BURST = config.get("rate_burst", 20)
+    MAX_CONCURRENCY = max(CONCURRENCY, config.get("max_concurrency", 20))
+    FETCH_BACKEND = config.get("fetch_backend", "threads")   # or "httpx", the pooled async client
+    HTTP2 = config.get("http2", True)                   # httpx only
+    REDUCE_WORKERS = config.get("reduce_workers", 0)
+    PARSE_PROCESSES = config.get("parse_processes", 0)     # 0 = threads, N or "auto" = process pool
+    BOOK_DEPTH = config.get("book_depth", 5)
+    REFERENCE_PRICE = config.get("reference_price", "second")  # or "median" of the next BOOK_DEPTH, or "history"
+    PRICE_HISTORY = config.get("price_history", True)
+    HISTORY_WINDOW = config.get("history_window", 6 * 3600)     # seconds of history in the rolling median
+    HISTORY_MIN_SAMPLES = config.get("history_min_samples", 5)
+    HISTORY_KEYFRAME = config.get("history_keyframe", 3600)
+    METRICS = config.get("metrics", True)
+    METRICS_FILE = config.get("metrics_file", metrics.METRICS_FILE)   # "" = don't write
+    METRICS_PORT = config.get("metrics_port", 0)        # Prometheus text on localhost, 0 = off
+    PROFILE_STAGES = config.get("profile_stages", False)   # time decode/parse/normalise per call
+    WARM_CACHE = config.get("warm_cache", True)
+    WARM_CACHE_FILE = config.get("warm_cache_file", warmcache.CACHE_FILE)
+    WARM_CACHE_INTERVAL = config.get("warm_cache_interval", 60)     # seconds between saves
+    WARM_CACHE_MAX_AGE = config.get("warm_cache_max_age", 600)      # older caches are ignored
+
+    API_URL = config.get("api_url", "https://api.hypixel.net/skyblock")
+    AUCTIONS_URL = API_URL + "/auctions"
+    ENDED_URL = API_URL + "/auctions_ended"
+    cadence.default = POLL_INTERVAL
+    scheduler.max_hot = INCREMENTAL_MAX_PAGES
+    scheduler.stale_pages = STALE_PAGES
+    governor.configure(RATE_LIMIT, RATE_BURST, CONCURRENCY, MAX_CONCURRENCY, GOVERNOR)
+    metrics.profile(PROFILE_TARGETS, METRICS and PROFILE_STAGES)
+    if METRICS and METRICS_PORT:
+        metrics.serve(METRICS_PORT)
 
 def safe_request(url, retries=3):
     for i in range(retries):
         try:
-            return requests.get(url, timeout=10).json()
+            response = governor.get(poll_session, url, timeout=10)
+            response.raise_for_status()
+            return response.json()
         except requests.exceptions.RequestException as e:
             if i == retries - 1:
                 print(f"[ERROR] Failed after {retries} attempts: {e}")
+                metrics.count("errors")
                 return {"lastUpdated": 0, "totalPages": 0}
-            time.sleep(1)
+            metrics.count("retries")
+            time.sleep(backoff_delay(i))
 
-c = safe_request("https://api.hypixel.net/skyblock/auctions?page=0")
-now = c['lastUpdated']
-toppage = c['totalPages']
+def poll_first_page(retries=3, changed_only=True):
+    """
+    Fetch page 0 as a cheap change check, conditionally when the server sent
+    an ETag or Last-Modified.  Returns the decoded page, None if the
+    snapshot hasn't moved past the last one processed, or POLL_FAILED when
+    the API couldn't be reached or answered without success.
 
-def fetch(session, page):
-    global toppage
-    base_url = "https://api.hypixel.net/skyblock/auctions?page="
+    With ``changed_only`` off the page is always fetched and returned, for
+    a scan that should run even on the snapshot it has already seen.
+    """
+    headers = {}
+    if changed_only and "etag" in validators:
+        headers["If-None-Match"] = validators["etag"]
+    if changed_only and "last_modified" in validators:
+        headers["If-Modified-Since"] = validators["last_modified"]
+    for i in range(retries):
+        try:
+            start = default_timer()
+            response = governor.get(poll_session, AUCTIONS_URL + "?page=0", headers=headers, timeout=10)
+            metrics.page(default_timer() - start)
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            data = decode_page(response.content)
+            break
+        except (requests.exceptions.RequestException, ValueError) as e:
+            if i == retries - 1:
+                print(f"[ERROR] Failed after {retries} attempts: {e}")
+                metrics.count("errors")
+                return POLL_FAILED
+            metrics.count("retries")
+            time.sleep(backoff_delay(i))
+
+    if response.headers.get("ETag"):
+        validators["etag"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        validators["last_modified"] = response.headers["Last-Modified"]
+    if not data.get('success'):
+        print(f"[ERROR] The auction API answered without success: {data.get('cause', 'no cause given')}")
+        metrics.count("errors")
+        return POLL_FAILED
+    cadence.observe(data.get('lastUpdated', 0))
+    if changed_only and data['lastUpdated'] <= last_scan:
+        return None
+    return data
+
+def add_listing(uuid, index, price, end):
+    listings[uuid] = [index, price, end]
+    book = books.get(index)
+    if book is None:
+        book = books[index] = PriceBook()
+    book.add(uuid, price)
+
+def load_listings():
+    """
+    Build the per-listing incremental state from the last full snapshot.
+    """
+    listings.clear()
+    books.clear()
+    names = snapshot.ids.names
+    order, _ = snapshot.sorted_rows()       # price order, so each book insert appends
+    for uuid, item, price, end in zip(snapshot.uuid[order].tolist(), snapshot.item[order].tolist(),
+                                      snapshot.price[order].tolist(), snapshot.end[order].tolist()):
+        add_listing(uuid.decode(), names[item], price, end)
+
+def remove_listing(uuid):
+    entry = listings.pop(uuid, None)
+    if entry is None:
+        return None
+    index = entry[0]
+    book = books.get(index)
+    if book is not None:
+        book.remove(uuid)
+        if not book:
+            del books[index]
+    return index
+
+def save_warm_cache():
+    """
+    Write the live listings and the scan position to the warm-start cache,
+    from the price books when they're loaded and the last snapshot otherwise.
+    Runs every ``warm_cache_interval`` seconds, when the continuous scanner
+    stops and at exit.
+    """
+    global warm_saved
+    if not last_scan or not WARM_CACHE:
+        return
+    if listings:
+        rows = ((uuid, *entry) for uuid, entry in listings.items())
+    elif snapshot is not None:
+        names = snapshot.ids.names
+        rows = zip([uuid.decode() for uuid in snapshot.uuid.tolist()],
+                   [names[item] for item in snapshot.item.tolist()],
+                   snapshot.price.tolist(), snapshot.end.tolist())
+    else:
+        return
     try:
-        with session.get(base_url + page, timeout=10) as response:
-            data = response.json()
+        warmcache.save(WARM_CACHE_FILE, rows, {
+            "api_url": API_URL,
+            "last_updated": last_scan,
+            "toppage": toppage,
+            "cycles_since_full": cycles_since_full,
+            "scheduler": list(scheduler.scores.items()),
+            "cadence": [cadence.gaps, cadence.offsets],
+        })
+    except OSError as e:
+        print(f"[ERROR] Could not save the warm-start cache: {e}")
+    warm_saved = time.monotonic()
+
+atexit.register(save_warm_cache)
+
+def warm_start():
+    """
+    Restore the listings and scan position a previous run saved, so the
+    first cycle can be incremental; returns whether there was a usable cache.
+    """
+    global last_scan, toppage, cycles_since_full, warm_checked, warm_saved
+    warm_checked = True
+    cached = warmcache.load(WARM_CACHE_FILE, API_URL, WARM_CACHE_MAX_AGE)
+    if cached is None:
+        return False
+    entries, meta = cached
+    listings.clear()
+    books.clear()
+    prices.clear()
+    # price order, so each book insert appends
+    for uuid, (index, price, end) in sorted(entries.items(), key=lambda item: item[1][1]):
+        add_listing(uuid, index, price, end)
+    for index in books:
+        reprice(index)
+    last_scan = meta["last_updated"]
+    toppage = meta.get("toppage", 0)
+    scheduler.scores = dict(meta.get("scheduler", []))
+    cadence.gaps, cadence.offsets = meta.get("cadence", [[], []])
+    warm_saved = time.monotonic()
+    # the refreshes missed while down count towards the next full resync
+    age = time.time() - meta["saved_at"] / 1000
+    cycles_since_full = meta.get("cycles_since_full", 0) + int(age / cadence.interval)
+    print(f"[INFO] Warm start: {len(listings):,} listings from {WARM_CACHE_FILE} saved {age:.0f}s ago.")
+    return True
+
+def price_history():
+    """
+    The price history store, or None when it is switched off or unreadable.
+    """
+    global history, PRICE_HISTORY
+    if history is None and PRICE_HISTORY:
+        try:
+            history = PriceHistory(keyframe=HISTORY_KEYFRAME)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Price history disabled: {e}")
+            PRICE_HISTORY = False
+    return history if PRICE_HISTORY else None
+
+def item_counts():
+    """Live listings per item, from the price books or the last snapshot."""
+    if books:
+        return {index: len(book) for index, book in books.items()}
+    return snapshot.counts() if snapshot is not None else {}
+
+def reprice(index):
+    book = books.get(index)
+    if not book:
+        prices.pop(index, None)
+        return
+    prices[index] = [book.lowest, book.second]
+
+def item_depth(index, n):
+    """
+    The ``n`` cheapest prices of an item, from its price book when the
+    incremental state is loaded and from the last snapshot otherwise.
+    """
+    book = books.get(index)
+    if book is not None:
+        return book.bottom(n)
+    if snapshot is not None and index in snapshot.ids.ids:
+        return snapshot.bottom(snapshot.ids.ids[index], n)
+    return []
+
+def page_body(session, page, retries=3):
+    """
+    The raw body of one auctions page through the governor, retrying
+    failures with backoff; raises the last error.
+    """
+    for i in range(retries):
+        try:
+            start = default_timer()
+            with governor.get(session, AUCTIONS_URL + "?page=" + str(page), timeout=10) as response:
+                response.raise_for_status()
+                body = response.content
+            metrics.page(default_timer() - start)
+            return body
+        except requests.exceptions.RequestException:
+            if i == retries - 1:
+                raise
+            metrics.count("retries")
+            time.sleep(backoff_delay(i))
+
+def fetch_page(session, page):
+    try:
+        return decode_page(page_body(session, page))
     except Exception as e:
         print(f"[ERROR] Fetch failed on page {page}: {e}")
+        metrics.count("errors")
         return {"auctions": [], "success": False}
 
+def parse_pool():
+    global _parse_pool
+    if _parse_pool is None:
+        workers = os.cpu_count() if PARSE_PROCESSES == "auto" else int(PARSE_PROCESSES)
+        _parse_pool = ProcessPoolExecutor(max_workers=workers)
+        atexit.register(_parse_pool.shutdown)
+    return _parse_pool
+
+def parse_mode():
+    return "processes" if PARSE_PROCESSES else "threads"
+
+def fetch_concurrency():
+    """Connections to open for a fetch; the governor decides how many are used."""
+    return MAX_CONCURRENCY if GOVERNOR else CONCURRENCY
+
+def fetch_raw(session, page):
+    try:
+        return page, page_body(session, page)
+    except Exception as e:
+        print(f"[ERROR] Fetch failed on page {page}: {e}")
+        metrics.count("errors")
+        return page, None
+
+def fetch(session, page):
+    global toppage
+    data = fetch_page(session, page)
     toppage = data.get('totalPages', toppage)
-    if data.get('success'):
-        for auction in data['auctions']:
-            if not auction['claimed'] and auction['bin'] and "Furniture" not in auction.get("item_lore", ""):
-                index = re.sub(r"\[[^\]]*\]", "", auction['item_name']) + auction['tier']
-                for reforge in REFORGES:
-                    index = index.replace(reforge, "")
-                if index in prices:
-                    if prices[index][0] > auction['starting_bid']:
-                        prices[index][1] = prices[index][0]
-                        prices[index][0] = auction['starting_bid']
-                    elif prices[index][1] > auction['starting_bid']:
-                        prices[index][1] = auction['starting_bid']
-                else:
-                    prices[index] = [auction['starting_bid'], float("inf")]
-
-                if (LOWEST_PRICE < prices[index][0] < MAX_PRICE and
-                    prices[index][1] > LOWEST_PRICE and
-                    auction['start'] + 60000 > now):
-                    results.append([auction['uuid'], auction['item_name'], auction['starting_bid'], index])
-    return data
+    return int(page), parse_page(data, now)
+
+def async_client():
+    """
+    Whether pages are fetched through the pooled httpx client rather than
+    requests on a thread pool, which measured faster against the mock API
+    (see benchmarks/bench_fetch.py); without httpx it is always threads.
+    """
+    return FETCH_BACKEND == "httpx" and httpx is not None
 
-async def get_data_asynchronous():
-    pages = [str(x) for x in range(toppage)]
-    with ThreadPoolExecutor(max_workers=10) as executor:
+def fetcher_metrics(fetcher):
+    metrics.pages(fetcher.latencies)
+    metrics.count("retries", fetcher.retried)
+    metrics.count("errors", fetcher.errors)
+
+async def get_data_asynchronous(pages):
+    """
+    Fetch every page and parse each one as soon as it arrives, with blocking
+    requests on a thread pool or the pooled async client (``fetch_backend``).
+    Returns the per-page partials as ``(page, partial)``.
+    """
+    global toppage
+    if PARSE_PROCESSES:
+        return await get_data_multiprocess(pages)
+
+    partials = []
+    if async_client():
+        async with AsyncFetcher(AUCTIONS_URL, concurrency=fetch_concurrency(), http2=HTTP2,
+                                decode=decode_page, governor=governor) as fetcher:
+            async for page, data in fetcher.pages(pages):
+                toppage = data.get('totalPages', toppage)
+                partials.append((page, parse_page(data, now)))
+        fetcher_metrics(fetcher)
+        return partials
+
+    with ThreadPoolExecutor(max_workers=fetch_concurrency()) as executor:
         with requests.Session() as session:
             loop = asyncio.get_event_loop()
             tasks = [
-                loop.run_in_executor(executor, fetch, *(session, page))
-                for page in pages if int(page) < toppage
+                loop.run_in_executor(executor, fetch, *(session, str(page)))
+                for page in pages if page < toppage
             ]
-            for response in await asyncio.gather(*tasks):
-                pass
+            for response in asyncio.as_completed(tasks):
+                partials.append(await response)
+    return partials
 
-def start_sniper():
-    global results, prices
-    results = []
-    prices = {}
+async def stream_pages(session, pages, concurrency):
+    """
+    Fetch ``pages``, at most ``concurrency`` at a time, and yield
+    ``(page, data)`` as each one arrives.
+    """
+    if not pages:
+        return
+    if async_client():
+        async with AsyncFetcher(AUCTIONS_URL, concurrency=concurrency, http2=HTTP2,
+                                decode=decode_page, governor=governor) as fetcher:
+            async for page, data in fetcher.pages(pages):
+                yield page, data
+        fetcher_metrics(fetcher)
+        return
+
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def numbered(page):
+            return page, await loop.run_in_executor(executor, fetch_page, session, page)
+        for next_done in asyncio.as_completed([numbered(page) for page in pages]):
+            yield await next_done
+
+async def get_data_multiprocess(pages):
+    """
+    Download raw page bodies on the I/O side and decode + parse them in a
+    process pool, so the CPU-bound part isn't held back by the GIL.
+    """
+    loop = asyncio.get_running_loop()
+    pool = parse_pool()
+    parsed = []
+    if async_client():
+        async with AsyncFetcher(AUCTIONS_URL, concurrency=fetch_concurrency(), http2=HTTP2,
+                                governor=governor) as fetcher:
+            async for page, raw in fetcher.pages(pages, raw=True):
+                parsed.append(loop.run_in_executor(pool, parse_page_bytes, page, raw, now))
+        fetcher_metrics(fetcher)
+    else:
+        with ThreadPoolExecutor(max_workers=fetch_concurrency()) as executor:
+            with requests.Session() as session:
+                downloads = [loop.run_in_executor(executor, fetch_raw, session, page)
+                             for page in pages]
+                for download in asyncio.as_completed(downloads):
+                    page, raw = await download
+                    parsed.append(loop.run_in_executor(pool, parse_page_bytes, page, raw, now))
+    return list(await asyncio.gather(*parsed))
+
+def full_scan(first):
+    """
+    Rebuild the price state from every page; ``first`` is the already
+    fetched page 0.
+    """
+    global prices, snapshot, now, toppage, last_scan, cycles_since_full
+    listings.clear()
+    books.clear()
+
+    now = first['lastUpdated']
+    toppage = first['totalPages']
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
-    future = asyncio.ensure_future(get_data_asynchronous())
-    loop.run_until_complete(future)
-
-    clean_results = []
-    for entry in results:
-        uuid, name, price, index = entry
-        second_price = prices[index][1]
-        if price >= second_price or second_price == float("inf"):
-            continue
+    future = asyncio.ensure_future(get_data_asynchronous(scheduler.order(toppage)))
+    started = default_timer()
+    with metrics.stage("fetch"):
+        partials = [(0, parse_page(first, now))] + loop.run_until_complete(future)
+    parse_stats[parse_mode()] = [len(partials), default_timer() - started]
+    metrics.count("pages", len(partials))
+    for page, (_, _, fresh) in partials:
+        scheduler.observe(page, len(fresh))
+    metrics.count("auctions", first.get('totalAuctions', 0))
+
+    with metrics.stage("reduce"):
+        # Reduce in page order so the outcome doesn't depend on arrival order
+        partials.sort(key=lambda item: item[0])
+        prices = reduce_tables([table for _, (table, _, _) in partials], REDUCE_WORKERS)
+        snapshot = Snapshot.from_rows([listed for _, (_, listed, _) in partials], item_ids)
+        names = {}
+        for _, (_, _, fresh) in partials:
+            names.update(fresh)
+
+        second = snapshot.per_item(prices)
+        for row in snapshot.candidates(now, second, LOWEST_PRICE, MAX_PRICE).tolist():
+            uuid = snapshot.uuid[row].decode()
+            index = item_ids.names[snapshot.item[row]]
+            results.append([uuid, names[uuid], int(snapshot.price[row]), index])
+
+    last_scan = now
+    cycles_since_full = 0
+
+def is_candidate(entry):
+    uuid, _, price, index = entry
+    return (uuid in listings and LOWEST_PRICE < price < MAX_PRICE and
+            prices[index][1] > LOWEST_PRICE)
+
+def incremental_scan(session, first, on_page=None):
+    """
+    Apply the changes since the last processed snapshot to the kept price
+    state: new listings from page 0 (``first``) and the pages the scheduler
+    picks, sold ones from the ended feed and expired ones by their end time.
+
+    With ``on_page``, each page's fresh candidates are passed to it as soon
+    as that page is applied, priced against the state so far (sales from
+    the ended feed aren't in yet), instead of being added to ``results``.
+    """
+    global now, toppage, last_scan, cycles_since_full
+    if not listings and snapshot is not None:
+        load_listings()
+    now = first['lastUpdated']
+    toppage = first.get('totalPages', toppage)
+
+    dirty = set()
+    fresh = []
+
+    def apply_page(page, data):
+        new_on_page = 0
+        seen = len(fresh)
+        starts = []
+        metrics.count("pages")
+        metrics.count("auctions", len(data.get('auctions', ())))
+        for auction in data.get('auctions', []):
+            uuid = auction['uuid']
+            if uuid in listings:
+                if auction['claimed']:
+                    dirty.add(remove_listing(uuid))
+                continue
+            # anything not tracked yet is added, however old: the stale pages
+            # find listings that landed on a page no earlier cycle fetched
+            if not is_tracked(auction):
+                continue
+            if auction['start'] > last_scan:
+                new_on_page += 1
+            index = item_index(auction)
+            add_listing(uuid, index, auction['starting_bid'], auction.get('end', 0))
+            dirty.add(index)
+            if auction['start'] + 60000 > now:
+                fresh.append([uuid, auction['item_name'], auction['starting_bid'], index])
+                starts.append(auction['start'])
+        scheduler.observe(page, new_on_page)
+
+        seen_at = int(time.time() * 1000)
+        for start in starts:
+            metrics.sample("time_to_detect_ms", scheduler.detected(start, seen_at))
+
+        if on_page is not None and len(fresh) > seen:
+            dirty.discard(None)
+            for index in dirty:
+                reprice(index)
+            on_page([entry for entry in fresh[seen:] if is_candidate(entry)])
+
+    # Pages where new listings tend to land first, at full concurrency, then
+    # a few of the others to catch what lands elsewhere
+    async def walk(hot, stale):
+        for pages, concurrency in ((hot, fetch_concurrency()), (stale, STALE_CONCURRENCY)):
+            async for page, data in stream_pages(session, pages, concurrency):
+                apply_page(page, data)
+
+    apply_page(0, first)
+    asyncio.run(walk(*scheduler.plan(toppage)))
+
+    # Sold and cancelled auctions from the ended feed
+    with metrics.stage("ended"):
+        ended = safe_request(ENDED_URL)
+    for auction in ended.get('auctions', []):
+        dirty.add(remove_listing(auction['auction_id']))
 
-        # Profit logic
-        suggested_price = min(int(second_price * 0.93), second_price - 1)
-        profit = suggested_price - price
+    # Expired listings are dropped by their end time
+    for uuid in [u for u, entry in listings.items() if entry[2] and entry[2] <= now]:
+        dirty.add(remove_listing(uuid))
 
-        if profit <= 0 or profit / price < MIN_PROFIT_PERCENT:
+    dirty.discard(None)
+    for index in dirty:
+        reprice(index)
+
+    if on_page is None:
+        results.extend(entry for entry in fresh if is_candidate(entry))
+
+    last_scan = now
+    cycles_since_full += 1
+
+def evaluate(entries):
+    """
+    Run the profit filter over candidate ``[uuid, name, price, index]``
+    entries and return the snipes, in order, as event dicts.
+    """
+    # Time-weighted rolling median of each candidate item's lowest BIN
+    past = price_history()
+    medians = {}
+    if past is not None and entries:
+        medians = past.rolling_median([entry[3] for entry in entries],
+                                       now - HISTORY_WINDOW * 1000, HISTORY_MIN_SAMPLES, now)
+
+    # Profit logic, as one vectorised pass over the candidates
+    depths = [depth_metrics(item_depth(entry[3], BOOK_DEPTH + 1), BOOK_DEPTH) for entry in entries]
+    seconds = [prices[entry[3]][1] for entry in entries]
+    if REFERENCE_PRICE == "median":
+        references = [m["median"] for m in depths]
+    elif REFERENCE_PRICE == "history":
+        # never above the live second-lowest; falls back to it without history
+        references = [min(second, medians.get(entry[3], second)) for entry, second in zip(entries, seconds)]
+    else:
+        references = seconds
+    keep, suggested, profit = profit_filter([entry[2] for entry in entries], seconds,
+                                            MIN_PROFIT_PERCENT, references)
+
+    found_at = int(time.time() * 1000)
+    snipes = []
+    for i, (uuid, name, price, index) in enumerate(entries):
+        if not keep[i]:
             continue
+        depth = depths[i]
+        snipes.append({
+            "uuid": uuid,
+            "item_name": name,
+            "index": index,
+            "price": price,
+            "second": seconds[i],
+            "reference": references[i],
+            "suggested": int(suggested[i]),         # up to 7% under the reference, or -1
+            "profit": int(profit[i]),
+            "rolling_median": medians.get(index),
+            "median_next": depth["median"] if depth["median"] != float("inf") else None,
+            "gap_to_third": depth["gap_to_third"] if depth["gap_to_third"] != float("inf") else None,
+            "last_updated": now,
+            "found_at": found_at,
+            "delay_ms": found_at - now,             # since the API published the snapshot
+        })
+    return match_profiles(snipes)
 
-        clean_results.append([[uuid, name, price, index], second_price])
+def match_profiles(snipes):
+    """Tag each snipe with the profiles it passes and drop those that pass none."""
+    matched = []
+    for event in snipes:
+        event["profiles"] = [profile["name"] for profile in PROFILES
+                             if event["price"] < profile["budget"]
+                             and event["profit"] / event["price"] >= profile["min_profit"]]
+        if event["profiles"]:
+            matched.append(event)
+    return matched
 
-    if clean_results:
-        print("\n========== SNIPES FOUND ==========\n")
-        for i, result in enumerate(clean_results):
-            uuid, name, price, index = result[0]
-            second_price = result[1]
-
-            # Suggest undercut price (up to 7% undercut or -1)
-            suggested_price = min(int(second_price * 0.93), second_price - 1)
-            profit = suggested_price - price
-
-            print(f"{Fore.YELLOW}Auction {i+1}:{Style.RESET_ALL}")
-            print(f"Auction UUID: {uuid}")
-            print(f"Item Name: {name}")
-            print(f"Item Price: {format_price(price)}")
-            print(f"Second Lowest BIN: {format_price(second_price)}")
-            print(f"{Fore.CYAN}/viewauction {uuid}{Style.RESET_ALL}")
-            print(f"{Fore.GREEN}💡 Recommended BIN Price: {format_price(suggested_price)}")
-            print(f"📈 Profit if flipped: {format_price(profit)}{Style.RESET_ALL}")
-            print("----------------------------------")
+def print_snipe(number, event):
+    print(f"{Fore.YELLOW}Auction {number}:{Style.RESET_ALL}"
+          + (f" [{', '.join(event['profiles'])}]" if len(PROFILES) > 1 else ""))
+    print(f"Auction UUID: {event['uuid']}")
+    print(f"Item Name: {event['item_name']}")
+    print(f"Item Price: {format_price(event['price'])}")
+    print(f"Second Lowest BIN: {format_price(event['second'])}")
+    if event["rolling_median"] is not None:
+        print(f"Rolling median ({HISTORY_WINDOW / 3600:g}h): {format_price(int(event['rolling_median']))}")
+    if event["median_next"] is not None:
+        print(f"Median of next {BOOK_DEPTH}: {format_price(int(event['median_next']))}"
+              + (f" | Gap to 3rd: {format_price(event['gap_to_third'])}"
+                 if event["gap_to_third"] is not None else ""))
+    print(f"{Fore.CYAN}/viewauction {event['uuid']}{Style.RESET_ALL}")
+    print(f"{Fore.GREEN}💡 Recommended BIN Price: {format_price(event['suggested'])}")
+    print(f"📈 Profit if flipped: {format_price(event['profit'])}{Style.RESET_ALL}")
+    print("----------------------------------")
+
+def log_event(event):
+    """The snipe log, once per snipe however many of its profiles log."""
+    if any(profile["log"] for profile in PROFILES if profile["name"] in event["profiles"]):
+        log_snipe(event["item_name"], event["price"], event["suggested"], event["second"], event["uuid"])
+
+def profile_event(event):
+    """Feed the snipe to the sinks of every profile it matched."""
+    for profile in PROFILES:
+        if profile["name"] in event["profiles"] and profile["sinks"]:
+            fan_out(profile["sinks"])(event)
+
+def start_sniper(incremental=False, emit=None):
+    """
+    Run one scan cycle and report the snipes found.  With ``incremental`` the
+    price state from the previous cycle is reused and only the changes since
+    then are fetched; a full scan still runs when there is no state yet or
+    every ``full_rescan_every`` cycles to resync.
+
+    With ``emit``, every snipe is passed to it as an event dict (see
+    evaluate) the moment it is found, page by page in an incremental scan,
+    instead of being printed and logged once the cycle is done.  Each
+    auction is emitted once, however many cycles and resyncs it stays
+    listed for.
+
+    In an incremental scan page 0 is checked first and nothing else is
+    fetched if the snapshot hasn't changed since the last cycle; a one-shot
+    scan always runs, so it lists the current snipes again.  Returns whether
+    a scan ran.
+    """
+    global results
+    results = []
+    load_config()
+    if METRICS:
+        metrics.begin()
+    if incremental and WARM_CACHE and not last_scan and not warm_checked:
+        with metrics.stage("warm_start"):
+            warm_start()
+
+    with metrics.stage("poll"):
+        first = poll_first_page(changed_only=incremental)
+    if first is POLL_FAILED:
+        metrics.set_mode("failed")
+        metrics.end(METRICS_FILE or None)
+        if not incremental:
+            print("Couldn't fetch the auction data, try again in a moment.")
+            time.sleep(2)
+        return False
+    if first is None:
+        metrics.set_mode("unchanged")
+        metrics.end(METRICS_FILE or None)
+        return False
+
+    if emit is not None:
+        def send(event):
+            if event["uuid"] not in emitted:
+                emitted.add(event["uuid"])
+                emit(event)
+
+        def stream(entries):
+            for event in evaluate(entries):
+                send(event)
+
+    if incremental and last_scan and cycles_since_full < FULL_RESCAN_EVERY:
+        metrics.set_mode("incremental")
+        with metrics.stage("incremental"):
+            incremental_scan(poll_session, first, stream if emit is not None else None)
+    else:
+        metrics.set_mode("full")
+        full_scan(first)
 
+    with metrics.stage("filter"):
+        snipes = evaluate(results)
+
+    # Recorded after the filter, so the rolling medians are of past cycles only
+    with metrics.stage("history"):
+        past = price_history()
+        if past is not None:
+            past.append(now, prices, item_counts())
+
+    if WARM_CACHE and time.monotonic() - warm_saved >= WARM_CACHE_INTERVAL:
+        with metrics.stage("warm_cache"):
+            save_warm_cache()
+
+    reported = default_timer()
+    if emit is not None:
+        for event in snipes:
+            send(event)
+        if listings:        # empty right after a full scan, until the next cycle loads them
+            emitted.intersection_update(listings)
+    elif snipes:
+        print("\n========== SNIPES FOUND ==========\n")
+        for i, event in enumerate(snipes):
+            print_snipe(i + 1, event)
             # ✅ Log the snipe
-            log_snipe(name, price, suggested_price, second_price, uuid)
+            log_event(event)
+            profile_event(event)
 
         print("\nReturning to main menu...\n")
     else:
         print("No good flips found right now.")
+    metrics.add_time("report", default_timer() - reported)
+    metrics.end(METRICS_FILE or None)
+    if emit is None and not snipes:
         time.sleep(2)
+    return True
+
+def sniper_loop(emit=None):
+    """
+    Scan whenever the API publishes a new snapshot, polling just after each
+    expected refresh rather than on a fixed timer, and stream snipes as they
+    are found: to ``emit`` when given, otherwise to the console, the snipe
+    log and the sinks switched on in config.json (see sinks.py), looked up
+    from the config each cycle reloads.
+    """
+    if emit is None:
+        count = itertools.count(1)
 
-def sniper_loop():
-    while True:
-        start_sniper()
-        time.sleep(30)
+        def report(event):
+            fan_out([lambda event: print_snipe(next(count), event), log_event, profile_event]
+                    + outbound_sinks(config))(event)
+        emit = report
+    try:
+        while True:
+            start_sniper(incremental=True, emit=emit)
+            time.sleep(cadence.next_delay())
+    finally:
+        save_warm_cache()
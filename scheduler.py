@@ -0,0 +1,80 @@
+"""
+Decides which auction pages an incremental scan fetches, and in what order.
+
+New listings don't land evenly across the pages, so the scheduler keeps a
+decaying score per page of how many new listings it held.  Each cycle the
+pages scoring at least ``hot_threshold`` are fetched first, best first and
+at full concurrency, and the rest are refreshed round-robin, a few per
+cycle at low concurrency, so every page is still looked at every so often.
+
+It also keeps the time-to-detect of fresh listings: the time from their
+``start`` to the moment the scanner applied their page (server clock to
+ours, so it includes any skew between the two).
+"""
+import statistics
+from collections import deque
+
+
+class PageScheduler:
+    def __init__(self, max_hot: int = 5, stale_pages: int = 2, hot_threshold: float = 0.5,
+                 decay: float = 0.5, history: int = 1000):
+        self.max_hot = max_hot
+        self.stale_pages = stale_pages
+        self.hot_threshold = hot_threshold
+        self.decay = decay
+        self.scores = {}                    # page -> decaying count of new listings
+        self.detect_ms = deque(maxlen=history)
+        self._cursor = 0                    # position in the stale round-robin
+
+    def observe(self, page: int, new: int) -> None:
+        """Record how many new listings ``page`` held this cycle."""
+        self.scores[page] = self.scores.get(page, 0.0) * self.decay + new * (1 - self.decay)
+
+    def hot(self, toppage: int) -> list[int]:
+        """
+        Pages 1.. worth fetching first, best first.  Before anything has
+        been observed that is simply the first ``max_hot`` pages.
+        """
+        if not self.scores:
+            return list(range(1, min(toppage, self.max_hot + 1)))
+        ranked = [page for page, score in self.scores.items()
+                  if 0 < page < toppage and score >= self.hot_threshold]
+        ranked.sort(key=lambda page: -self.scores[page])
+        return ranked[:self.max_hot]
+
+    def plan(self, toppage: int) -> tuple[list[int], list[int]]:
+        """
+        ``(hot, stale)`` pages to fetch this cycle besides page 0: the hot
+        ones, then the next ``stale_pages`` of the others in turn.
+        """
+        hot = self.hot(toppage)
+        taken = set(hot)
+        rest = [page for page in range(1, toppage) if page not in taken]
+        if not rest:
+            return hot, []
+        start = self._cursor % len(rest)
+        stale = (rest[start:] + rest[:start])[:self.stale_pages]
+        self._cursor = start + len(stale)
+        return hot, stale
+
+    def order(self, toppage: int) -> list[int]:
+        """Every page from 1, the hot ones first, for a full scan."""
+        hot = self.hot(toppage)
+        taken = set(hot)
+        return hot + [page for page in range(1, toppage) if page not in taken]
+
+    def detected(self, start_ms: int, seen_ms: int) -> int:
+        delay = seen_ms - start_ms
+        self.detect_ms.append(delay)
+        return delay
+
+    def summary(self) -> dict:
+        """Time-to-detect over the recent fresh listings, in ms."""
+        if not self.detect_ms:
+            return {"count": 0}
+        ordered = sorted(self.detect_ms)
+        return {
+            "count": len(ordered),
+            "median": statistics.median(ordered),
+            "p90": ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+        }
@@ -0,0 +1,144 @@
+"""
+Outbound sinks for snipe events in the continuous scanner.
+
+A sink is any callable taking one event dict (see scanner.evaluate).  The
+console and the snipe log are always fed; the ones here push events to
+other programs, from a background thread each so a slow receiver never
+delays the next alert:
+
+  Webhook      POSTs every event as JSON to ``webhook_url``
+  SocketFeed   streams events as JSON lines to every client connected to
+               ``snipe_socket_port`` on localhost (e.g. ``nc localhost 9188``)
+  JsonLines    appends every event as a JSON line to ``snipe_log_file``
+               (a local append, so it writes straight away)
+
+The same keys inside a scan profile give that profile sinks of its own.
+Extra sinks can be added from code with register().
+"""
+import json
+import queue
+import socket
+import threading
+
+import requests
+
+_registered = []
+
+
+def register(sink) -> None:
+    """Feed every future snipe event to ``sink`` as well."""
+    _registered.append(sink)
+
+
+class Webhook:
+    def __init__(self, url: str, timeout: float = 5):
+        self.url = url
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        threading.Thread(target=self._post_loop, daemon=True).start()
+
+    def __call__(self, event: dict) -> None:
+        self._queue.put(event)
+
+    def _post_loop(self):
+        session = requests.Session()
+        while True:
+            event = self._queue.get()
+            try:
+                session.post(self.url, json=event, timeout=self.timeout).raise_for_status()
+            except requests.exceptions.RequestException as e:
+                print(f"[ERROR] Webhook {self.url} failed: {e}")
+
+
+class SocketFeed:
+    """
+    Each client gets its own queue and writer thread, so one that stops
+    reading only holds up itself; it is dropped once a send has blocked
+    for ``send_timeout`` seconds or ``backlog`` events are waiting for it.
+    """
+    def __init__(self, port: int, host: str = "127.0.0.1", send_timeout: float = 5, backlog: int = 1000):
+        self.send_timeout = send_timeout
+        self.backlog = backlog
+        self.clients = {}           # socket -> its queue of lines
+        self._lock = threading.Lock()
+        self.server = socket.create_server((host, port))
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def __call__(self, event: dict) -> None:
+        line = (json.dumps(event) + "\n").encode()
+        with self._lock:
+            for client, lines in list(self.clients.items()):
+                try:
+                    lines.put_nowait(line)
+                except queue.Full:
+                    del self.clients[client]     # its writer closes it
+
+    def _accept_loop(self):
+        while True:
+            client, _ = self.server.accept()
+            client.settimeout(self.send_timeout)
+            lines = queue.Queue(self.backlog)
+            with self._lock:
+                self.clients[client] = lines
+            threading.Thread(target=self._write_loop, args=(client, lines), daemon=True).start()
+
+    def _write_loop(self, client, lines):
+        try:
+            while client in self.clients:
+                client.sendall(lines.get())
+        except OSError:         # including a send that timed out
+            pass
+        with self._lock:
+            self.clients.pop(client, None)
+        client.close()
+
+
+class JsonLines:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict) -> None:
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+
+
+_KINDS = {"webhook": Webhook, "socket": SocketFeed, "file": JsonLines}
+_configured = {}        # (kind, target) -> sink, so reloading the config reuses them
+
+
+def from_config(config: dict, registered: bool = True) -> list:
+    """
+    The outbound sinks switched on in config.json (or a scan profile of
+    it), plus the registered ones unless ``registered`` is off.  Created
+    once per target and reused on later calls.
+    """
+    wanted = []
+    if config.get("webhook_url"):
+        wanted.append(("webhook", config["webhook_url"]))
+    if config.get("snipe_socket_port"):
+        wanted.append(("socket", int(config["snipe_socket_port"])))
+    if config.get("snipe_log_file"):
+        wanted.append(("file", config["snipe_log_file"]))
+    sinks = []
+    for kind, target in wanted:
+        if (kind, target) not in _configured:
+            try:
+                _configured[kind, target] = _KINDS[kind](target)
+            except OSError as e:
+                print(f"[ERROR] Snipe {kind} sink disabled: {e}")
+                _configured[kind, target] = None
+        if _configured[kind, target] is not None:
+            sinks.append(_configured[kind, target])
+    return sinks + _registered if registered else sinks
+
+
+def fan_out(sinks):
+    """One callable feeding ``sinks`` in order; a failing sink doesn't stop the rest."""
+    def emit(event):
+        for sink in sinks:
+            try:
+                sink(event)
+            except Exception as e:
+                print(f"[ERROR] Snipe sink {sink!r} failed: {e}")
+    return emit
@@ -0,0 +1,141 @@
+"""
+Columnar snapshot of the tracked BIN listings.
+
+One row per listing, stored as NumPy columns (fixed-width UUID bytes, an
+interned item id, price and start/end times) instead of a list or dict per
+auction, so a full auction house fits in a few MB and the profit filter runs
+as array operations.
+"""
+import numpy as np
+
+
+class ItemIds:
+    """
+    Interns canonical item keys to small consecutive integer ids.
+    """
+
+    def __init__(self, names=()):
+        self.names = []
+        self.ids = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name: str) -> int:
+        item_id = self.ids.get(name)
+        if item_id is None:
+            item_id = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return item_id
+
+    def __len__(self):
+        return len(self.names)
+
+
+class Snapshot:
+    def __init__(self, uuid, item, price, start, end, ids: ItemIds):
+        self.uuid = uuid
+        self.item = item
+        self.price = price
+        self.start = start
+        self.end = end
+        self.ids = ids
+        self._order = None
+        self._offsets = None
+
+    @classmethod
+    def from_rows(cls, row_lists, ids: ItemIds | None = None) -> "Snapshot":
+        """
+        Build from lists of ``(uuid, index, price, start, end)`` rows, one list
+        per page, without materialising them as one big list first.
+        """
+        ids = ids if ids is not None else ItemIds()
+        count = sum(len(rows) for rows in row_lists)
+        uuid = np.empty(count, dtype="S32")
+        item = np.empty(count, dtype=np.int32)
+        price = np.empty(count, dtype=np.int64)
+        start = np.empty(count, dtype=np.int64)
+        end = np.empty(count, dtype=np.int64)
+
+        pos = 0
+        for rows in row_lists:
+            if not rows:
+                continue
+            size = len(rows)
+            uuids, indexes, prices, starts, ends = zip(*rows)
+            uuid[pos:pos + size] = uuids
+            item[pos:pos + size] = [ids.intern(index) for index in indexes]
+            price[pos:pos + size] = prices
+            start[pos:pos + size] = starts
+            end[pos:pos + size] = ends
+            pos += size
+        return cls(uuid, item, price, start, end, ids)
+
+    def __len__(self):
+        return len(self.price)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in (self.uuid, self.item, self.price, self.start, self.end))
+
+    def sorted_rows(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Row numbers ordered by item then price, and for each item id the
+        offset of its first row in that order (computed once, then cached).
+        """
+        if self._order is None:
+            self._order = np.lexsort((self.price, self.item))
+            self._offsets = np.searchsorted(self.item[self._order], np.arange(len(self.ids) + 1))
+        return self._order, self._offsets
+
+    def counts(self) -> dict:
+        """Number of listings per item key."""
+        _, offsets = self.sorted_rows()
+        return dict(zip(self.ids.names, np.diff(offsets).tolist()))
+
+    def bottom(self, item_id: int, n: int) -> list:
+        """The ``n`` cheapest prices of an item, ascending."""
+        order, offsets = self.sorted_rows()
+        if item_id + 1 >= len(offsets):
+            return []
+        start = offsets[item_id]
+        stop = min(offsets[item_id + 1], start + n)
+        return self.price[order[start:stop]].tolist()
+
+    def per_item(self, table: dict, column: int = 1) -> np.ndarray:
+        """
+        ``table[name][column]`` for every interned item as an array indexed by
+        item id (``inf`` where the item has no entry).
+        """
+        return np.array([table[name][column] if name in table else np.inf
+                         for name in self.ids.names], dtype=np.float64)
+
+    def candidates(self, now: int, second: np.ndarray, lowest_price: int, max_price: int) -> np.ndarray:
+        """
+        Row numbers of listings started in the last minute that are within
+        budget on an item with a usable second-lowest BIN.
+        """
+        mask = ((self.start + 60000 > now) &
+                (self.price > lowest_price) & (self.price < max_price) &
+                (second[self.item] > lowest_price))
+        return np.flatnonzero(mask)
+
+
+def profit_filter(price, second, min_profit_percent: float, reference=None):
+    """
+    Vectorised undercut check: suggest ``min(int(ref * 0.93), ref - 1)`` for a
+    reference price (the second-lowest BIN unless ``reference`` is given) and
+    keep listings below the second-lowest BIN whose profit is positive and at
+    least ``min_profit_percent`` of the price.
+
+    Returns ``(mask, suggested, profit)``; suggested/profit are only
+    meaningful where the mask is set.
+    """
+    price = np.asarray(price, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    ref = second if reference is None else np.asarray(reference, dtype=np.float64)
+    finite = np.isfinite(second) & np.isfinite(ref)
+    safe_ref = np.where(finite, ref, 0)
+    suggested = np.minimum(np.floor(safe_ref * 0.93), safe_ref - 1)
+    profit = suggested - price
+    mask = finite & (price < second) & (profit > 0) & (profit / price >= min_profit_percent)
+    return mask, suggested.astype(np.int64), profit.astype(np.int64)
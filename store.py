@@ -0,0 +1,686 @@
+"""
+Storage for the snipe, auction and sale logs.
+
+The default backend is an embedded SQLite database (``sniper.db``) with
+indexes on item name, timestamp and UUID, so the menu screens query only the
+rows they show and flipping a ``Sold`` flag is a single-row update.  The
+first time the database is opened, rows from the existing CSV logs are
+imported into it.  Setting ``"storage": "csv"`` in config.json keeps the
+plain CSV files instead.  Those are append-only: every write takes an
+advisory lock and appends, and marking an auction sold appends an event
+that a background compactor later folds into auctions_log.txt, so a
+scanner and the menu can share the files from separate processes.
+
+Rows are handed out as dicts keyed by the CSV column names, so the screens
+work the same against either backend.
+
+The SQLite store also keeps per-item trend aggregates (flips, profit sum,
+min and max) in time buckets, updated as snipes are written, so the Trends
+screen reads a few hundred bucket rows however long the history is.
+"""
+import csv
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from logreader import LogReader
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+CONFIG_PATH = "config.json"
+DB_PATH = "sniper.db"
+
+SNIPES_LOG = "snipes_log.txt"
+SALES_LOG = "sales_log.txt"
+AUCTIONS_LOG = "auctions_log.txt"
+AUCTION_EVENTS = "auctions_events.txt"
+
+HEADERS = {
+    SNIPES_LOG:   ["Item Name", "Snipe Price", "Suggested BIN", "Second Lowest BIN", "Timestamp", "UUID"],
+    SALES_LOG:    ["Timestamp", "Item Name", "Buy Price", "Sell Price", "Profit", "Auction ID"],
+    AUCTIONS_LOG: ["Timestamp", "Item Name", "Listed Price", "Sold", "UUID"],
+}
+EVENT_HEADER = ["Timestamp", "Auction ID", "Event"]
+COMPACT_INTERVAL = 300      # seconds between checks for auction events to fold in
+# Trends windows, and the bucket sizes (seconds) the aggregates are kept at.
+# Short windows read the fine buckets, which are only kept for FINE_RETENTION.
+TREND_WINDOWS = {"1h": 3600, "24h": 86400, "14d": 14 * 86400}
+FINE_BUCKET = 300
+COARSE_BUCKET = 3600
+FINE_RETENTION = 2 * 86400
+
+_NUMERIC = {"Snipe Price", "Suggested BIN", "Second Lowest BIN", "Listed Price",
+            "Buy Price", "Sell Price", "Profit", "Auction ID"}
+
+
+def now_stamp() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _epoch(stamp: str) -> int:
+    return int(datetime.strptime(stamp, "%Y-%m-%d %H:%M:%S").timestamp())
+
+
+def _bucket_size(window: int) -> int:
+    return FINE_BUCKET if window <= 6 * 3600 else COARSE_BUCKET
+
+
+def _trend_rows(groups: dict) -> list[dict]:
+    """groups: item name -> [flips, profit sum, min, max]"""
+    rows = [{"Item Name": name, "Flips": flips, "AvgProfit": total / flips,
+             "MinProfit": low, "MaxProfit": high}
+            for name, (flips, total, low, high) in groups.items()]
+    rows.sort(key=lambda row: (-row["Flips"], row["Item Name"]))
+    return rows
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  SQLite
+# ────────────────────────────────────────────────────────────────────────────────
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snipes (
+    id INTEGER PRIMARY KEY,
+    item_name TEXT NOT NULL,
+    snipe_price INTEGER,
+    suggested_bin INTEGER,
+    second_bin INTEGER,
+    timestamp TEXT NOT NULL,
+    uuid TEXT
+);
+CREATE INDEX IF NOT EXISTS snipes_item ON snipes (item_name);
+CREATE INDEX IF NOT EXISTS snipes_time ON snipes (timestamp);
+CREATE INDEX IF NOT EXISTS snipes_uuid ON snipes (uuid);
+
+CREATE TABLE IF NOT EXISTS auctions (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    item_name TEXT NOT NULL,
+    listed_price INTEGER,
+    sold INTEGER NOT NULL DEFAULT 0,
+    uuid TEXT
+);
+CREATE INDEX IF NOT EXISTS auctions_item ON auctions (item_name);
+CREATE INDEX IF NOT EXISTS auctions_uuid ON auctions (uuid);
+CREATE INDEX IF NOT EXISTS auctions_time ON auctions (timestamp);
+CREATE INDEX IF NOT EXISTS auctions_unsold ON auctions (id) WHERE sold = 0;
+
+CREATE TABLE IF NOT EXISTS sales (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    item_name TEXT NOT NULL,
+    buy_price INTEGER,
+    sell_price INTEGER,
+    profit INTEGER,
+    auction_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS sales_item ON sales (item_name);
+CREATE INDEX IF NOT EXISTS sales_time ON sales (timestamp);
+CREATE INDEX IF NOT EXISTS sales_auction ON sales (auction_id);
+
+CREATE TABLE IF NOT EXISTS trend_buckets (
+    size INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    item_name TEXT NOT NULL,
+    flips INTEGER NOT NULL,
+    profit_sum INTEGER NOT NULL,
+    profit_min INTEGER NOT NULL,
+    profit_max INTEGER NOT NULL,
+    PRIMARY KEY (size, bucket, item_name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_BUCKET_UPSERT = """
+INSERT INTO trend_buckets VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (size, bucket, item_name) DO UPDATE SET
+    flips = flips + excluded.flips,
+    profit_sum = profit_sum + excluded.profit_sum,
+    profit_min = min(profit_min, excluded.profit_min),
+    profit_max = max(profit_max, excluded.profit_max)
+"""
+
+# Columns added after the first release, created on databases that predate them.
+_ADDED_COLUMNS = [("auctions", "uuid", "TEXT"), ("sales", "auction_id", "INTEGER")]
+
+_SNIPE_COLUMNS = ('item_name AS "Item Name", snipe_price AS "Snipe Price", '
+                  'suggested_bin AS "Suggested BIN", second_bin AS "Second Lowest BIN", '
+                  'timestamp AS "Timestamp", uuid AS "UUID"')
+_AUCTION_COLUMNS = ('id, timestamp AS "Timestamp", item_name AS "Item Name", '
+                    'listed_price AS "Listed Price", '
+                    'CASE sold WHEN 1 THEN \'Yes\' ELSE \'No\' END AS "Sold", uuid AS "UUID"')
+_SALE_COLUMNS = ('timestamp AS "Timestamp", item_name AS "Item Name", buy_price AS "Buy Price", '
+                 'sell_price AS "Sell Price", profit AS "Profit", auction_id AS "Auction ID"')
+
+
+def _as_int(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class SqliteStore:
+    """
+    One shared connection; writes are serialised with a lock because the
+    snipe logger writes from its own thread.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.lock = threading.Lock()
+        with self.lock, self.db:
+            for table, column, kind in _ADDED_COLUMNS:
+                columns = [row[1] for row in self.db.execute(f"PRAGMA table_info({table})")]
+                if columns and column not in columns:
+                    self.db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+            self.db.executescript(_SCHEMA)
+        self._migrate_csv()
+        self._build_trends()
+
+    def _query(self, sql: str, args=()) -> list[dict]:
+        with self.lock:
+            return [dict(row) for row in self.db.execute(sql, args)]
+
+    def _write(self, sql: str, args=()) -> int:
+        with self.lock, self.db:
+            return self.db.execute(sql, args).lastrowid
+
+    def _migrate_csv(self) -> None:
+        """
+        Import the CSV logs the first time this database is opened.  The
+        files are left where they are.
+        """
+        with self.lock:
+            if self.db.execute("SELECT 1 FROM meta WHERE key = 'csv_imported'").fetchone():
+                return
+        imported = {path: _read_log(path) for path in HEADERS if os.path.exists(path)}
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT INTO snipes (item_name, snipe_price, suggested_bin, second_bin, timestamp, uuid) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(r["Item Name"], r["Snipe Price"], r["Suggested BIN"], r["Second Lowest BIN"],
+                  r["Timestamp"], r["UUID"]) for r in imported.get(SNIPES_LOG, [])])
+            self.db.executemany(
+                "INSERT INTO auctions (id, timestamp, item_name, listed_price, sold, uuid) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(r["id"] + 1, r["Timestamp"], r["Item Name"], r["Listed Price"], r["Sold"] == "Yes",
+                  r["UUID"] or None) for r in imported.get(AUCTIONS_LOG, [])])
+            self.db.executemany(
+                "INSERT INTO sales (timestamp, item_name, buy_price, sell_price, profit, auction_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(r["Timestamp"], r["Item Name"], r["Buy Price"], r["Sell Price"], r["Profit"],
+                  None if r["Auction ID"] is None else r["Auction ID"] + 1)
+                 for r in imported.get(SALES_LOG, [])])
+            self.db.execute("INSERT INTO meta VALUES ('csv_imported', ?)", (now_stamp(),))
+        total = sum(len(rows) for rows in imported.values())
+        if total:
+            print(f"[INFO] Imported {total:,} rows from the CSV logs into {self.path}.")
+
+    def _build_trends(self) -> None:
+        """
+        Fill the trend buckets from the snipes already stored, once.
+        """
+        with self.lock:
+            if self.db.execute("SELECT 1 FROM meta WHERE key = 'trends_built'").fetchone():
+                return
+            rows = self.db.execute("SELECT item_name, snipe_price, suggested_bin, second_bin, timestamp "
+                                   "FROM snipes").fetchall()
+        with self.lock, self.db:
+            self._add_to_buckets(rows)
+            self.db.execute("INSERT INTO meta VALUES ('trends_built', ?)", (now_stamp(),))
+
+    def _add_to_buckets(self, rows) -> None:
+        """
+        Fold snipe rows into the trend buckets; the caller holds the lock and
+        the transaction.
+        """
+        groups = {}
+        fine_cutoff = int(datetime.now().timestamp()) - FINE_RETENTION
+        for name, price, suggested, _, stamp, *_ in rows:
+            if price is None or suggested is None:
+                continue
+            try:
+                at = _epoch(stamp)
+            except (TypeError, ValueError):
+                continue
+            profit = suggested - price
+            for size in (FINE_BUCKET, COARSE_BUCKET):
+                if size == FINE_BUCKET and at < fine_cutoff:
+                    continue
+                key = (size, at // size * size, name)
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [1, profit, profit, profit]
+                else:
+                    group[0] += 1
+                    group[1] += profit
+                    group[2] = min(group[2], profit)
+                    group[3] = max(group[3], profit)
+        self.db.executemany(_BUCKET_UPSERT, [(*key, *group) for key, group in groups.items()])
+        self.db.execute("DELETE FROM trend_buckets WHERE size = ? AND bucket < ?",
+                        (FINE_BUCKET, fine_cutoff))
+
+    # ── writes ────────────────────────────────────────────────────────────────
+    def add_snipes(self, rows) -> None:
+        """rows: (item_name, snipe_price, suggested_bin, second_bin, timestamp, uuid)"""
+        with self.lock, self.db:
+            self.db.executemany(
+                "INSERT INTO snipes (item_name, snipe_price, suggested_bin, second_bin, timestamp, uuid) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._add_to_buckets(rows)
+
+    def add_auction(self, item_name: str, listed_price: int, timestamp: str, uuid: str | None = None) -> int:
+        return self._write("INSERT INTO auctions (timestamp, item_name, listed_price, uuid) VALUES (?, ?, ?, ?)",
+                           (timestamp, item_name, listed_price, uuid))
+
+    def mark_sold(self, auction_id: int) -> None:
+        self._write("UPDATE auctions SET sold = 1 WHERE id = ?", (auction_id,))
+
+    def add_sale(self, item_name: str, buy_price: int, sell_price: int, timestamp: str,
+                 auction_id: int | None = None) -> None:
+        self._write("INSERT INTO sales (timestamp, item_name, buy_price, sell_price, profit, auction_id) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (timestamp, item_name, buy_price, sell_price, sell_price - buy_price, auction_id))
+
+    # ── reads ─────────────────────────────────────────────────────────────────
+    def snipes(self) -> list[dict]:
+        return self._query(f"SELECT {_SNIPE_COLUMNS} FROM snipes ORDER BY id")
+
+    def snipes_since(self, timestamp: str) -> list[dict]:
+        return self._query(f"SELECT {_SNIPE_COLUMNS} FROM snipes WHERE timestamp > ? ORDER BY timestamp",
+                           (timestamp,))
+
+    def recent_snipes(self, n: int) -> list[dict]:
+        return self._query(f"SELECT * FROM (SELECT {_SNIPE_COLUMNS}, id FROM snipes "
+                           f"ORDER BY id DESC LIMIT ?) ORDER BY id", (n,))
+
+    def last_snipe(self, item_name: str, before: str | None = None) -> dict | None:
+        """The latest snipe of ``item_name``, optionally no later than ``before``."""
+        rows = self._query(f"SELECT {_SNIPE_COLUMNS} FROM snipes WHERE item_name = ? AND timestamp <= ? "
+                           f"ORDER BY timestamp DESC, id DESC LIMIT 1", (item_name, before or "9999"))
+        return rows[0] if rows else None
+
+    def snipe(self, uuid: str) -> dict | None:
+        rows = self._query(f"SELECT {_SNIPE_COLUMNS} FROM snipes WHERE uuid = ? ORDER BY id DESC LIMIT 1",
+                           (uuid,))
+        return rows[0] if rows else None
+
+    def trends(self, window: int) -> list[dict]:
+        """
+        Per-item flips and profit (average, min, max) over roughly the last
+        ``window`` seconds, rounded out to whole buckets; most flipped first.
+        """
+        size = _bucket_size(window)
+        since = (int(datetime.now().timestamp()) - window) // size * size
+        rows = self._query("SELECT item_name, SUM(flips), SUM(profit_sum), MIN(profit_min), MAX(profit_max) "
+                           "FROM trend_buckets WHERE size = ? AND bucket >= ? GROUP BY item_name",
+                           (size, since))
+        return _trend_rows({row["item_name"]: list(row.values())[1:] for row in rows})
+
+    def auctions(self) -> list[dict]:
+        return self._query(f"SELECT {_AUCTION_COLUMNS} FROM auctions ORDER BY id")
+
+    def unsold_auctions(self) -> list[dict]:
+        return self._query(f"SELECT {_AUCTION_COLUMNS} FROM auctions WHERE sold = 0 ORDER BY id")
+
+    def sales(self) -> list[dict]:
+        return self._query(f"SELECT {_SALE_COLUMNS} FROM sales ORDER BY id")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  CSV (the original log files)
+# ────────────────────────────────────────────────────────────────────────────────
+def _repair_csv(path: str, cols: list[str], defaults: list[str] | None = None) -> None:
+    """
+    • Ensures the file exists.
+    • Makes the header exactly ','.join(cols).
+    • Splits a header+first-row line that was accidentally glued together.
+    • Optionally fills the missing trailing columns of short data rows from
+      `defaults` (one value per column).
+    """
+    header_line = ",".join(cols)
+    # 1. Create the file if it doesn't exist
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(header_line + "\n")
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw_lines = f.read().splitlines()
+    original = list(raw_lines)
+
+    if not raw_lines:
+        raw_lines = [header_line]
+
+    first = raw_lines[0]
+    # 2. Is the header glued to the first data row? Split at first timestamp.
+    if first.startswith(header_line) and first != header_line:
+        # Look for YYYY-MM-DD HH:MM:SS
+        m = re.search(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", first)
+        if m:
+            data_part = first[len(header_line):].lstrip(",")
+            raw_lines = [header_line, data_part, *raw_lines[1:]]
+        else:
+            # Unknown garble – just force-replace header
+            raw_lines[0] = header_line
+    # 3. Header missing or wrong → replace
+    elif first != header_line:
+        raw_lines[0] = header_line
+
+    # 4. Pad short rows if requested
+    if defaults is not None:
+        fixed = [raw_lines[0]]
+        for ln in raw_lines[1:]:
+            parts = next(csv.reader([ln]), [])
+            if parts and len(parts) < len(cols):
+                ln += "," + ",".join(defaults[len(parts):])
+            fixed.append(ln)
+        raw_lines = fixed
+
+    # 5. Re-write, only if something actually changed
+    if raw_lines != original:
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines([ln.rstrip("\r\n") + "\n" for ln in raw_lines])
+
+
+def _first_line(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.readline().rstrip("\r\n")
+
+
+def _converter(path: str):
+    """
+    ``convert(values, position)``: a row of ``path`` keyed by its expected
+    header, numbers as ints.  Auctions get their position as their id.
+    """
+    cols = HEADERS[path]
+    numeric = [col for col in cols if col in _NUMERIC]
+    auctions = path == AUCTIONS_LOG
+
+    def convert(values, position=None):
+        row = dict(zip(cols, values + [""] * (len(cols) - len(values))))
+        for col in numeric:
+            row[col] = _as_int(row[col])
+        if auctions:
+            row["id"] = position
+            row["Sold"] = row["Sold"] or "No"
+            row["UUID"] = row["UUID"] or None
+        return row
+    return convert
+
+
+def _read_csv(path: str) -> list[dict]:
+    """Every row of a log file, parsed in one go."""
+    convert = _converter(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        return [convert(values, i) for i, values in enumerate(values for values in reader if values)]
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False):
+    """
+    Advisory lock for ``path``, held on a ``.lock`` file beside it so the
+    compactor can replace the log itself.  Reads take it shared, appends and
+    compaction exclusive; Windows only has exclusive locks.
+    """
+    with open(path + ".lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:         # LK_LOCK gives up after 10 seconds
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _append_csv(path: str, rows, header: list[str] | None = None) -> None:
+    """Append rows under the lock, starting the file with ``header`` if it is new."""
+    with file_lock(path), open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if header and f.tell() == 0:
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _read_events() -> dict[int, str]:
+    """Auction id -> the latest status event appended for it."""
+    if not os.path.exists(AUCTION_EVENTS):
+        return {}
+    with open(AUCTION_EVENTS, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        events = {}
+        for values in reader:
+            if len(values) < 3:         # blank or hand-edited lines
+                continue
+            auction_id = _as_int(values[1])
+            if auction_id is not None:
+                events[auction_id] = values[2]
+        return events
+
+
+def _read_log(path: str) -> list[dict]:
+    """
+    _read_csv() under a shared lock; the auctions come with their pending
+    events applied.  Locks are always taken events first, as compact() does.
+    """
+    if path != AUCTIONS_LOG:
+        with file_lock(path, shared=True):
+            return _read_csv(path)
+    with file_lock(AUCTION_EVENTS, shared=True), file_lock(AUCTIONS_LOG, shared=True):
+        return _apply_events(_read_csv(AUCTIONS_LOG), _read_events())
+
+
+def _apply_events(rows: list[dict], events: dict[int, str]) -> list[dict]:
+    """Apply the events to the list, replacing rows that change rather than editing them."""
+    for auction_id, event in events.items():
+        if event == "sold" and 0 <= auction_id < len(rows) and rows[auction_id]["Sold"] != "Yes":
+            rows[auction_id] = dict(rows[auction_id], Sold="Yes")
+    return rows
+
+
+def compact() -> bool:
+    """
+    Fold the pending auction events into auctions_log.txt and empty the
+    event log; returns whether there was anything to fold.  Both files are
+    locked throughout, and the log is replaced in one step.
+    """
+    with file_lock(AUCTION_EVENTS), file_lock(AUCTIONS_LOG):
+        events = _read_events()
+        if not events:
+            return False
+        rows = _apply_events(_read_csv(AUCTIONS_LOG), events)
+        cols = HEADERS[AUCTIONS_LOG]
+        with open(AUCTIONS_LOG + ".tmp", "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(cols)
+            writer.writerows(["" if row[col] is None else row[col] for col in cols] for row in rows)
+        os.replace(AUCTIONS_LOG + ".tmp", AUCTIONS_LOG)
+        with open(AUCTION_EVENTS, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(EVENT_HEADER)
+        return True
+
+
+def _compactor_loop():
+    while True:
+        time.sleep(COMPACT_INTERVAL)
+        try:
+            compact()
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] Could not compact {AUCTIONS_LOG}: {e}")
+
+
+class CsvStore:
+    """
+    The original CSV logs, for people who read or edit them by hand.  Every
+    write is a locked append: auctions are marked sold by appending to
+    auctions_events.txt, which reads fold in until the compactor thread
+    writes them into auctions_log.txt.  Auction ids are row positions,
+    which compaction never changes.
+
+    Reads go through a LogReader per file, which keeps the parsed rows and
+    only parses what was appended since; the recent snipes are read from
+    the end of the file and time windows from an indexed offset.
+    """
+
+    def __init__(self):
+        for path, cols in HEADERS.items():
+            with file_lock(path):
+                if not os.path.exists(path) or _first_line(path) != ",".join(cols):
+                    _repair_csv(path, cols)
+        self._counted = (None, 0, 0)    # auctions log (inode, size, data rows) last counted
+        self.readers = {path: LogReader(path, _converter(path), cols.index("Timestamp"))
+                        for path, cols in HEADERS.items()}
+        self._read_lock = threading.Lock()
+        threading.Thread(target=_compactor_loop, name="log-compactor", daemon=True).start()
+
+    def add_snipes(self, rows) -> None:
+        _append_csv(SNIPES_LOG, rows)
+
+    def add_auction(self, item_name: str, listed_price: int, timestamp: str, uuid: str | None = None) -> int:
+        with file_lock(AUCTIONS_LOG):
+            auction_id = self._count_rows()
+            with open(AUCTIONS_LOG, "a", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerow([timestamp, item_name, listed_price, "No", uuid or ""])
+            self._count_rows()
+        return auction_id
+
+    def _count_rows(self) -> int:
+        """
+        Data rows in auctions_log.txt, reading only what was appended since
+        the last count unless the file was replaced; the caller holds the lock.
+        """
+        stat = os.stat(AUCTIONS_LOG)
+        inode, size, rows = self._counted
+        if inode != (stat.st_dev, stat.st_ino) or stat.st_size < size:
+            size, rows = 0, -1          # the header isn't a row
+        with open(AUCTIONS_LOG, "rb") as f:
+            f.seek(size)
+            rows += sum(1 for line in f.read().splitlines() if line.strip())
+        self._counted = ((stat.st_dev, stat.st_ino), stat.st_size, rows)
+        return rows
+
+    def mark_sold(self, auction_id: int) -> None:
+        _append_csv(AUCTION_EVENTS, [[now_stamp(), auction_id, "sold"]], EVENT_HEADER)
+
+    def add_sale(self, item_name: str, buy_price: int, sell_price: int, timestamp: str,
+                 auction_id: int | None = None) -> None:
+        _append_csv(SALES_LOG, [[timestamp, item_name, buy_price, sell_price, sell_price - buy_price,
+                                 "" if auction_id is None else auction_id]])
+
+    @contextmanager
+    def _reader(self, path: str):
+        with self._read_lock, file_lock(path, shared=True):
+            yield self.readers[path]
+
+    def _rows(self, path: str) -> list[dict]:
+        with self._reader(path) as reader:
+            return reader.rows()
+
+    def snipes(self) -> list[dict]:
+        return self._rows(SNIPES_LOG)
+
+    def snipes_since(self, timestamp: str) -> list[dict]:
+        with self._reader(SNIPES_LOG) as reader:
+            return sorted(reader.since(timestamp), key=lambda row: row["Timestamp"])
+
+    def recent_snipes(self, n: int) -> list[dict]:
+        with self._reader(SNIPES_LOG) as reader:
+            return reader.tail(n)
+
+    def last_snipe(self, item_name: str, before: str | None = None) -> dict | None:
+        matches = [row for row in self._rows(SNIPES_LOG)
+                   if row["Item Name"] == item_name and row["Timestamp"] <= (before or "9999")]
+        return max(matches, key=lambda row: row["Timestamp"]) if matches else None
+
+    def snipe(self, uuid: str) -> dict | None:
+        matches = [row for row in self._rows(SNIPES_LOG) if row["UUID"] == uuid]
+        return matches[-1] if matches else None
+
+    def trends(self, window: int) -> list[dict]:
+        """Same as SqliteStore.trends, computed from the snipes in the window."""
+        size = _bucket_size(window)
+        since = (int(datetime.now().timestamp()) - window) // size * size
+        before = datetime.fromtimestamp(since - 1).strftime("%Y-%m-%d %H:%M:%S")
+        with self._reader(SNIPES_LOG) as reader:
+            rows = reader.since(before)
+        groups = {}
+        for row in rows:
+            if row["Snipe Price"] is None or row["Suggested BIN"] is None:
+                continue
+            profit = row["Suggested BIN"] - row["Snipe Price"]
+            group = groups.setdefault(row["Item Name"], [0, 0, profit, profit])
+            group[0] += 1
+            group[1] += profit
+            group[2] = min(group[2], profit)
+            group[3] = max(group[3], profit)
+        return _trend_rows(groups)
+
+    def auctions(self) -> list[dict]:
+        with self._read_lock, file_lock(AUCTION_EVENTS, shared=True), file_lock(AUCTIONS_LOG, shared=True):
+            return _apply_events(self.readers[AUCTIONS_LOG].rows(), _read_events())
+
+    def unsold_auctions(self) -> list[dict]:
+        return [row for row in self.auctions() if row["Sold"] != "Yes"]
+
+    def sales(self) -> list[dict]:
+        return self._rows(SALES_LOG)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+#  Backend selection
+# ────────────────────────────────────────────────────────────────────────────────
+BACKENDS = {"sqlite": SqliteStore, "csv": CsvStore}
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """
+    The process-wide store, opened on first use with the backend named by
+    config.json's "storage" key.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                kind = "sqlite"
+                if os.path.exists(CONFIG_PATH):
+                    with open(CONFIG_PATH) as f:
+                        try:
+                            kind = json.load(f).get("storage", kind)
+                        except json.JSONDecodeError:
+                            pass
+                if kind not in BACKENDS:
+                    print(f"[ERROR] Unknown storage '{kind}', using sqlite.")
+                    kind = "sqlite"
+                _store = BACKENDS[kind]()
+    return _store
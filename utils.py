@@ -1,84 +1,30 @@
 # utils.py  ──────────────────────────────────────────────────────────────────────
 import os
-import re
 import json
 import time
-import pandas as pd
-import matplotlib.pyplot as plt
 from colorama import Fore, Style, init
 
+# matplotlib (the trend and price history charts), numpy (via the price history)
+# and the scanner with its HTTP clients are only imported by the screens that use
+# them, and the log store on first use, so the menu comes up without paying for them.
+
 # ────────────────────────────────────────────────────────────────────────────────
-#  0.  Log–file repair helpers (run once at import)
+#  0.  Log storage (see store.py; opened the first time a screen needs it)
 # ────────────────────────────────────────────────────────────────────────────────
-LOG_FILE      = "snipes_log.txt"
-SALES_LOG     = "sales_log.txt"
-AUCTIONS_LOG  = "auctions_log.txt"
-
-_EXPECTED_HEADERS = {
-    LOG_FILE:     ["Item Name", "Snipe Price", "Suggested BIN", "Second Lowest BIN", "Timestamp", "UUID"],
-    SALES_LOG:    ["Timestamp", "Item Name", "Buy Price", "Sell Price", "Profit"],
-    AUCTIONS_LOG: ["Timestamp", "Item Name", "Listed Price", "Sold"],
-}
-
-def _repair_csv(path: str, cols: list[str], pad: str | None = None) -> None:
+def ensure_logs():
     """
-    • Ensures the file exists.
-    • Makes the header exactly ','.join(cols).
-    • Splits a header+first-row line that was accidentally glued together.
-    • Optionally pads short data rows with `pad` until they reach len(cols).
+    Return the log store, first waiting for any snipes still queued in the
+    background logger so the screen sees them.
     """
-    header_line = ",".join(cols)
-    # 1. Create the file if it doesn't exist
-    if not os.path.exists(path):
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(header_line + "\n")
-        return
-
-    with open(path, "r", encoding="utf-8") as f:
-        raw_lines = f.read().splitlines()
-
-    if not raw_lines:
-        raw_lines = [header_line]
-
-    first = raw_lines[0]
-    # 2. Is the header glued to the first data row? Split at first timestamp.
-    if first.startswith(header_line) and first != header_line:
-        # Look for YYYY-MM-DD HH:MM:SS
-        m = re.search(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", first)
-        if m:
-            data_part = first[len(header_line):].lstrip(",")
-            raw_lines = [header_line, data_part, *raw_lines[1:]]
-        else:
-            # Unknown garble – just force-replace header
-            raw_lines[0] = header_line
-    # 3. Header missing or wrong → replace
-    elif first != header_line:
-        raw_lines[0] = header_line
-
-    # 4. Pad short rows if requested
-    if pad is not None:
-        fixed = [raw_lines[0]]
-        for ln in raw_lines[1:]:
-            parts = ln.split(",")
-            if len(parts) < len(cols):
-                parts += [pad] * (len(cols) - len(parts))
-            fixed.append(",".join(parts))
-        raw_lines = fixed
-
-    # 5. Re-write
-    with open(path, "w", encoding="utf-8") as f:
-        f.writelines([ln.rstrip("\r\n") + "\n" for ln in raw_lines])
-
-# Run the repair for all three logs (pad 'No' for missing Sold flag)
-_repair_csv(LOG_FILE,     _EXPECTED_HEADERS[LOG_FILE])
-_repair_csv(SALES_LOG,    _EXPECTED_HEADERS[SALES_LOG])
-_repair_csv(AUCTIONS_LOG, _EXPECTED_HEADERS[AUCTIONS_LOG], pad="No")
+    from logger import flush
+    from store import get_store
+    flush()
+    return get_store()
 
 
 # ────────────────────────────────────────────────────────────────────────────────
-#  1.  Normal imports that rely on clean CSVs
+#  1.  Normal imports
 # ────────────────────────────────────────────────────────────────────────────────
-from sell_tracker import record_sale            # after repair = safe to import
 init(autoreset=True)
 
 
@@ -97,18 +43,27 @@ def parse_human_input(text: str) -> int:
             continue
     return total
 
-if not os.path.exists(CONFIG_PATH):
-    config = {"budget": 1_000_000, "min_profit_percent": 20.0}
-    with open(CONFIG_PATH, "w") as f:
-        json.dump(config, f, indent=4)
-else:
-    with open(CONFIG_PATH, "r") as f:
-        try:
-            config = json.load(f)
-        except json.JSONDecodeError:
-            config = {"budget": 1_000_000, "min_profit_percent": 20.0}
-            with open(CONFIG_PATH, "w") as fw:
-                json.dump(config, fw, indent=4)
+config = {}
+
+def load_config() -> dict:
+    """
+    Read config.json into `config`, creating or resetting it if it is
+    missing or corrupt.  Called by the menu, not at import.
+    """
+    global config
+    if not os.path.exists(CONFIG_PATH):
+        config = {"budget": 1_000_000, "min_profit_percent": 20.0}
+        with open(CONFIG_PATH, "w") as f:
+            json.dump(config, f, indent=4)
+    else:
+        with open(CONFIG_PATH, "r") as f:
+            try:
+                config = json.load(f)
+            except json.JSONDecodeError:
+                config = {"budget": 1_000_000, "min_profit_percent": 20.0}
+                with open(CONFIG_PATH, "w") as fw:
+                    json.dump(config, fw, indent=4)
+    return config
 
 def save_config() -> None:
     with open(CONFIG_PATH, "w") as f:
@@ -130,7 +85,7 @@ def format_price(n: int) -> str:
 # ────────────────────────────────────────────────────────────────────────────────
 def main_menu() -> None:
     from sell_tracker import record_auction     # local import avoids circulars
-    import scanner                              # lazy-import for speed
+    load_config()
 
     while True:
         clear()
@@ -144,7 +99,8 @@ def main_menu() -> None:
         print("5. 📃 Log an Auction")
         print("6. 💰 Mark as Sold")
         print("7. ✏️ Log Custom Sale")
-        print("8. ❌ Exit\n")
+        print("8. ❌ Exit")
+        print("9. 📡 Continuous Scanner\n")
 
         choice = input("Select an option: ").strip()
 
@@ -152,8 +108,9 @@ def main_menu() -> None:
         elif choice == "2": show_portfolio()
         elif choice == "3":
             clear()
-            print(f"{Fore.GREEN}Starting scanner with budget {config['budget']:,} coins...")
+            print(f"{Fore.GREEN}Starting scanner with {_budget_label()}...")
             try:
+                import scanner                  # lazy-import for speed
                 scanner.start_sniper()
             except Exception as e:
                 print(f"{Fore.RED}Scanner failed: {e}")
@@ -166,6 +123,7 @@ def main_menu() -> None:
             print("Goodbye!")
             time.sleep(1)
             break
+        elif choice == "9": run_continuous_scanner()
         else:
             print("Invalid input.")
             time.sleep(1)
@@ -175,55 +133,111 @@ def main_menu() -> None:
 #  4.  INDIVIDUAL MENU ACTIONS
 # ────────────────────────────────────────────────────────────────────────────────
 def show_trends() -> None:
-    clear()
-    print(f"{Fore.MAGENTA}📈 Real Trends (Last 14 Days)")
-    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    import matplotlib.pyplot as plt
+    from store import TREND_WINDOWS
+    store = ensure_logs()
+    window = config.get("trends_window", "14d")
+    if window not in TREND_WINDOWS:
+        window = "14d"
 
-    df = pd.read_csv(LOG_FILE, parse_dates=["Timestamp"])
-    recent = df[df["Timestamp"] > pd.Timestamp.now() - pd.Timedelta("14D")]
+    while True:
+        clear()
+        print(f"{Fore.MAGENTA}📈 Real Trends (Last {window})")
+        print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
-    if recent.empty:
-        print(f"{Fore.YELLOW}No flip suggestions found yet.")
-        input("\nPress Enter to return to menu...")
-        return
+        top = store.trends(TREND_WINDOWS[window])[:10]
+        if not top:
+            print(f"{Fore.YELLOW}No flip suggestions found yet.")
+        else:
+            print(f"{Fore.CYAN}Top 10 Most Suggested Flips:")
+            for row in top:
+                print(f"  {Fore.YELLOW}{row['Item Name']}{Style.RESET_ALL} — Flips: {row['Flips']} — "
+                      f"Avg. Profit: {Fore.GREEN}{format_price(int(row['AvgProfit']))}{Style.RESET_ALL} "
+                      f"(min {format_price(row['MinProfit'])}, max {format_price(row['MaxProfit'])})")
+
+            try:
+                plt.figure()
+                plt.bar([row["Item Name"] for row in top], [row["AvgProfit"] for row in top])
+                plt.title(f"Avg. Profit by Item (Last {window})")
+                plt.xticks(rotation=90)
+                plt.tight_layout()
+                plt.show()
+            except Exception:
+                print("(Plot failed to render.)")
+
+        windows = "/".join(TREND_WINDOWS)
+        choice = input(f"\nWindow ({windows}), [h] price history of an item, "
+                       f"or Enter to return to menu: ").strip().lower()
+        if choice == "h":
+            show_price_history(TREND_WINDOWS[window])
+            continue
+        if choice not in TREND_WINDOWS:
+            return
+        window = config["trends_window"] = choice
+        save_config()
 
-    top = (recent
-           .groupby("Item Name")
-           .agg(Flips=("UUID", "count"),
-                AvgProfit=("Suggested BIN",
-                           lambda x: (x - recent.loc[x.index, "Snipe Price"]).mean()))
-           .sort_values(by="Flips", ascending=False)
-           .head(10))
 
-    print(f"{Fore.CYAN}Top 10 Most Suggested Flips:")
-    for item, row in top.iterrows():
-        print(f"  {Fore.YELLOW}{item}{Style.RESET_ALL} — Flips: {row['Flips']} — "
-              f"Avg. Profit: {Fore.GREEN}{format_price(int(row['AvgProfit']))}")
+def show_price_history(window: int) -> None:
+    """
+    Chart the recorded lowest / second-lowest BIN of an item over the
+    window, from the scanner's price history (no scan needed).
+    """
+    import matplotlib.pyplot as plt
+    from datetime import datetime
+    from pricehistory import HISTORY_FILE, MISSING, PriceHistory
+
+    if not os.path.exists(HISTORY_FILE):
+        print(f"{Fore.YELLOW}No price history yet – run the scanner first.")
+        time.sleep(1.5)
+        return
+    history = PriceHistory()
+    text = input("Item name (or part of it): ").strip()
+    matches = history.matching(text) if text else []
+    if not matches:
+        print("No matching items.")
+        time.sleep(1)
+        return
+    for i, name in enumerate(matches[:15]):
+        print(f"{i+1}. {name}")
+    idx = input("\nSelect item number (or press Enter to cancel): ").strip()
+    if not idx.isdigit() or not (1 <= int(idx) <= min(len(matches), 15)):
+        return
+    name = matches[int(idx)-1]
 
+    series = history.series(name, int((time.time() - window) * 1000))
+    if not len(series):
+        print("No records for that item in this window.")
+        time.sleep(1)
+        return
+    stamps = [datetime.fromtimestamp(t / 1000) for t in series["time"].tolist()]
     try:
-        top["AvgProfit"].plot(kind="bar", title="Avg. Profit by Item (Last 14 Days)")
+        plt.figure()
+        for column, label in (("lowest", "Lowest BIN"), ("second", "Second lowest BIN")):
+            values = [v if v != MISSING else None for v in series[column].tolist()]
+            plt.step(stamps, values, where="post", label=label)
+        plt.title(f"{name} price history")
+        plt.legend()
         plt.tight_layout()
         plt.show()
     except Exception:
         print("(Plot failed to render.)")
 
-    input("\nPress Enter to return to menu...")
-
 
 def log_auction_listing(record_auction) -> None:
+    store = ensure_logs()
+
     clear()
     print(f"{Fore.YELLOW}📃 Log an Auction Listing")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
-    df = pd.read_csv(LOG_FILE)
-    if df.empty:
+    recent = store.recent_snipes(15)
+    if not recent:
         print("No flip suggestions available.")
         time.sleep(1)
         return
 
-    recent = df.tail(15).reset_index(drop=True)
     print(f"{Fore.CYAN}Recent Suggested Flips:")
-    for i, row in recent.iterrows():
+    for i, row in enumerate(recent):
         print(f"{i+1}. {row['Item Name']} — Bought for {format_price(row['Snipe Price'])}")
 
     idx = input("\nSelect item number to log auction (or press Enter to cancel): ").strip()
@@ -232,7 +246,7 @@ def log_auction_listing(record_auction) -> None:
         time.sleep(1)
         return
 
-    sel = recent.iloc[int(idx)-1]
+    sel = recent[int(idx)-1]
     print(f"\n💡 Suggested BIN: {format_price(int(sel['Suggested BIN']))} "
           f"(2nd lowest BIN: {format_price(int(sel['Second Lowest BIN']))})")
     listed = int(parse_human_input(input("What price are you listing it for? ").strip() or "0"))
@@ -241,107 +255,88 @@ def log_auction_listing(record_auction) -> None:
         time.sleep(1)
         return
 
-    record_auction(sel["Item Name"], listed)
+    record_auction(sel["Item Name"], listed, sel["UUID"])
     input("\n[✔] Auction logged! Press Enter to return to menu...")
 
 
 def show_portfolio() -> None:
-    clear()
-    print(f"{Fore.MAGENTA}💼 Your Flip Portfolio")
-    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+    from portfolio import build_lots, lot_summary, page, pages
+    store = ensure_logs()
 
-    auctions = pd.read_csv(AUCTIONS_LOG)
-    snipes   = pd.read_csv(LOG_FILE)
-    sales    = pd.read_csv(SALES_LOG)
+    lots = build_lots(store.auctions(), store.snipes(), store.sales())
+    number = 0
 
-    combined = (auctions
-                .merge(snipes, how="left", on="Item Name")
-                .merge(sales,   how="left", on="Item Name", suffixes=("", "_Sold")))
+    while True:
+        clear()
+        print(f"{Fore.MAGENTA}💼 Your Flip Portfolio")
+        print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
-    if "Timestamp" in combined.columns:
-        combined["Timestamp"] = pd.to_datetime(combined["Timestamp"], errors="coerce")
-        combined = combined.sort_values(by="Timestamp", ascending=False)
+        if not lots:
+            print("No portfolio entries yet.")
+            input("\nPress Enter to return to menu...")
+            return
 
-    if combined.empty:
-        print("No portfolio entries yet.")
-        input("\nPress Enter to return to menu...")
-        return
+        for lot in page(lots, number):
+            snipe, sale = lot["snipe"], lot["sale"]
+            summary = lot_summary(lot)
+            date_lbl = lot["Timestamp"][:16] if lot["Timestamp"] else "Unknown Date"
+            print(f"{Fore.YELLOW}{date_lbl} — {lot['Item Name']}")
 
-    for _, row in combined.iterrows():
-        date_lbl = (
-            row["Timestamp"].strftime('%Y-%m-%d %H:%M')
-            if pd.notnull(row["Timestamp"]) else "Unknown Date"
-        )
-        print(f"{Fore.YELLOW}{date_lbl} — {row['Item Name']}")
-
-        # ── Buy price ───────────────────────────────────────────────────────────
-        if pd.notnull(row.get("Snipe Price")):
-            buy_price_val = int(row["Snipe Price"])
-            print(f"  Bought for: {format_price(buy_price_val)}")
-        elif pd.notnull(row.get("Listed Price")):
-            buy_price_val = int(row["Listed Price"])
-            print(f"  Bought for: {format_price(buy_price_val)}")
-        else:
-            buy_price_val = None
-            print("  Bought for: Unknown")
-
-        # ── BIN info (only from snipes) ─────────────────────────────────────────
-        if pd.notnull(row.get("Suggested BIN")):
-            print(f"  Suggested BIN: {format_price(int(row['Suggested BIN']))}")
-            print(f"  2nd Lowest BIN: {format_price(int(row['Second Lowest BIN']))}")
-
-        # ── Listed price (manual auction logger) ───────────────────────────────
-        if pd.notnull(row.get("Listed Price")):
-            print(f"  Listed Price: {format_price(int(row['Listed Price']))}")
-
-        # ── Sold / Profit ──────────────────────────────────────────────────────
-        if row.get("Sold") == "Yes" and pd.notnull(row.get("Sell Price")):
-            sell_price_val = int(row["Sell Price"])
-
-            expected_profit = (
-                int(row["Suggested BIN"] - row["Snipe Price"])
-                if pd.notnull(row.get("Suggested BIN")) and pd.notnull(row.get("Snipe Price"))
-                else None
-            )
-
-            actual_profit = (
-                sell_price_val - buy_price_val
-                if buy_price_val is not None else None
-            )
-
-            print(f"  SOLD FOR: {Fore.GREEN}{format_price(sell_price_val)}{Style.RESET_ALL}")
-            if expected_profit is not None:
-                print(f"  Expected Profit: {Fore.YELLOW}{format_price(expected_profit)}")
-            if actual_profit is not None:
-                print(f"  Actual Profit:   {Fore.GREEN}{format_price(actual_profit)}")
-        else:
-            print(f"{Fore.CYAN}  Not yet sold")
+            # ── Buy price ───────────────────────────────────────────────────────
+            if summary["buy"] is not None:
+                print(f"  Bought for: {format_price(summary['buy'])}")
+            else:
+                print("  Bought for: Unknown")
+
+            # ── BIN info (only from snipes) ─────────────────────────────────────
+            if snipe and snipe["Suggested BIN"] is not None:
+                print(f"  Suggested BIN: {format_price(snipe['Suggested BIN'])}")
+            if snipe and snipe["Second Lowest BIN"] is not None:
+                print(f"  2nd Lowest BIN: {format_price(snipe['Second Lowest BIN'])}")
+
+            # ── Listed price (manual auction logger) ───────────────────────────
+            if lot["Listed Price"] is not None:
+                print(f"  Listed Price: {format_price(lot['Listed Price'])}")
+
+            # ── Sold / Profit ──────────────────────────────────────────────────
+            if lot["Sold"] == "Yes" and sale and sale["Sell Price"] is not None:
+                print(f"  SOLD FOR: {Fore.GREEN}{format_price(sale['Sell Price'])}{Style.RESET_ALL}")
+                if summary["expected"] is not None:
+                    print(f"  Expected Profit: {Fore.YELLOW}{format_price(summary['expected'])}")
+                if summary["actual"] is not None:
+                    print(f"  Actual Profit:   {Fore.GREEN}{format_price(summary['actual'])}")
+            else:
+                print(f"{Fore.CYAN}  Not yet sold")
 
-        print("----------------------------------")
+            print("----------------------------------")
 
-    input("\nPress Enter to return to menu...")
+        total = pages(lots)
+        print(f"Page {number + 1}/{total} — {len(lots)} lots")
+        choice = input("\n[n]ext, [p]revious, or Enter to return to menu: ").strip().lower()
+        if choice == "n" and number + 1 < total:
+            number += 1
+        elif choice == "p" and number > 0:
+            number -= 1
+        elif choice not in ("n", "p"):
+            return
 
 
 def mark_auction_as_sold() -> None:
     from sell_tracker import record_sale     # late import to avoid circulars
+    store = ensure_logs()
 
     clear()
     print(f"{Fore.YELLOW}💰 Mark Auction as Sold")
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
 
-    df = pd.read_csv(AUCTIONS_LOG)
-    if "Sold" not in df.columns:
-        # last-ditch defence
-        df.rename(columns={c: "Sold" for c in df.columns if c.lower().startswith("sold")}, inplace=True)
-
-    unsold = df[df["Sold"] != "Yes"].reset_index()
-    if unsold.empty:
+    unsold = store.unsold_auctions()
+    if not unsold:
         print("No unsold auctions available.")
         input("\nPress Enter to return...")
         return
 
     print(f"{Fore.CYAN}Unsold Auctions:")
-    for i, row in unsold.iterrows():
+    for i, row in enumerate(unsold):
         print(f"{i+1}. {row['Item Name']} — Listed for {format_price(int(row['Listed Price']))}")
 
     idx = input("\nSelect auction number to mark as sold (or press Enter to cancel): ").strip()
@@ -350,23 +345,22 @@ def mark_auction_as_sold() -> None:
         time.sleep(1)
         return
 
-    sel = unsold.iloc[int(idx)-1]
+    sel = unsold[int(idx)-1]
     sold_price = int(parse_human_input(input("Final sold price: ").strip() or "0"))
     if sold_price <= 0:
         print("Invalid input.")
         time.sleep(1)
         return
 
-    # Resolve real buy price
-    snipes = pd.read_csv(LOG_FILE)
-    match  = snipes[snipes["Item Name"] == sel["Item Name"]]
-    buy_price = int(match.iloc[-1]["Snipe Price"]) if not match.empty else int(sel["Listed Price"])
+    # Resolve real buy price from the snipe this listing came from
+    match = store.snipe(sel["UUID"]) if sel["UUID"] else None
+    match = match or store.last_snipe(sel["Item Name"], before=sel["Timestamp"])
+    buy_price = int(match["Snipe Price"]) if match else int(sel["Listed Price"])
 
-    record_sale(sel["Item Name"], buy_price, sold_price)
+    record_sale(sel["Item Name"], buy_price, sold_price, sel["id"])
 
     # Flag as sold
-    df.at[sel["index"], "Sold"] = "Yes"
-    df.to_csv(AUCTIONS_LOG, index=False)
+    store.mark_sold(sel["id"])
     print(f"[✔] Marked {sel['Item Name']} as sold for {sold_price:,}")
     input("\nPress Enter to return...")
 
@@ -378,6 +372,7 @@ def log_custom_sale():
     merges correctly.
     """
     from sell_tracker import record_auction, record_sale   # lazy import
+    store = ensure_logs()
 
     clear()
     print(f"{Fore.YELLOW}✏️  Log Custom Sale")
@@ -396,27 +391,57 @@ def log_custom_sale():
         time.sleep(1)
         return
 
-    # 1️⃣  Add a row to auctions_log.txt *already marked as sold*
-    record_auction(item_name, buy_price)          # creates Sold = "No"
-    # Patch last row to Sold="Yes"
-    import pandas as pd
-    df = pd.read_csv(AUCTIONS_LOG)
-    df.loc[df.index[-1], "Sold"] = "Yes"
-    df.to_csv(AUCTIONS_LOG, index=False)
+    # 1️⃣  Add an auction row *already marked as sold*
+    auction_id = record_auction(item_name, buy_price)
+    store.mark_sold(auction_id)
 
-    # 2️⃣  Add a row to sales_log.txt
-    record_sale(item_name, buy_price, sell_price)
+    # 2️⃣  Add a sale row
+    record_sale(item_name, buy_price, sell_price, auction_id)
 
     print(f"\n[✔] Logged custom sale for {item_name}.")
     time.sleep(1.5)
 
+def run_continuous_scanner() -> None:
+    clear()
+    print(f"{Fore.GREEN}Watching the auction house with {_budget_label()}; "
+          f"snipes are shown as they are listed. Press Ctrl+C to stop.")
+    try:
+        import scanner
+        scanner.sniper_loop()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"{Fore.RED}Scanner failed: {e}")
+    input("\nPress Enter to return to the main menu...")
+
+def _budget_label() -> str:
+    profiles = config.get("profiles")
+    if profiles:
+        return f"{len(profiles)} scan profiles ({', '.join(profiles)})"
+    return f"budget {config['budget']:,} coins"
+
+def _parse_speed_report() -> str:
+    import sys
+    scanner = sys.modules.get("scanner")        # only loaded once a scan has run
+    if scanner is None:
+        return "no scan yet"
+    rates = {mode: pages / secs for mode, (pages, secs) in scanner.parse_stats.items() if secs}
+    parts = [f"{mode} {rate:.1f} pages/s" for mode, rate in rates.items()]
+    if "threads" in rates and "processes" in rates:
+        parts.append(f"speedup x{rates['processes'] / rates['threads']:.2f}")
+    return ", ".join(parts) or "no scan yet"
+
 def configure_scanner() -> None:
     while True:
         clear()
+        mode = config.get("parse_processes", 0)
         print(f"{Fore.MAGENTA}Scanner Configuration")
         print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-        print(f"1. Budget: {config['budget']:,} coins")
-        print("2. Back to Main Menu")
+        print(f"1. Budget: {config['budget']:,} coins" + (" (profiles without one)" if config.get("profiles") else ""))
+        print(f"2. Page parsing: {f'{mode} processes' if mode else 'threads'} "
+              f"(last scans: {_parse_speed_report()})")
+        print(f"3. Scan profiles: {len(config.get('profiles') or {}) or 'none'}")
+        print("4. Back to Main Menu")
         choice = input("\nSelect setting to change: ").strip()
 
         if choice == "1":
@@ -429,12 +454,85 @@ def configure_scanner() -> None:
                 print("Invalid input.")
                 time.sleep(1)
         elif choice == "2":
+            raw = input("Parser processes (0 = threads, 'auto' = one per core): ").strip().lower()
+            if raw == "auto" or raw.isdigit():
+                config["parse_processes"] = raw if raw == "auto" else int(raw)
+                save_config()           # the scanner re-reads config.json every cycle
+            else:
+                print("Invalid input.")
+                time.sleep(1)
+        elif choice == "3":
+            configure_profiles()
+        elif choice == "4":
             break
         else:
             print("Invalid choice.")
             time.sleep(1)
 
 
+def configure_profiles() -> None:
+    """
+    Named budgets and thresholds, all served by the same scan; a running
+    scanner picks changes up on its next cycle.
+    """
+    while True:
+        clear()
+        profiles = config.get("profiles", {})
+        print(f"{Fore.MAGENTA}Scan Profiles")
+        print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
+        if not profiles:
+            print(f"None – scanning with the budget of {config['budget']:,} coins "
+                  f"and {config.get('min_profit_percent', 20.0):g}% minimum profit.")
+        for name, p in profiles.items():
+            print(f"  {Fore.YELLOW}{name}{Style.RESET_ALL} — budget {p.get('budget', config['budget']):,}, "
+                  f"min profit {p.get('min_profit_percent', config.get('min_profit_percent', 20.0)):g}%"
+                  + ("" if p.get("log", True) else ", not in the snipe log")
+                  + (f", log file {p['snipe_log_file']}" if p.get("snipe_log_file") else ""))
+        choice = input("\n[a]dd or edit a profile, [r]emove one, or Enter to go back: ").strip().lower()
+
+        if choice == "a":
+            name = input("Profile name: ").strip()
+            if not name:
+                continue
+            p = config.setdefault("profiles", {}).setdefault(name, {})
+            raw = input(f"Budget (Enter keeps {p.get('budget', config['budget']):,}): ").strip()
+            if raw:
+                budget = parse_human_input(raw)
+                if budget > 0:
+                    p["budget"] = budget
+            raw = input("Minimum profit % (Enter keeps the current one): ").strip()
+            if raw:
+                try:
+                    p["min_profit_percent"] = float(raw)
+                except ValueError:
+                    print("Invalid input.")
+                    time.sleep(1)
+            keep = "yes" if p.get("log", True) else "no"
+            raw = input(f"Write its snipes to the snipe log? (y/n, Enter keeps {keep}): ").strip().lower()
+            if raw in ("y", "n"):
+                p["log"] = raw == "y"
+            elif raw:
+                print("Invalid input.")
+                time.sleep(1)
+            raw = input("Snipe log file for this profile (Enter keeps it, '-' for none): ").strip()
+            if raw == "-":
+                p.pop("snipe_log_file", None)
+            elif raw:
+                p["snipe_log_file"] = raw
+            save_config()
+        elif choice == "r":
+            name = input("Profile to remove: ").strip()
+            if profiles.pop(name, None) is None:
+                print("No such profile.")
+                time.sleep(1)
+                continue
+            if not profiles:
+                config.pop("profiles")
+            save_config()
+        else:
+            return
+
+
 # ────────────────────────────────────────────────────────────────────────────────
 #  5.  Boot
 # ────────────────────────────────────────────────────────────────────────────────
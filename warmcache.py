@@ -0,0 +1,76 @@
+"""
+Warm-start cache: the scanner's live listings and where it had got to,
+saved so a restarted scanner can go straight back to incremental scans
+instead of downloading every page first.
+
+One .npz file holds the listings as columns (UUID, item, price, end time)
+and a JSON header with the cache version, the API it came from, the
+``lastUpdated`` of the last processed snapshot and whatever else the
+scanner passes in.  It is written to a temporary file and renamed into
+place, so a crash mid-save leaves the previous cache intact.
+
+load() returns None, and the scanner does a full scan as before, when the
+cache is missing or unreadable, was written by another VERSION or for
+another API, or was saved more than ``max_age`` seconds ago: by then too
+many of its listings may have sold unseen, since the ended feed only
+covers the last minute or so.
+"""
+import json
+import os
+import time
+import zipfile
+
+import numpy as np
+
+CACHE_FILE = "warm_cache.npz"
+VERSION = 1     # bump when the layout or the item keys change
+
+
+def save(path: str, rows, meta: dict) -> int:
+    """
+    Write ``(uuid, item, price, end)`` rows and ``meta`` (JSON-able, with
+    at least ``api_url`` and ``last_updated``); returns the rows written.
+    """
+    names, ids = [], {}
+    uuids, items, prices, ends = [], [], [], []
+    for uuid, item, price, end in rows:
+        item_id = ids.get(item)
+        if item_id is None:
+            item_id = ids[item] = len(names)
+            names.append(item)
+        uuids.append(uuid)
+        items.append(item_id)
+        prices.append(price)
+        ends.append(end)
+    header = dict(meta, version=VERSION, saved_at=int(time.time() * 1000), names=names)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, header=np.frombuffer(json.dumps(header).encode(), dtype=np.uint8),
+                 uuid=np.array(uuids, dtype="S32"), item=np.array(items, dtype=np.int32),
+                 price=np.array(prices, dtype=np.int64), end=np.array(ends, dtype=np.int64))
+    os.replace(tmp, path)
+    return len(uuids)
+
+
+def load(path: str, api_url: str, max_age: float):
+    """
+    ``(listings, meta)`` from the cache, listings as ``uuid -> [item,
+    price, end]``, or None when there is no usable cache (see above).
+    """
+    try:
+        with np.load(path) as data:
+            meta = json.loads(data["header"].tobytes())
+            if meta.get("version") != VERSION or meta.get("api_url") != api_url:
+                return None
+            if time.time() * 1000 - meta.get("saved_at", 0) > max_age * 1000:
+                return None
+            names = meta.pop("names")
+            listings = {uuid.decode(): [names[item], price, end] for uuid, item, price, end in
+                        zip(data["uuid"].tolist(), data["item"].tolist(),
+                            data["price"].tolist(), data["end"].tolist())}
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, IndexError, zipfile.BadZipFile) as e:
+        print(f"[ERROR] Ignoring the warm-start cache {path}: {e}")
+        return None
+    return listings, meta